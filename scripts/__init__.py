@@ -0,0 +1,8 @@
+# scripts/__init__.py
+# The scripts import their shared helpers as a top-level `utils` module; putting this directory on
+# sys.path lets `python -m scripts ...` (and `from scripts import ...` in the app) run without PYTHONPATH.
+# Keep this file import-free beyond the standard library: every CLI start-up pays for it.
+import os as _os, sys as _sys
+
+_HERE = _os.path.dirname(_os.path.abspath(__file__))
+if _HERE not in _sys.path: _sys.path.append(_HERE)
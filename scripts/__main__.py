@@ -0,0 +1,55 @@
+# scripts/__main__.py
+# One entry point for every tool:  python -m scripts <command> [args...]   (python -m scripts lists them)
+# Only the chosen command's module is imported, so python-docx, pydantic, openai and numpy load only in the
+# subcommands that use them; keep this file (and scripts/__init__.py) to the standard library.
+from __future__ import annotations
+import importlib, sys
+
+# command -> (module under scripts/, help). The module's main() runs with the remaining arguments; it is
+# imported under its own name (not as __main__) so batch workers can still pickle its functions.
+COMMANDS = {
+    "build": ("build_resume", "Build resume + CV for a style and JD"),
+    "batch": ("batch_build", "Build every posting in a directory or JSONL/CSV export"),
+    "serve": ("serve", "HTTP build/preview/lint server with warm state"),
+    "interactive": ("run_interactive_qna", "Paste a JD, answer follow-up questions, build"),
+    "paste": ("run_interactive", "Paste a JD and pick a style (no questions)"),
+    "preview": ("preview_job_alignment", "Preview JD-driven skill filtering (no writes)"),
+    "lint": ("lint_engine", "ATS-lint every generated .docx under a directory, in parallel"),
+    "lint-profile": ("profile_lint", "Sanity-check profile/profile.json"),
+    "curate": ("curate_answers", "Normalize the saved summary additions"),
+    "answers": ("answers_db", "Answers database stats / export to answers.json / bench"),
+    "questions": ("question_bank", "Pending follow-up questions for a posting backlog"),
+    "ingest": ("ingest", "Stream a postings export into keyword digests"),
+    "rank": ("rank_client", "Keyword-ranking client, stub server and load tests"),
+    "rank-cache": ("rank_cache", "Inspect or clear the keyword-ranking cache"),
+    "jd-index": ("jd_index", "Near-duplicate JD index: stats / query / dupes in a backlog / bench"),
+    "bullets": ("bullet_selector", "Show the experience bullets chosen for a JD"),
+    "coverage": ("coverage_matrix", "Keyword coverage of resume variants across postings"),
+    "templates": ("template_registry", "Validate templates and time compiled rendering"),
+    "store": ("artifact_store", "Artifact store stats / gc / verify / migrate"),
+    "startup-check": ("check_startup", "Fail if fast commands import heavy modules or start slowly"),
+    "bench-pipeline": ("bench_pipeline", "Benchmark every tailoring stage"),
+    "bench-keywords": ("bench_keywords", "Microbenchmark keyword extraction"),
+    "bench-docx": ("bench_docx", "DOCX render time per document"),
+    "bench-formats": ("renderers", "Render cost per output format (DOCX/PDF/TXT)"),
+    "bench-profile": ("bench_profile", "Profile loading: re-parse vs cached store"),
+}
+
+def _usage() -> str:
+    width = max(map(len, COMMANDS))
+    rows = "\n".join(f"  {name:<{width}}  {help_}" for name, (_, help_) in COMMANDS.items())
+    return f"usage: python -m scripts <command> [args...]\n\ncommands:\n{rows}\n\n<command> --help shows a command's options."
+
+def main(argv: list[str] | None = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(_usage()); return
+    cmd, rest = argv[0], argv[1:]
+    if cmd not in COMMANDS:
+        print(f"unknown command: {cmd}\n\n{_usage()}", file=sys.stderr); raise SystemExit(2)
+    sys.argv = [f"scripts {cmd}", *rest]
+    module = importlib.import_module(f"scripts.{COMMANDS[cmd][0]}")
+    if hasattr(module, "main"): module.main()  # run_interactive has no main(): importing it runs the prompt
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+# scripts/answers_db.py
+# Answers stored in SQLite (WAL) instead of whole-file answers.json rewrites: every answer is a small
+# append-only insert, concurrent sessions/processes never overwrite each other, and lookups by prompt hash
+# or role key are indexed. answers.json remains the hand-editable/exported view: a changed file is
+# imported on the next read, and `export` writes the database back out in the same shape.
+#   python -m scripts answers stats | export [--path P] | bench [--entries 100000]
+from __future__ import annotations
+import argparse, hashlib, json, os, random, sqlite3, tempfile, threading, time, unicodedata
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parents[1]
+ANSWERS_PATH = BASE / "profile" / "answers.json"
+DB_PATH = Path(os.environ.get("RESUME_ANSWERS_DB") or BASE / "profile" / "answers.sqlite")
+GLOBAL_FIELDS = ("extra_keywords", "summary_additions")  # always present in the export, in this order
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS global_items (id INTEGER PRIMARY KEY AUTOINCREMENT, field TEXT NOT NULL,
+    text TEXT NOT NULL, norm TEXT NOT NULL, UNIQUE(field, norm));
+CREATE TABLE IF NOT EXISTS role_items (id INTEGER PRIMARY KEY AUTOINCREMENT, role_key TEXT NOT NULL, field TEXT NOT NULL,
+    text TEXT NOT NULL, norm TEXT NOT NULL, UNIQUE(role_key, field, norm));
+CREATE TABLE IF NOT EXISTS asked (id INTEGER PRIMARY KEY AUTOINCREMENT, prompt_hash TEXT NOT NULL UNIQUE,
+    role_key TEXT, company_used TEXT, entry TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS asked_role ON asked(role_key);
+"""
+
+def _norm(text: str) -> str:
+    # Same key as utils.dedupe_list (which would pull in pydantic here): ASCII-folded, stripped, lowercased.
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").strip().lower()
+
+_encode_entry = json.JSONEncoder(ensure_ascii=False).encode  # one encoder for every asked row
+
+def _dumps(data: dict) -> bytes:
+    return json.dumps(data, indent=2).encode("utf-8")
+
+class AnswersDB:
+    def __init__(self, path: Path = DB_PATH, json_path: Path | None = ANSWERS_PATH):
+        self.path = Path(path)
+        self.json_path = Path(json_path) if json_path else None
+        self.imports = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._json_stamp = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; only the last commits can be lost on power loss
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _write(self, fn) -> bool:
+        # One IMMEDIATE transaction per write (other writers wait on the busy timeout instead of failing);
+        # the revision counter moves only when something changed, so readers can cache by it.
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                changed = bool(fn(db))
+                if changed:
+                    db.execute("INSERT INTO meta(name, value) VALUES('revision', '1') "
+                               "ON CONFLICT(name) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return changed
+
+    def _meta(self, db: sqlite3.Connection, name: str, default: str = "") -> str:
+        row = db.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else default
+
+    def _set_meta(self, db: sqlite3.Connection, name: str, value):
+        db.execute("INSERT OR REPLACE INTO meta(name, value) VALUES(?, ?)", (name, str(value)))
+
+    def revision(self) -> int:
+        with self._lock:
+            return int(self._meta(self._db(), "revision", "0"))
+
+    # --- appends ---
+
+    def _insert_items(self, db: sqlite3.Connection, table: str, keys: tuple, items) -> int:
+        cols = ("role_key", "field") if len(keys) == 2 else ("field",)
+        sql = f"INSERT OR IGNORE INTO {table}({', '.join(cols)}, text, norm) VALUES({', '.join('?' * (len(keys) + 2))})"
+        rows = [(*keys, str(it).strip(), _norm(str(it))) for it in items if it and _norm(str(it))]
+        return sum(db.execute(sql, row).rowcount for row in rows)
+
+    def add_global(self, field: str, items: list[str]) -> bool:
+        return self._write(lambda db: self._insert_items(db, "global_items", (field,), items))
+
+    def add_role_items(self, role_key: str, field: str, items: list[str]) -> bool:
+        return self._write(lambda db: self._insert_items(db, "role_items", (role_key, field), items))
+
+    def _insert_asked(self, db: sqlite3.Connection, prompt_hash: str, entry: dict) -> int:
+        return db.execute("INSERT OR IGNORE INTO asked(prompt_hash, role_key, company_used, entry) VALUES(?, ?, ?, ?)",
+                          (prompt_hash, entry.get("role_key"), entry.get("company_used"),
+                           _encode_entry(entry))).rowcount
+
+    def add_asked(self, prompt_hash: str, entry: dict, summary_addition: str | None = None) -> bool:
+        # Records an answered question (first answer wins) and, in the same transaction, its summary addition.
+        def fn(db):
+            if not self._insert_asked(db, prompt_hash, entry): return 0
+            if summary_addition: self._insert_items(db, "global_items", ("summary_additions",), [summary_addition])
+            return 1
+        return self._write(fn)
+
+    def replace_global(self, field: str, items: list[str]) -> bool:
+        # For curation: the field's items become exactly `items` (deduplicated, in order).
+        def fn(db):
+            old = [r[0] for r in db.execute("SELECT text FROM global_items WHERE field = ? ORDER BY id", (field,))]
+            db.execute("DELETE FROM global_items WHERE field = ?", (field,))
+            self._insert_items(db, "global_items", (field,), items)
+            new = [r[0] for r in db.execute("SELECT text FROM global_items WHERE field = ? ORDER BY id", (field,))]
+            return old != new
+        return self._write(fn)
+
+    # --- lookups ---
+
+    def get_asked(self, prompt_hash: str) -> dict | None:
+        with self._lock:
+            row = self._db().execute("SELECT entry FROM asked WHERE prompt_hash = ?", (prompt_hash,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def asked_ids(self) -> list[str]:
+        with self._lock:
+            return [r[0] for r in self._db().execute("SELECT prompt_hash FROM asked ORDER BY id")]
+
+    def asked_for_role(self, role_key: str) -> dict[str, dict]:
+        with self._lock:
+            rows = self._db().execute("SELECT prompt_hash, entry FROM asked WHERE role_key = ? ORDER BY id", (role_key,)).fetchall()
+        return {pid: json.loads(entry) for pid, entry in rows}
+
+    def global_items(self, field: str) -> list[str]:
+        with self._lock:
+            return [r[0] for r in self._db().execute("SELECT text FROM global_items WHERE field = ? ORDER BY id", (field,))]
+
+    def role_items(self, role_key: str) -> dict[str, list[str]]:
+        out: dict[str, list[str]] = {}
+        with self._lock:
+            for field, text in self._db().execute("SELECT field, text FROM role_items WHERE role_key = ? ORDER BY id", (role_key,)):
+                out.setdefault(field, []).append(text)
+        return out
+
+    # --- JSON view ---
+
+    def _to_dict(self, db: sqlite3.Connection, asked: bool = True) -> dict:
+        g = {f: [] for f in GLOBAL_FIELDS}
+        for field, text in db.execute("SELECT field, text FROM global_items ORDER BY id"):
+            g.setdefault(field, []).append(text)
+        roles: dict[str, dict[str, list[str]]] = {}
+        for rk, field, text in db.execute("SELECT role_key, field, text FROM role_items ORDER BY id"):
+            roles.setdefault(rk, {}).setdefault(field, []).append(text)
+        history = {}
+        if asked:
+            history = {pid: json.loads(entry) for pid, entry in db.execute("SELECT prompt_hash, entry FROM asked ORDER BY id")}
+        return {"global": g, "roles": roles, "asked": history}
+
+    def snapshot(self, asked: bool = True) -> tuple[int, dict]:
+        # (revision, answers.json-shaped dict) read in one transaction, so the two always match.
+        # asked=False leaves the question history out (it grows without bound and nothing renders from it).
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN")
+            try:
+                return int(self._meta(db, "revision", "0")), self._to_dict(db, asked)
+            finally:
+                db.execute("COMMIT")
+
+    def to_dict(self) -> dict:
+        return self.snapshot()[1]
+
+    def export(self, path: Path | None = None) -> Path:
+        from scripts.artifact_store import atomic_write
+        path = Path(path) if path else self.json_path
+        rev, data = self.snapshot()
+        body = _dumps(data)
+        atomic_write(path, body)
+        if path == self.json_path:
+            # The file now matches the database: don't re-import it, and let a later hand edit replace
+            # (rather than merge into) the database content.
+            def fn(db):
+                self._set_meta(db, "json_sha", hashlib.sha256(body).hexdigest())
+                self._set_meta(db, "exported_revision", rev)
+            self._write(fn)
+            st = path.stat(); self._json_stamp = (st.st_mtime_ns, st.st_size)
+        return path
+
+    def sync_json(self) -> bool:
+        # Imports answers.json when its content changed since the last import/export (one stat() otherwise).
+        # If the database has nothing newer than the last export the file replaces it (hand edits, including
+        # deletions, win); otherwise the file is merged in, so answers recorded since the export are kept.
+        if self.json_path is None: return False
+        try:
+            st = self.json_path.stat()
+        except FileNotFoundError:
+            return False
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._json_stamp: return False
+        body = self.json_path.read_bytes()
+        sha = hashlib.sha256(body).hexdigest()
+
+        def fn(db):
+            if self._meta(db, "json_sha") == sha: return 0
+            try:
+                data = json.loads(body)
+            except ValueError as e:
+                raise ValueError(f"{self.json_path} is not valid JSON: {e}") from e
+            replace = self._meta(db, "revision", "0") == self._meta(db, "exported_revision", "0")
+            if replace:
+                for table in ("global_items", "role_items", "asked"): db.execute(f"DELETE FROM {table}")
+            self._import(db, data)
+            self._set_meta(db, "json_sha", sha)
+            if replace:  # the database now equals the file, as if just exported
+                self._set_meta(db, "exported_revision", int(self._meta(db, "revision", "0")) + 1)
+            return 1
+        if self._write(fn): self.imports += 1
+        self._json_stamp = stamp
+        return True
+
+    def _import(self, db: sqlite3.Connection, data: dict):
+        for field, items in (data.get("global") or {}).items():
+            if not isinstance(items, list): raise ValueError(f"answers global.{field} must be a list")
+            self._insert_items(db, "global_items", (field,), items)
+        for rk, fields in (data.get("roles") or {}).items():
+            for field, items in (fields or {}).items():
+                if not isinstance(items, list): raise ValueError(f"answers roles.{rk}.{field} must be a list")
+                self._insert_items(db, "role_items", (rk, field), items)
+        entries = [(pid, e if isinstance(e, dict) else {"answer": e}) for pid, e in (data.get("asked") or {}).items()]
+        db.executemany("INSERT OR IGNORE INTO asked(prompt_hash, role_key, company_used, entry) VALUES(?, ?, ?, ?)",
+                       [(pid, e.get("role_key"), e.get("company_used"), _encode_entry(e)) for pid, e in entries])
+
+    def stats(self) -> dict:
+        with self._lock:
+            db = self._db()
+            counts = {t: db.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("global_items", "role_items", "asked")}
+            rev, exported = int(self._meta(db, "revision", "0")), int(self._meta(db, "exported_revision", "0"))
+        return {"path": str(self.path), **counts, "revision": rev, "unexported_changes": rev != exported}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None: self._conn.close(); self._conn = None
+
+_DEFAULT: AnswersDB | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+def get_answers_db() -> AnswersDB:
+    global _DEFAULT
+    if _DEFAULT is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT is None: _DEFAULT = AnswersDB()
+    return _DEFAULT
+
+def _entry(i: int, rng: random.Random) -> dict:
+    return {"prompt": f"Question {i}: describe a result you drove at company {i % 500}?",
+            "answer": f"Delivered outcome {i} with {rng.randint(5, 95)}% improvement across {rng.randint(2, 40)} accounts.",
+            "type": "freeform", "company_used": f"co-{i % 500}", "role_key": f"role-{i % 200}",
+            "timestamp": "2026-01-01T00:00:00Z"}
+
+def _bench(entries: int, saves: int):
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        history = {f"{i:016x}": _entry(i, rng) for i in range(entries)}
+        data = {"global": {"extra_keywords": [], "summary_additions": []}, "roles": {}, "asked": history}
+        json_path = tmp / "answers.json"
+        json_path.write_bytes(_dumps(data))
+
+        # Old path: read + parse the whole file and rewrite it for each saved answer.
+        t0 = time.perf_counter()
+        for n in range(saves):
+            d = json.loads(json_path.read_text(encoding="utf-8"))
+            d["asked"][f"new-{n}"] = _entry(entries + n, rng)
+            json_path.write_text(json.dumps(d, indent=2), encoding="utf-8")
+        rewrite = (time.perf_counter() - t0) / saves
+
+        db = AnswersDB(tmp / "answers.sqlite", json_path)
+        t0 = time.perf_counter(); db.sync_json(); load = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for n in range(saves):
+            db.add_asked(f"db-{n}", _entry(entries + n, rng), summary_addition=f"Summary addition {n}.")
+        insert = (time.perf_counter() - t0) / saves
+
+        keys = rng.sample(list(history), 1000)
+        t0 = time.perf_counter()
+        for k in keys: db.get_asked(k)
+        by_hash = (time.perf_counter() - t0) / len(keys)
+        t0 = time.perf_counter()
+        for i in range(200): db.asked_for_role(f"role-{i}")
+        by_role = (time.perf_counter() - t0) / 200
+
+        t0 = time.perf_counter(); db.revision(); rev = time.perf_counter() - t0
+        t0 = time.perf_counter(); db.export(tmp / "export.json"); export = time.perf_counter() - t0
+        exported = json.loads((tmp / "export.json").read_text(encoding="utf-8"))
+        if len(exported["asked"]) != entries + 2 * saves: raise SystemExit("export lost entries")
+        db.close()
+
+    print(f"{entries:,} asked entries, {saves} saves")
+    print(f"  json rewrite per save     {rewrite * 1000:>10.2f} ms")
+    print(f"  sqlite insert per answer  {insert * 1000:>10.3f} ms   ({rewrite / insert:.0f}x)")
+    print(f"  lookup by prompt hash     {by_hash * 1e6:>10.1f} us")
+    print(f"  lookup by role key        {by_role * 1e6:>10.1f} us   ({entries // 200} entries/role)")
+    print(f"  revision check            {rev * 1e6:>10.1f} us")
+    print(f"  initial import            {load * 1000:>10.1f} ms")
+    print(f"  export to answers.json    {export * 1000:>10.1f} ms")
+
+def main():
+    ap = argparse.ArgumentParser(description="Answers database (profile/answers.sqlite) and its answers.json view.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="Row counts, revision, and whether answers.json is behind the database")
+    e = sub.add_parser("export", help="Write the database to answers.json (or --path)")
+    e.add_argument("--path")
+    b = sub.add_parser("bench", help="JSON rewrite vs SQLite insert/lookup with a large asked history")
+    b.add_argument("--entries", type=int, default=100_000)
+    b.add_argument("--saves", type=int, default=20)
+    args = ap.parse_args()
+
+    if args.cmd == "bench": _bench(args.entries, args.saves); return
+    db = get_answers_db()
+    db.sync_json()
+    if args.cmd == "export": print(f"Wrote {db.export(args.path)}")
+    else: print(json.dumps(db.stats(), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+# scripts/artifact_store.py
+# Content-addressed storage for build artifacts: each distinct file is stored once under
+# outputs/.store/objects/<sha256[:2]>/<sha256[2:]> and every outputs/<slug>/ file is a writable copy of it
+# (a copy-on-write clone where the filesystem supports one), placed with an atomic rename.
+# outputs/<slug>/.artifacts.json records name -> sha256 for each placed file.
+#   python -m scripts.artifact_store stats | gc [--dry-run] | verify | migrate [--dry-run]
+from __future__ import annotations
+import argparse, hashlib, json, os, sys, tempfile, threading, time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parents[1]
+OUTPUTS = BASE / "outputs"
+STORE_DIR = OUTPUTS / ".store"
+INDEX_NAME = ".artifacts.json"
+# RESUME_ARTIFACT_LINKS=1 hard-links slug files to their blobs instead: no extra disk space, but the files are
+# then read-only (an in-place edit would change the blob and every other file linked to it).
+LINKS = os.environ.get("RESUME_ARTIFACT_LINKS", "0") not in ("", "0")
+_FICLONE = 0x40049409 if sys.platform.startswith("linux") else None  # ioctl: reflink one file into another
+STALE_TMP_S = 3600
+MIGRATE_SUFFIXES = (".docx", ".json", ".txt", ".md")
+# mkstemp creates 0600 files; finished files get the mode a plain open() would give them.
+_UMASK = os.umask(0); os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+def atomic_write(path: Path, data: bytes | str):
+    # Unique temp file in the target directory, then os.replace: readers and concurrent writers only
+    # ever see a complete old or complete new file.
+    if isinstance(data, str): data = data.encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f: f.write(data)
+        os.chmod(tmp, FILE_MODE)
+        os.replace(tmp, path)
+    except BaseException:
+        try: os.unlink(tmp)
+        except OSError: pass
+        raise
+
+class ArtifactStore:
+    def __init__(self, root: Path = STORE_DIR, links: bool = LINKS):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.links = links
+        self._lock = threading.Lock()
+
+    def object_path(self, sha: str) -> Path:
+        return self.objects / sha[:2] / sha[2:]
+
+    def put(self, data: bytes) -> str:
+        sha = hashlib.sha256(data).hexdigest()
+        obj = self.object_path(sha)
+        if not obj.exists():
+            atomic_write(obj, data)
+            # Read-only: with RESUME_ARTIFACT_LINKS=1 a blob is shared by every file linked to it.
+            if os.name != "nt": os.chmod(obj, 0o444)
+        return sha
+
+    def place(self, dest: Path, data: bytes | str) -> str:
+        # Writes `dest` (a copy of, or with links enabled a link to, the stored blob) and records it in the
+        # directory's index.
+        if isinstance(data, str): data = data.encode("utf-8")
+        sha = self.put(data)
+        obj = self.object_path(sha)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if self.links and os.path.samefile(dest, obj): self._record(dest, sha, len(data)); return sha  # already linked
+        except OSError:
+            pass
+        fd, tmp = tempfile.mkstemp(dir=dest.parent, prefix=f".{dest.name}.", suffix=".tmp")
+        os.close(fd); os.unlink(tmp)
+        try:
+            try:
+                if not self.links: raise OSError("links disabled")
+                os.link(obj, tmp)
+            except OSError:  # links disabled, other filesystem, or FAT
+                _copy_blob(obj, tmp, data)
+            os.replace(tmp, dest)
+            # rename() between two links to the same inode is a no-op that leaves tmp behind
+            # (a concurrent build linked dest to the same blob meanwhile).
+            if os.path.lexists(tmp): os.unlink(tmp)
+        except BaseException:
+            try: os.unlink(tmp)
+            except OSError: pass
+            raise
+        self._record(dest, sha, len(data))
+        return sha
+
+    def _record(self, dest: Path, sha: str, size: int):
+        # Serialised within the process; two processes building the same slug at once may drop an entry,
+        # which only costs dedup accounting (gc also keeps any blob that is still hard-linked).
+        index_path = dest.parent / INDEX_NAME
+        with self._lock:
+            index = read_index(dest.parent)
+            index[dest.name] = {"sha256": sha, "size": size}
+            atomic_write(index_path, json.dumps(index, indent=2, sort_keys=True))
+
+    def iter_objects(self):
+        if not self.objects.exists(): return
+        for sub in self.objects.iterdir():
+            if sub.is_dir():
+                for obj in sub.iterdir():
+                    if not obj.name.endswith(".tmp") and not obj.name.startswith("."): yield sub.name + obj.name, obj
+
+    def referenced(self, outputs: Path = OUTPUTS) -> set[str]:
+        # Blobs still in use: index entries whose slug file exists with the recorded size.
+        refs = set()
+        for index_path in outputs.glob(f"*/{INDEX_NAME}"):
+            for name, entry in read_index(index_path.parent).items():
+                f = index_path.parent / name
+                try:
+                    if f.stat().st_size == entry["size"]: refs.add(entry["sha256"])
+                except OSError:
+                    pass
+        return refs
+
+    def gc(self, outputs: Path = OUTPUTS, dry_run: bool = False) -> dict:
+        # Deletes blobs no slug file uses (no index reference and no other hard link), stale temp files,
+        # and index entries for files that are gone.
+        refs = self.referenced(outputs)
+        removed, freed = 0, 0
+        for sha, obj in list(self.iter_objects()):
+            st = obj.stat()
+            if sha in refs or st.st_nlink > 1: continue
+            removed += 1; freed += st.st_size
+            if not dry_run: _unlink(obj)
+        now, tmps = time.time(), 0
+        for tmp in [*self.objects.glob("*/.*.tmp"), *outputs.glob("*/.*.tmp")]:
+            try:
+                if now - tmp.stat().st_mtime > STALE_TMP_S:
+                    tmps += 1
+                    if not dry_run: _unlink(tmp)
+            except OSError:
+                pass
+        pruned = 0
+        for index_path in outputs.glob(f"*/{INDEX_NAME}"):
+            index = read_index(index_path.parent)
+            live = {n: e for n, e in index.items() if (index_path.parent / n).exists()}
+            if len(live) != len(index):
+                pruned += len(index) - len(live)
+                if not dry_run: atomic_write(index_path, json.dumps(live, indent=2, sort_keys=True))
+        return {"objects_removed": removed, "bytes_freed": freed, "temp_files_removed": tmps, "index_entries_pruned": pruned,
+                "dry_run": dry_run}
+
+    def stats(self, outputs: Path = OUTPUTS) -> dict:
+        objects, stored = 0, 0
+        for _, obj in self.iter_objects():
+            objects += 1; stored += obj.stat().st_size
+        files, logical = 0, 0
+        for index_path in outputs.glob(f"*/{INDEX_NAME}"):
+            for entry in read_index(index_path.parent).values():
+                files += 1; logical += entry["size"]
+        return {"objects": objects, "stored_bytes": stored, "indexed_files": files, "logical_bytes": logical,
+                "dedup_ratio": round(logical / stored, 2) if stored else None}
+
+    def verify(self, outputs: Path = OUTPUTS) -> list[str]:
+        # Slug files whose content no longer matches their index entry (edited or replaced outside the store).
+        problems = []
+        for index_path in outputs.glob(f"*/{INDEX_NAME}"):
+            for name, entry in read_index(index_path.parent).items():
+                f = index_path.parent / name
+                if not f.exists(): problems.append(f"missing: {f}"); continue
+                if hashlib.sha256(f.read_bytes()).hexdigest() != entry["sha256"]: problems.append(f"modified: {f}")
+        return problems
+
+    def migrate(self, outputs: Path = OUTPUTS, dry_run: bool = False) -> dict:
+        # Moves existing slug artifacts into the store (DOCX normalized to fixed zip timestamps first, so
+        # documents that differ only by save time share one blob). Without links, files an earlier run
+        # hard-linked to their (read-only) blob are replaced by writable copies.
+        from scripts.docx_factory import normalize_docx
+        files, before, unlinked = 0, 0, 0
+        for slug in sorted(p for p in outputs.iterdir() if p.is_dir() and not p.name.startswith(".")):
+            if not any(slug.glob("Resume - *.docx")): continue  # not a build directory (e.g. outputs/bench)
+            indexed = read_index(slug)
+            for f in sorted(slug.iterdir()):
+                if not f.is_file() or f.name.startswith(".") or f.suffix.lower() not in MIGRATE_SUFFIXES: continue
+                if f.name in indexed:
+                    if not self.links and f.stat().st_nlink > 1:
+                        unlinked += 1
+                        if not dry_run: self.place(f, f.read_bytes())
+                    continue
+                if f.name == "timings.json": continue
+                data = f.read_bytes()
+                files += 1; before += len(data)
+                if dry_run: continue
+                if f.suffix.lower() == ".docx":
+                    try: data = normalize_docx(data)
+                    except Exception: pass  # not a readable zip; stored as-is
+                self.place(f, data)
+        return {"files": files, "bytes_before": before, "unlinked": unlinked, "dry_run": dry_run,
+                **({} if dry_run else self.stats(outputs))}
+
+def _copy_blob(obj: Path, tmp: str, data: bytes):
+    # A plain (writable) file: a copy-on-write clone of the blob on btrfs/XFS, else the bytes written out.
+    with open(tmp, "wb") as f:
+        if _FICLONE is not None:
+            import fcntl
+            try:
+                with open(obj, "rb") as src: fcntl.ioctl(f.fileno(), _FICLONE, src.fileno())
+                return
+            except OSError:
+                pass
+        f.write(data)
+
+def read_index(directory: Path) -> dict[str, dict]:
+    try:
+        return json.loads((directory / INDEX_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def _unlink(path: Path):
+    try:
+        path.unlink()
+    except PermissionError:  # read-only blob on Windows
+        os.chmod(path, 0o644); path.unlink()
+    except FileNotFoundError:
+        pass
+
+_STORE: ArtifactStore | None = None
+
+def get_store() -> ArtifactStore:
+    global _STORE
+    if _STORE is None: _STORE = ArtifactStore()
+    return _STORE
+
+def main():
+    ap = argparse.ArgumentParser(description="Content-addressed artifact store under outputs/.store.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("stats", help="Blob count, stored vs logical bytes")
+    g = sub.add_parser("gc", help="Delete unreferenced blobs, stale temp files and dangling index entries")
+    g.add_argument("--dry-run", action="store_true")
+    sub.add_parser("verify", help="List slug files that no longer match their recorded hash")
+    m = sub.add_parser("migrate", help="Move existing outputs/<slug>/ artifacts into the store (and unlink read-only ones)")
+    m.add_argument("--dry-run", action="store_true")
+    args = ap.parse_args()
+
+    store = get_store()
+    if args.cmd == "stats": print(json.dumps(store.stats(), indent=2))
+    elif args.cmd == "gc": print(json.dumps(store.gc(dry_run=args.dry_run), indent=2))
+    elif args.cmd == "migrate": print(json.dumps(store.migrate(dry_run=args.dry_run), indent=2))
+    else:
+        problems = store.verify()
+        print("\n".join(problems) if problems else "All indexed artifacts match the store.")
+        if problems: raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# scripts/batch_build.py
+from __future__ import annotations
+import argparse, asyncio, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from utils import slugify
+from scripts import build_resume
+from scripts.rank_cache import get_cache
+from scripts.ingest import iter_postings
+
+BASE = Path(__file__).resolve().parents[1]
+
+# Per-worker state: profile, answers and templates are loaded + validated once per process.
+_WORKER: dict = {}
+
+def _unique_slugs(postings):
+    seen: dict[str, int] = {}
+    for post in postings:
+        slug = slugify(post["company"])
+        seen[slug] = seen.get(slug, 0) + 1
+        if seen[slug] > 1: slug = f"{slug}-{seen[slug]}"
+        yield {**post, "slug": slug}
+
+def _init_worker(use_cache: bool = True, force: bool = False, formats=("docx",),
+                 reuse: float | None = build_resume.DEFAULT_THRESHOLD):
+    _WORKER["use_cache"] = use_cache
+    _WORKER["force"] = force
+    _WORKER["formats"] = formats
+    _WORKER["reuse"] = reuse
+    _WORKER["profile"] = build_resume._load_profile()
+    _WORKER["answers"] = build_resume._load_answers()
+    _WORKER["templates"] = build_resume._load_templates()
+
+def _build_one(job: dict, style: str) -> dict:
+    t0 = time.perf_counter()
+    try:
+        if not job["jd_text"].strip(): raise ValueError("empty job description")
+        kwargs = dict(profile=_WORKER["profile"], answers=_WORKER["answers"],
+                      templates=_WORKER["templates"], use_cache=_WORKER["use_cache"], force=_WORKER["force"],
+                      formats=_WORKER["formats"], reuse=_WORKER["reuse"])
+        if style == "all":
+            result = build_resume.build_all_styles(build_resume.STYLES, job["slug"], job["jd_text"], **kwargs)
+        else:
+            result = build_resume.build_pair(style, job["slug"], job["jd_text"], **kwargs)
+        return {"slug": job["slug"], "company": job["company"], "ok": True,
+                "seconds": round(time.perf_counter() - t0, 3), "result": result}
+    except Exception as e:
+        return {"slug": job["slug"], "company": job["company"], "ok": False,
+                "seconds": round(time.perf_counter() - t0, 3), "error": f"{type(e).__name__}: {e}"}
+
+async def _prerank(src: Path, concurrency: int, batch_size: int, chunk: int = 256) -> dict | None:
+    from scripts.rank_client import AsyncRanker, make_backend
+    backend = make_backend()
+    if backend is None: return None
+    ranker = AsyncRanker(backend, concurrency=concurrency)
+    jds: list[str] = []
+    for post in iter_postings(src):
+        if post["jd_text"].strip(): jds.append(post["jd_text"])
+        if len(jds) >= chunk:
+            await ranker.rank_many(jds, batch_size=batch_size); jds = []
+    if jds: await ranker.rank_many(jds, batch_size=batch_size)
+    return {"backend": backend.name, **ranker.summary()}
+
+def prerank(src: Path, concurrency: int = 8, batch_size: int = 1) -> dict | None:
+    # Fill the ranking cache with concurrent async requests so build workers only see cache hits.
+    return asyncio.run(_prerank(src, concurrency, batch_size))
+
+def run_batch(src: Path, style: str = "balanced", workers: int | None = None, use_cache: bool = True,
+              rank_concurrency: int = 0, rank_batch_size: int = 1, force: bool = False, formats=("docx",),
+              reuse: float | None = build_resume.DEFAULT_THRESHOLD) -> dict:
+    workers = workers or os.cpu_count() or 1
+    results: list[dict] = []
+    t0 = time.perf_counter()
+    preranked = prerank(src, rank_concurrency, rank_batch_size) if use_cache and rank_concurrency > 0 else None
+    jobs = _unique_slugs(iter_postings(src))
+    # Keep a bounded number of postings in flight so huge exports are not read into memory up front.
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(use_cache, force, build_resume.parse_formats(formats), reuse)) as pool:
+        pending = set()
+        for job in jobs:
+            pending.add(pool.submit(_build_one, job, style))
+            if len(pending) >= workers * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                results.extend(f.result() for f in done)
+        results.extend(f.result() for f in wait(pending).done)
+    elapsed = time.perf_counter() - t0
+    ok = sum(1 for r in results if r["ok"])
+    return {
+        "style": style,
+        "workers": workers,
+        "total": len(results),
+        "ok": ok,
+        "failed": len(results) - ok,
+        "seconds": round(elapsed, 3),
+        "postings_per_second": round(len(results) / elapsed, 2) if elapsed > 0 else 0.0,
+        "ranking_cache": get_cache().stats()["lifetime"] if use_cache else None,
+        "prerank": preranked,
+        "postings": sorted(results, key=lambda r: r["slug"]),
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="Build a tailored resume + CV for every posting in a directory or JSONL/CSV export.")
+    ap.add_argument("postings", help="Directory of .txt/.md/.jsonl/.csv postings, or a JSONL/CSV export with company + jd_text columns")
+    ap.add_argument("--style", default="balanced", choices=["balanced","executive","ats","human","all"],
+                    help="Primary style (plus CV), or 'all' for every template")
+    ap.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    ap.add_argument("--summary", default=str(BASE / "outputs" / "batch_summary.json"),
+                    help="Where to write the JSON run summary")
+    ap.add_argument("--no-cache", action="store_true", help="Bypass the on-disk LLM ranking cache")
+    ap.add_argument("--force", action="store_true", help="Rebuild every stage even if its inputs are unchanged")
+    ap.add_argument("--formats", default="docx", metavar="LIST",
+                    help=f"Comma-separated output formats ({', '.join(build_resume.FORMATS)}); the .docx is always written")
+    ap.add_argument("--reuse-threshold", type=float, default=build_resume.DEFAULT_THRESHOLD,
+                    help="Reuse the ranking/artifacts of an earlier build whose JD keywords are this similar (Jaccard)")
+    ap.add_argument("--no-reuse", action="store_true", help="Never reuse a near-duplicate earlier build")
+    ap.add_argument("--prerank", type=int, default=0, metavar="N",
+                    help="Rank all postings up front with N concurrent LLM requests (fills the cache; backend from "
+                         "RESUME_RANK_BASE_URL or OPENAI_API_KEY)")
+    ap.add_argument("--rank-batch-size", type=int, default=1, help="JDs per ranking prompt when pre-ranking")
+    args = ap.parse_args()
+
+    try:
+        formats = build_resume.parse_formats(args.formats)
+    except ValueError as e:
+        ap.error(str(e))
+    src = Path(args.postings)
+    if not src.exists():
+        print(f"Postings source not found: {src}"); sys.exit(1)
+
+    summary = run_batch(src, style=args.style, workers=args.workers, use_cache=not args.no_cache,
+                        rank_concurrency=args.prerank, rank_batch_size=args.rank_batch_size, force=args.force,
+                        formats=formats, reuse=None if args.no_reuse else args.reuse_threshold)
+    # Up to date = every artifact stage skipped; the rank stage is not counted (a reused or supplied ranking
+    # is not recorded as skipped).
+    artifacts = set(build_resume._artifact_stages(formats))
+    for r in summary["postings"]:
+        if r["ok"]:
+            fresh = all(artifacts <= set(b["skipped"]) for b in r["result"].values())
+            reused = next((b["reused"] for b in r["result"].values() if b.get("reused")), None)
+            note = f" reused {reused['from']} ({reused['similarity']:.2f})" if reused else ""
+            print(f"{'SKIP' if fresh else 'REUSE' if reused else 'OK':<6}{r['slug']} ({r['seconds']}s){note}")
+        else: print(f"FAIL  {r['slug']}: {r['error']}")
+    print(f"\n{summary['ok']}/{summary['total']} succeeded, {summary['failed']} failed "
+          f"in {summary['seconds']}s ({summary['postings_per_second']} postings/s, {summary['workers']} workers)")
+
+    out = Path(args.summary)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    print(f"Summary: {out}")
+    if summary["failed"]: sys.exit(2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# scripts/bench_docx.py
+from __future__ import annotations
+import argparse, time
+from io import BytesIO
+from pathlib import Path
+from docx import Document
+from scripts.build_resume import _load_profile, _load_answers, _compose_markdown, _docx_lines, _render_docx
+from scripts.docx_factory import get_factory
+
+BASE = Path(__file__).resolve().parents[1]
+
+def _legacy_render(md: str, profile):
+    # The original per-build path: parse the default package, then one add_paragraph per line.
+    doc = Document()
+    for line in _docx_lines(md, profile): doc.add_paragraph(line)
+    return doc
+
+def _per_doc_ms(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n): fn()
+    return (time.perf_counter() - t0) / n * 1000
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-document DOCX render time: Document() per build vs the cached skeleton factory.")
+    ap.add_argument("-n", type=int, default=100, help="Documents per measurement")
+    ap.add_argument("--jd-file", default=str(BASE / "data" / "job_posting.txt"))
+    args = ap.parse_args()
+
+    profile, answers = _load_profile(), _load_answers()
+    jd = Path(args.jd_file).read_text(encoding="utf-8") if Path(args.jd_file).exists() else ""
+    md, _ = _compose_markdown(profile, answers, jd, style="cv", use_cache=False)
+
+    t0 = time.perf_counter(); get_factory(); warm = (time.perf_counter() - t0) * 1000
+    old_doc, new_doc = _legacy_render(md, profile), _render_docx(md, profile)
+    if [p.text for p in old_doc.paragraphs] != [p.text for p in new_doc.paragraphs]:
+        raise SystemExit("Rendered paragraphs differ between legacy and factory paths")
+
+    rows = [
+        ("render (legacy)", _per_doc_ms(lambda: _legacy_render(md, profile), args.n)),
+        ("render (factory)", _per_doc_ms(lambda: _render_docx(md, profile), args.n)),
+        ("render+save (legacy)", _per_doc_ms(lambda: _legacy_render(md, profile).save(BytesIO()), args.n)),
+        ("render+save (factory)", _per_doc_ms(lambda: _render_docx(md, profile).save(BytesIO()), args.n)),
+    ]
+    print(f"{len(old_doc.paragraphs)} paragraphs/doc, {args.n} docs per row, factory warm-up {warm:.1f}ms (once per process)")
+    for label, ms in rows:
+        print(f"{label:<24} {ms:8.2f} ms/doc")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# scripts/bench_keywords.py
+from __future__ import annotations
+import argparse, random, re, time
+from utils import extract_keywords
+
+WORDS = ("enterprise account executive saas cybersecurity public sector government quota pipeline prospecting "
+         "discovery negotiation closing salesforce hubspot meddic bant endpoint passwordless identity-first rfp "
+         "the and with for our you team role will experience years strong remote benefits").split()
+SEPS = [" "] * 12 + ["  ", "\n", ", ", ". ", "; ", " - ", "\n\n", " (", ") ", " 5+ ", "/", "_x "]
+
+def _reference_extract_keywords(jd_text: str, top_k: int = 60) -> list[str]:
+    # The original two-pass implementation, kept to check the output is unchanged.
+    text = jd_text.lower()
+    phrases = re.findall(r"\b([a-z]+(?:\s+[a-z]+){1,3})\b", text)
+    singles = re.findall(r"[a-z]{3,}", text)
+    bag = phrases + singles
+    stop = set("a an the and or to for with of in into on at from that this those these you your our we they i he she it their be is are was were as by about not will can should would could have has had if but so than then when where which who whose whom such etc per via within without among across under over more most less least few many new use used using also only other same own each every either neither both any all some no nor include including includes included open close free strong great fast nice own role job position company team work remote salary pay compensation benefits etc manager director lead junior senior iii ii i".split())
+    freq = {}
+    for tok in bag:
+        if any(w in stop for w in tok.split()): continue
+        if len(tok) < 3: continue
+        freq[tok] = freq.get(tok, 0) + 1
+    ranked = sorted(freq.items(), key=lambda x: (-x[1], x[0]))[:top_k]
+    return [k for k,_ in ranked]
+
+def synthetic_jd(size: int, seed: int = 0) -> str:
+    rnd = random.Random(seed)
+    parts, n = [], 0
+    while n < size:
+        w = rnd.choice(WORDS)
+        if rnd.random() < 0.1: w = w.capitalize()
+        parts.append(w); parts.append(rnd.choice(SEPS))
+        n += len(w) + 2
+    return "".join(parts)[:size]
+
+def _best(fn, text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(text); best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description="Microbenchmark extract_keywords against the original two-pass version.")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    print(f"{'size':>8}  {'reference':>11}  {'current':>11}  {'speedup':>7}")
+    for label, size in (("1 KB", 1_000), ("50 KB", 50_000), ("1 MB", 1_000_000)):
+        text = synthetic_jd(size)
+        if extract_keywords(text) != _reference_extract_keywords(text):
+            raise SystemExit(f"Output mismatch at {label}")
+        repeat = args.repeat if size < 1_000_000 else max(1, args.repeat // 2)
+        ref = _best(_reference_extract_keywords, text, repeat)
+        cur = _best(extract_keywords, text, repeat)
+        print(f"{label:>8}  {ref*1000:>9.2f}ms  {cur*1000:>9.2f}ms  {ref/cur:>6.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# scripts/bench_pipeline.py
+# Offline per-stage benchmark of the tailoring pipeline on synthetic profiles/JDs, with run-to-run comparison.
+from __future__ import annotations
+import argparse, gc, json, platform, random, statistics, subprocess, sys, time
+from io import BytesIO
+from pathlib import Path
+from utils import extract_keywords, md_experience, ProfileSchema, AnswersSchema
+from scripts.bench_keywords import WORDS, synthetic_jd
+from scripts.bullet_selector import select_bullets
+from scripts.build_manifest import tool_version
+from scripts.build_resume import (
+    _load_templates, _tailoring_context, _skills_in_ranked, _filter_join, _render_docx, _lint_docx, _document
+)
+from scripts.prompt_engine import build_rank_prompt, parse_ranking
+from scripts.rank_client import stub_completion
+from scripts.renderers import render
+from scripts.template_registry import TemplateRegistry
+
+BASE = Path(__file__).resolve().parents[1]
+RESULTS_DIR = BASE / "outputs" / "bench"
+ROLE_SIZES = (5, 50, 200)
+JD_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+QUICK_ROLE_SIZES = (5, 50)
+QUICK_JD_SIZES = (1_000, 100_000)
+# Ratios above --threshold only count as regressions when the time also moved by at least this much.
+NOISE_FLOOR_MS = 0.5
+
+def synthetic_profile(roles: int, seed: int = 0) -> ProfileSchema:
+    rnd = random.Random(seed)
+    phrase = lambda lo, hi: " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(lo, hi)))
+    skills = lambda n: [phrase(1, 3).title() for _ in range(n)]
+    profile = {
+        "name": "Pat Example",
+        "location": "Toronto, ON",
+        "email": "pat@example.com",
+        "phone": "(555) 555-5555",
+        "linkedin": "https://www.linkedin.com/in/example/",
+        "domains": skills(roles * 4),
+        "methods": skills(roles * 4),
+        "platforms": skills(roles * 4),
+        "security_terms": skills(roles * 2),
+        "experience": [
+            {"company": f"Company {i}", "title": phrase(2, 4).title(), "location": "Remote",
+             "start": str(2000 + i % 25), "end": str(2001 + i % 25),
+             "bullets": [phrase(8, 20).capitalize() + "." for _ in range(rnd.randint(10, 20))]}
+            for i in range(roles)
+        ],
+        "education": ["B.A. (Hons) - University"],
+        "awards": [f"President's Club {2000 + i}" for i in range(min(roles, 20))],
+    }
+    return ProfileSchema.model_validate(profile)
+
+def _measure(fn, repeat: int) -> dict:
+    # GC paused while timing, as timeit does, so collections triggered by earlier stages don't land here.
+    runs = []
+    gc.collect(); gc.disable()
+    try:
+        for _ in range(repeat):
+            t0 = time.perf_counter(); fn(); runs.append((time.perf_counter() - t0) * 1000)
+    finally:
+        gc.enable()
+    return {"min_ms": round(min(runs), 3), "median_ms": round(statistics.median(runs), 3)}
+
+def bench_case(roles: int, jd_size: int, templates: TemplateRegistry, repeat: int, style: str = "cv") -> dict:
+    profile = synthetic_profile(roles, seed=roles)
+    answers = AnswersSchema.model_validate({"global": {}})
+    jd = synthetic_jd(jd_size, seed=jd_size)
+    tpl = templates.get(style)
+
+    # Inputs for each stage come from the stage before it, computed once outside the timed calls.
+    cands = extract_keywords(jd)
+    ranked = parse_ranking(stub_completion(build_rank_prompt(jd, cands)))
+    ctx = _tailoring_context(profile, answers, jd, ranked=ranked)
+    selected = select_bullets(profile, answers, ranked)  # also warms the per-profile bullet index
+    md = tpl.render(ctx["fields"])
+    doc = _render_docx(md, profile)
+    blocks = _document(md, profile)
+
+    def filter_join():
+        in_ranked = _skills_in_ranked(profile, ranked)
+        for label, cap in (("domains", 6), ("methods", 10), ("platforms", 8)):
+            _filter_join(getattr(profile, label), in_ranked, cap)
+
+    stages = {
+        "extract_keywords": lambda: extract_keywords(jd),
+        "rank_stub": lambda: parse_ranking(stub_completion(build_rank_prompt(jd, cands))),
+        "filter_join": filter_join,
+        "select_bullets": lambda: select_bullets(profile, answers, ranked),
+        "md_experience": lambda: md_experience(profile.experience, answers, selected),
+        "fill_template": lambda: tpl.render(ctx["fields"]),  # stage name kept so older results stay comparable
+        "docx_render": lambda: _render_docx(md, profile),
+        "docx_save": lambda: doc.save(BytesIO()),
+        "pdf_render": lambda: render(blocks, "pdf"),
+        "txt_render": lambda: render(blocks, "txt"),
+        "coverage_report": lambda: ctx["matcher"].present_missing("\n".join(p.text for p in doc.paragraphs)),
+        "lint": lambda: _lint_docx(doc),
+    }
+    timings = {name: _measure(fn, repeat) for name, fn in stages.items()}
+    return {
+        "case": f"roles={roles} jd={jd_size}",
+        "roles": roles,
+        "jd_bytes": jd_size,
+        "bullets": sum(len(r.bullets) for r in profile.experience),
+        "skills": sum(len(getattr(profile, k)) for k in ("domains", "methods", "platforms", "security_terms")),
+        "paragraphs": len(doc.paragraphs),
+        "stages": timings,
+        "total_ms": round(sum(t["median_ms"] for t in timings.values()), 3),
+    }
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE, capture_output=True, text=True, timeout=10)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+def run(role_sizes, jd_sizes, repeat: int) -> dict:
+    templates = _load_templates()
+    bench_case(role_sizes[0], jd_sizes[0], templates, 1)  # warm-up (DOCX factory, lazy imports); discarded
+    cases = []
+    for roles in role_sizes:
+        for jd_size in jd_sizes:
+            case = bench_case(roles, jd_size, templates, repeat)
+            print(f"{case['case']:<24} {case['total_ms']:>10.2f} ms  "
+                  + "  ".join(f"{k}={v['median_ms']:.2f}" for k, v in case["stages"].items()), flush=True)
+            cases.append(case)
+    meta = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0],
+            "platform": platform.platform(), "git_commit": _git_commit(), "tool_version": tool_version()[:12],
+            "repeat": repeat}
+    return {"meta": meta, "cases": cases}
+
+def compare(old: dict, new: dict, threshold: float) -> list[dict]:
+    # Best-of-N (min) per (case, stage) present in both runs: steadier than the median across noisy runs.
+    old_cases = {c["case"]: c for c in old.get("cases", [])}
+    rows = []
+    for case in new["cases"]:
+        prev = old_cases.get(case["case"])
+        if not prev: continue
+        for stage, t in case["stages"].items():
+            before = prev["stages"].get(stage, {}).get("min_ms")
+            if before is None: continue
+            after = t["min_ms"]
+            ratio = after / before if before > 0 else float("inf")
+            rows.append({"case": case["case"], "stage": stage, "before_ms": before, "after_ms": after,
+                         "ratio": round(ratio, 3),
+                         "regression": ratio > threshold and after - before >= NOISE_FLOOR_MS})
+    return rows
+
+def _latest_result() -> Path | None:
+    found = sorted(RESULTS_DIR.glob("pipeline-*.json"))
+    return found[-1] if found else None
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark every tailoring stage on synthetic profiles (5-200 roles) and JDs (1 KB-1 MB).")
+    ap.add_argument("--repeat", type=int, default=5, help="Timed runs per stage (min and median are recorded)")
+    ap.add_argument("--quick", action="store_true", help="Smaller matrix for a fast check")
+    ap.add_argument("--out", default=None, help=f"Results JSON (default: {RESULTS_DIR.relative_to(BASE)}/pipeline-<timestamp>.json)")
+    ap.add_argument("--compare", default=None, metavar="PATH|latest",
+                    help="Earlier results to compare against; 'latest' uses the newest file in outputs/bench")
+    ap.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio that counts as a regression")
+    args = ap.parse_args()
+
+    baseline = _latest_result() if args.compare == "latest" else (Path(args.compare) if args.compare else None)
+    roles, jds = (QUICK_ROLE_SIZES, QUICK_JD_SIZES) if args.quick else (ROLE_SIZES, JD_SIZES)
+    result = run(roles, jds, args.repeat)
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"\nResults: {out}")
+
+    if baseline is None: return
+    if not baseline.exists():
+        print(f"Baseline not found: {baseline}"); sys.exit(1)
+    rows = compare(json.loads(baseline.read_text(encoding="utf-8")), result, args.threshold)
+    regressions = [r for r in rows if r["regression"]]
+    print(f"Compared with {baseline} ({len(rows)} stage timings, threshold {args.threshold}x)")
+    for r in sorted(rows, key=lambda r: -r["ratio"])[:10]:
+        flag = "REGRESSION" if r["regression"] else ""
+        print(f"  {r['case']:<24} {r['stage']:<16} {r['before_ms']:>9.2f} -> {r['after_ms']:>9.2f} ms  {r['ratio']:>5.2f}x  {flag}")
+    if regressions:
+        print(f"{len(regressions)} regression(s)"); sys.exit(1)
+    print("No regressions")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# scripts/bench_profile.py
+from __future__ import annotations
+import argparse, json, os, tempfile, time
+from pathlib import Path
+from utils import ProfileSchema, md_experience, AnswersSchema
+from scripts.bench_pipeline import synthetic_profile
+from scripts.profile_store import ModelStore
+
+def _per_call_ms(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n): fn()
+    return (time.perf_counter() - t0) / n * 1000
+
+def _legacy_load(path: Path) -> dict:
+    # The previous per-build path: text -> dict -> ProfileSchema(**data), model discarded, dict returned.
+    data = json.loads(path.read_text(encoding="utf-8"))
+    ProfileSchema(**data)
+    return data
+
+def _legacy_walk(profile: dict) -> int:
+    n = sum(len(profile.get(k, [])) for k in ("domains", "methods", "platforms", "security_terms"))
+    return n + sum(len(r.get("bullets", [])) for r in profile["experience"])
+
+def _typed_walk(profile: ProfileSchema) -> int:
+    n = len(profile.domains) + len(profile.methods) + len(profile.platforms) + len(profile.security_terms)
+    return n + sum(len(r.bullets) for r in profile.experience)
+
+def main():
+    ap = argparse.ArgumentParser(description="Profile loading: re-parse + validate per build vs the cached ProfileStore.")
+    ap.add_argument("-n", type=int, default=50, help="Calls per measurement")
+    ap.add_argument("--roles", type=int, nargs="+", default=[5, 50, 200])
+    args = ap.parse_args()
+
+    answers = AnswersSchema.model_validate({"global": {}})
+    print(f"{'roles':>5} {'size':>8}  {'legacy load':>12} {'validate_json':>14} {'store hit':>10} {'store touch':>12}  {'dict walk':>10} {'typed walk':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for roles in args.roles:
+            path = Path(tmp) / f"profile_{roles}.json"
+            model = synthetic_profile(roles, seed=roles)
+            path.write_text(model.model_dump_json(indent=2), encoding="utf-8")
+            store = ModelStore(path, ProfileSchema)
+            if store.get() != model or md_experience(store.get().experience, answers) != md_experience(model.experience, answers):
+                raise SystemExit("ProfileStore model differs from the source profile")
+            as_dict = _legacy_load(path)
+
+            def touched():
+                os.utime(path, None); return store.get()
+
+            legacy = _per_call_ms(lambda: _legacy_load(path), args.n)
+            direct = _per_call_ms(lambda: ProfileSchema.model_validate_json(path.read_bytes()), args.n)
+            hit = _per_call_ms(store.get, args.n * 10)
+            touch = _per_call_ms(touched, args.n)
+            walk_d = _per_call_ms(lambda: _legacy_walk(as_dict), args.n * 10)
+            walk_t = _per_call_ms(lambda: _typed_walk(store.get()), args.n * 10)
+            size = f"{path.stat().st_size // 1024} KB"
+            print(f"{roles:>5} {size:>8}  {legacy:>10.3f}ms {direct:>12.3f}ms {hit:>8.4f}ms {touch:>10.3f}ms  {walk_d:>8.4f}ms {walk_t:>9.4f}ms"
+                  f"  (validations: {store.loads})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# scripts/build_manifest.py
+from __future__ import annotations
+import hashlib, json, time
+from functools import lru_cache
+from pathlib import Path
+from scripts.artifact_store import atomic_write
+
+BASE = Path(__file__).resolve().parents[1]
+MANIFEST_NAME = ".build_manifest.json"
+# Source files whose contents define the "tool version": editing any of them invalidates every stage.
+TOOL_FILES = ("scripts/build_resume.py", "scripts/utils.py", "scripts/docx_factory.py",
+              "scripts/prompt_engine.py", "scripts/matcher.py",
+              "scripts/template_registry.py", "scripts/bullet_selector.py",
+              "scripts/artifact_store.py", "scripts/lint_engine.py", "scripts/renderers.py")
+
+def digest(obj) -> str:
+    data = obj if isinstance(obj, bytes) else json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+@lru_cache(maxsize=1)
+def tool_version() -> str:
+    h = hashlib.sha256()
+    for rel in TOOL_FILES:
+        p = BASE / rel
+        h.update(rel.encode("utf-8") + b"\0" + (p.read_bytes() if p.exists() else b""))
+    return h.hexdigest()
+
+def field(data: dict, dotted: str):
+    for part in dotted.split("."):
+        data = data.get(part) if isinstance(data, dict) else None
+    return data
+
+def stage_key(**inputs) -> str:
+    return digest({**inputs, "tool": tool_version()})
+
+class BuildManifest:
+    # outputs/<slug>/.build_manifest.json: {"stages": {id: {"key", "outputs", ...}}, "last_run": {...}}
+    def __init__(self, out_root: Path):
+        self.path = out_root / MANIFEST_NAME
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.stages: dict[str, dict] = data.get("stages", {})
+        self.ran: list[str] = []
+        self.skipped: list[str] = []
+
+    def fresh(self, stage: str, key: str, outputs: list[str] | tuple = ()) -> bool:
+        entry = self.stages.get(stage)
+        return bool(entry) and entry["key"] == key and all(Path(o).exists() for o in outputs)
+
+    def record(self, stage: str, key: str, outputs: list[str] | tuple = (), **extra):
+        self.stages[stage] = {"key": key, "outputs": [str(o) for o in outputs], "built_at": time.time(), **extra}
+
+    def mark(self, stage: str, skipped: bool):
+        (self.skipped if skipped else self.ran).append(stage)
+
+    def save(self):
+        payload = {"tool": tool_version(), "stages": self.stages,
+                   "last_run": {"at": time.time(), "ran": self.ran, "skipped": self.skipped}}
+        atomic_write(self.path, json.dumps(payload, indent=2))
@@ -1,74 +1,124 @@
 from __future__ import annotations
-import json, sys
+import argparse, json, sys
+from io import BytesIO
 from pathlib import Path
-from docx import Document
 from utils import (
-    extract_keywords, md_experience, fill_template, to_ascii,
+    md_experience, to_ascii,
     slugify, ProfileSchema, AnswersSchema, dedupe_list
 )
-from scripts.prompt_engine import rank_keywords_with_llm
+from scripts.profile_store import PROFILE_STORE, ANSWERS_STORE, as_profile, as_answers
+from scripts.ingest import jd_keywords
+from scripts.prompt_engine import MODEL, PROMPT_VERSION, cached_ranking, rank_keywords_with_source
+from scripts.matcher import KeywordMatcher
+from scripts.artifact_store import atomic_write, get_store
+from scripts.build_manifest import BuildManifest, digest, field, stage_key
+from scripts.instrument import EXPORT_KINDS, StageTimer, stage, export, make_exporter, register_exporter
+from scripts.bullet_selector import select_bullets
+from scripts.lint_engine import LintContext, lint_document, run_rules
+from scripts.renderers import RENDERERS, parse_markdown, render, render_docx, text_lines
+from scripts.jd_index import DEFAULT_THRESHOLD, get_jd_index
+from scripts.template_registry import TEMPLATE_FILES, CompiledTemplate, TemplateRegistry, get_registry
 
 BASE = Path(__file__).resolve().parents[1]
+STYLES = tuple(TEMPLATE_FILES)
+ARTIFACT_STAGES = ("docx", "report", "lint")
+# Output formats (scripts/renderers.py). The .docx is always built: lint reads it and the report shares its key.
+FORMATS = tuple(RENDERERS)
+# Near-duplicate reuse (see jd_index): an earlier build's ranking is only reused if it came from the same model + prompt.
+RANKER = f"{MODEL}/{PROMPT_VERSION}"
+# answers.json fields the rendered documents read; edits to anything else (e.g. "asked") rebuild nothing.
+DOCX_ANSWER_FIELDS = ("global.summary_additions", "global.extra_keywords", "roles")
 
-def _write_markdown_as_docx(md: str, profile: dict, out_path: Path):
-    doc = Document()
-    doc.add_paragraph(profile["name"])
-    doc.add_paragraph(f"{profile['location']} | {profile['email']} | {profile['phone']} | {profile['linkedin']}")
-    doc.add_paragraph("")
-    for raw in (md or "").splitlines():
-        line = raw.rstrip()
-        if not line:
-            doc.add_paragraph("")
-            continue
-        doc.add_paragraph(to_ascii(line))
+def _contact_line(profile: ProfileSchema) -> str:
+    return f"{profile.location} | {profile.email} | {profile.phone} | {profile.linkedin}"
+
+def _document(md: str, profile: ProfileSchema) -> list[tuple]:
+    # The parsed document every format is rendered from (name and contact line, then the markdown blocks).
+    return parse_markdown(md, profile.name, _contact_line(profile))
+
+def _docx_lines(md: str, profile: ProfileSchema) -> list[str]:
+    # One entry per document paragraph; "\n".join(lines) is the text the coverage report scans.
+    return text_lines(_document(md, profile))
+
+def _render_docx(md: str, profile: ProfileSchema):
+    # python-docx (and lxml) load on first render, not on import: preview/lint-style callers never pay for them.
+    return render_docx(_document(md, profile))
+
+def parse_formats(value: str | list[str] | tuple[str, ...] | None) -> tuple[str, ...]:
+    # "pdf,txt" / ["pdf"] -> ("docx", "pdf", "txt"); unknown names raise ValueError.
+    items = value.split(",") if isinstance(value, str) else list(value or ())
+    items = [f.strip().lower().lstrip(".") for f in items if f.strip()]
+    unknown = [f for f in items if f not in RENDERERS]
+    if unknown: raise ValueError(f"unknown output format(s): {', '.join(unknown)} (expected {', '.join(FORMATS)})")
+    return tuple(dict.fromkeys(["docx", *items]))
+
+def _artifact_stages(formats=("docx",)) -> tuple[str, ...]:
+    return ARTIFACT_STAGES + tuple(f for f in formats if f not in ARTIFACT_STAGES)
+
+def _write_markdown_as_docx(md: str, profile: ProfileSchema, out_path: Path | BytesIO):
+    doc = _render_docx(md, profile)
     doc.save(out_path)
+    return doc
+
+def _lint_docx(source, timer: StageTimer | None = None, profile: ProfileSchema | None = None, **attrs) -> list[str]:
+    # source: an in-memory Document, or a saved .docx (path or bytes). With the profile, the profile-aware
+    # rules (e.g. contact_in_document) run too, as in `lint --profile`.
+    with stage(timer, "lint", **attrs):
+        return _lint_issues(source, profile.model_dump() if profile is not None else None)
 
-def _lint_docx(path: Path) -> list[str]:
-    issues = []
+def _lint_issues(source, profile: dict | None = None) -> list[str]:
+    # Rules of scripts/lint_engine.py; a saved .docx is read from its XML without python-docx.
     try:
-        doc = Document(path)
-        if getattr(doc, "tables", []):
-            if len(doc.tables) > 0:
-                issues.append(f"Found {len(doc.tables)} table(s) — remove tables for ATS.")
-        try:
-            sec = doc.sections[0]
-            if any(p.text.strip() for p in sec.header.paragraphs):
-                issues.append("Header contains text — clear it (ATS can skip headers).")
-            if any(p.text.strip() for p in sec.footer.paragraphs):
-                issues.append("Footer contains text — clear it (ATS can skip footers).")
-        except Exception:
-            pass
-        full = "\n".join(p.text for p in doc.paragraphs)
-        bad = [ch for ch in full if ord(ch) > 127]
-        if bad:
-            issues.append(f"Non-ASCII chars detected: {len(bad)} — keep ASCII only.")
+        if isinstance(source, (str, Path, bytes)): return [i["message"] for i in run_rules(LintContext.from_docx(source, profile))]
+        return lint_document(source, profile)
     except Exception as e:
-        issues.append(f"Lint error: {e}")
-    return issues
-
-def _load_profile() -> dict:
-    data = json.loads((BASE / "profile" / "profile.json").read_text(encoding="utf-8"))
-    ProfileSchema(**data)
-    return data
-
-def _load_answers() -> dict:
-    p = BASE / "profile" / "answers.json"
-    if p.exists():
-        data = json.loads(p.read_text(encoding="utf-8"))
-    else:
-        data = {"global":{"extra_keywords":[],"summary_additions":[]},"roles":{},"asked":{}}
-    try:
-        AnswersSchema.model_validate(data)
-    except Exception:
-        pass
-    return data
+        return [f"Lint error: {e}"]
+
+def _load_profile() -> ProfileSchema:
+    # Validated once per file change (see profile_store); invalid files raise ValueError.
+    return PROFILE_STORE.get()
 
-def _compose_markdown(profile: dict, answers: dict, jd_text: str, style: str):
-    kw_candidates = extract_keywords(jd_text)
-    ranked = rank_keywords_with_llm(jd_text, kw_candidates)
+def _load_answers() -> AnswersSchema:
+    return ANSWERS_STORE.get()
 
-    g = answers.get("global", {})
-    extras = g.get("summary_additions", [])
+def _load_templates() -> TemplateRegistry:
+    # Compiled + validated once; the registry recompiles a template when its file changes.
+    return get_registry()
+
+def _rank_with_source(jd_text: str, use_cache: bool = True, timer: StageTimer | None = None,
+                      candidates: list[str] | None = None, lookup: bool = True) -> tuple[list[str], str]:
+    # (ranking, "cache" | "llm" | "fallback"): a fallback ranking must not be recorded as the JD's ranking.
+    if candidates is None:
+        with stage(timer, "extract_keywords"):
+            candidates = jd_keywords(jd_text)
+    with stage(timer, "rank") as rec:
+        ranked, rec["source"] = rank_keywords_with_source(jd_text, candidates, use_cache=use_cache, lookup=lookup)
+        return ranked, rec["source"]
+
+def _rank(jd_text: str, use_cache: bool = True, timer: StageTimer | None = None,
+          candidates: list[str] | None = None) -> list[str]:
+    return _rank_with_source(jd_text, use_cache, timer, candidates)[0]
+
+def _skills_in_ranked(profile: ProfileSchema, ranked: list[str]) -> set[str]:
+    # Profile items kept when they occur inside any ranked keyword: one scan over all ranked keywords.
+    skill_items = [*profile.domains, *profile.methods, *profile.platforms]
+    return KeywordMatcher(skill_items).search("\x00".join(ranked)) if ranked else set()
+
+def _filter_join(items: list[str], in_ranked: set[str], cap: int = 8) -> str:
+    keep = [it for it in items if it.lower() in in_ranked]
+    if not keep: keep = items[:cap]
+    return ", ".join(dedupe_list(keep))[:400]
+
+def _tailoring_context(profile: ProfileSchema, answers: AnswersSchema, jd_text: str, use_cache: bool = True,
+                       ranked: list[str] | None = None, timer: StageTimer | None = None) -> dict:
+    # Everything that depends on the JD but not on the style: computed once, rendered by any template.
+    if ranked is None: ranked = _rank(jd_text, use_cache=use_cache, timer=timer)
+    with stage(timer, "context"):
+        return {"ranked": ranked, "matcher": KeywordMatcher(ranked), "fields": _context_fields(profile, answers, ranked)}
+
+def _context_fields(profile: ProfileSchema, answers: AnswersSchema, ranked: list[str]) -> dict[str, str]:
+    g = answers.global_
+    extras = g.summary_additions
     summary_bits = [
         "Enterprise Account Executive for cybersecurity/SaaS across enterprise & public sector",
         "Full sales cycle: prospecting, discovery, negotiation, close (MEDDIC, BANT)",
@@ -77,34 +127,23 @@ def _compose_markdown(profile: dict, answers: dict, jd_text: str, style: str):
     summary_bits = [to_ascii(s) for s in summary_bits if s]
     summary = "; ".join(summary_bits).rstrip(";") + "."
 
-    def filter_join(items: list[str], cap: int = 8) -> str:
-        keep = []
-        for it in items:
-            if any(it.lower() in rk.lower() for rk in ranked):
-                keep.append(it)
-        if not keep: keep = items[:cap]
-        return ", ".join(dedupe_list(keep))[:400]
-
-    domains = filter_join(profile.get("domains", []), 6)
-    methods = filter_join(profile.get("methods", []), 10)
-    platforms = filter_join(profile.get("platforms", []), 8)
-    extra_kw = g.get("extra_keywords", [])
-    security = ", ".join(dedupe_list([*profile.get("security_terms", []), *extra_kw]))[:500]
+    in_ranked = _skills_in_ranked(profile, ranked)
+    domains = _filter_join(profile.domains, in_ranked, 6)
+    methods = _filter_join(profile.methods, in_ranked, 10)
+    platforms = _filter_join(profile.platforms, in_ranked, 8)
+    security = ", ".join(dedupe_list([*profile.security_terms, *g.extra_keywords]))[:500]
     collab = "Marketing, Presales, Leadership; Partner co-selling; Playbook mentoring"
 
-    exp_md = md_experience(profile["experience"], answers)
-    education = "\n".join(f"- {to_ascii(e)}" for e in profile.get("education", [])) or "-"
-    awards = "\n".join(f"- {to_ascii(a)}" for a in profile.get("awards", [])) or "-"
-
-    tpl_map = {"executive":"executive.md","balanced":"balanced.md","ats":"ats_strict.md","human":"human.md","cv":"cv.md"}
-    tpl = (BASE / "templates" / tpl_map.get(style, "balanced.md")).read_text(encoding="utf-8")
+    exp_md = md_experience(profile.experience, answers, select_bullets(profile, answers, ranked))
+    education = "\n".join(f"- {to_ascii(e)}" for e in profile.education) or "-"
+    awards = "\n".join(f"- {to_ascii(a)}" for a in profile.awards) or "-"
 
-    md = fill_template(tpl, {
-        "NAME": profile["name"],
-        "LOCATION": profile["location"],
-        "LINKEDIN": profile["linkedin"],
-        "EMAIL": profile["email"],
-        "PHONE": profile["phone"],
+    return {
+        "NAME": profile.name,
+        "LOCATION": profile.location,
+        "LINKEDIN": profile.linkedin,
+        "EMAIL": profile.email,
+        "PHONE": profile.phone,
         "SUMMARY": summary,
         "DOMAINS": domains,
         "METHODS": methods,
@@ -114,61 +153,309 @@ def _compose_markdown(profile: dict, answers: dict, jd_text: str, style: str):
         "EXPERIENCE": exp_md,
         "EDUCATION": education,
         "AWARDS": awards
-    })
-    return md, ranked
-
-def _write_all(md: str, ranked: list[str], profile: dict, out_root: Path, style_label: str):
-    out_root.mkdir(parents=True, exist_ok=True)
-    out_docx = out_root / f"Resume - {profile['name']} - {style_label} ({out_root.name}).docx"
-    out_report = out_root / f"match_report_{style_label.lower()} ({out_root.name}).json"
-    out_lint = out_root / f"ats_lint ({out_root.name}).txt"
-
-    _write_markdown_as_docx(md, profile, out_docx)
-
-    resume_text = "\n".join(p.text for p in Document(out_docx).paragraphs).lower()
-    present = sorted([k for k in ranked if k.lower() in resume_text])
-    missing = sorted([k for k in ranked if k.lower() not in resume_text])
-    report = {
-        "jd_tokens": ranked,
-        "present": present,
-        "missing": missing,
-        "coverage_percent": round(100 * len(present) / max(1, len(ranked)), 1),
     }
-    out_report.write_text(json.dumps(report, indent=2), encoding="utf-8")
 
-    issues = _lint_docx(out_docx)
-    out_lint.write_text("\n".join(issues) if issues else "No ATS lint issues detected.", encoding="utf-8")
+_COMPILED: dict[tuple[str, str], CompiledTemplate] = {}
+
+def _template(style: str, templates: TemplateRegistry | dict[str, str] | None = None) -> CompiledTemplate:
+    # Raw template text (a dict of style -> text) is compiled once per distinct text.
+    if templates is None: templates = get_registry()
+    if isinstance(templates, TemplateRegistry): return templates.get(style)
+    text = templates.get(style, templates["balanced"])
+    tpl = _COMPILED.get((style, text))
+    if tpl is None: tpl = _COMPILED[(style, text)] = CompiledTemplate(style, text)
+    return tpl
+
+def _render_markdown(ctx: dict, style: str, templates: TemplateRegistry | dict[str, str] | None = None,
+                     timer: StageTimer | None = None) -> str:
+    with stage(timer, "render_markdown", style=style):
+        if templates is None: templates = get_registry()
+        if isinstance(templates, TemplateRegistry): return templates.render(style, ctx["fields"])
+        return _template(style, templates).render(ctx["fields"])
+
+def _compose_markdown(profile: ProfileSchema, answers: AnswersSchema, jd_text: str, style: str, templates: TemplateRegistry | dict[str, str] | None = None,
+                      use_cache: bool = True, timer: StageTimer | None = None):
+    ctx = _tailoring_context(profile, answers, jd_text, use_cache=use_cache, timer=timer)
+    return _render_markdown(ctx, style, templates, timer=timer), ctx["ranked"]
+
+def _style_label(style: str) -> str:
+    return "CV" if style == "cv" else style.capitalize()
+
+def _artifact_paths(out_root: Path, profile: ProfileSchema, style_label: str, formats=("docx",)) -> dict[str, Path]:
+    stem = f"Resume - {profile.name} - {style_label} ({out_root.name})"
+    return {
+        "docx": out_root / f"{stem}.docx",
+        "report": out_root / f"match_report_{style_label.lower()} ({out_root.name}).json",
+        "lint": out_root / f"ats_lint_{style_label.lower()} ({out_root.name}).txt",
+        **{f: out_root / f"{stem}{RENDERERS[f][1]}" for f in formats if f != "docx"},
+    }
+
+def _write_all(md: str, ranked: list[str], profile: ProfileSchema, out_root: Path, style_label: str,
+               matcher: KeywordMatcher | None = None, write: bool = True, stages=ARTIFACT_STAGES,
+               timer: StageTimer | None = None, formats=("docx",)):
+    # Parse the markdown once; the .docx, every other format in `formats`, the coverage report and lint all
+    # come from the same blocks, and the .docx is serialized a single time at the end (to disk, or kept as
+    # bytes when write=False). With write=True only the artifacts named in `stages` are (re)written.
+    from scripts.docx_factory import docx_bytes
+    paths = _artifact_paths(out_root, profile, style_label, formats)
+    out_docx, out_report, out_lint = paths["docx"], paths["report"], paths["lint"]
+    style = style_label.lower()
+    extra = [f for f in formats if f != "docx" and (not write or f in stages)]
+
+    with stage(timer, "docx_render", style=style):
+        blocks = _document(md, profile)
+        doc = render_docx(blocks)
+
+    with stage(timer, "coverage_report", style=style):
+        resume_text = "\n".join(text_lines(blocks))  # == the rendered paragraphs' text
+        present, missing = (matcher or KeywordMatcher(ranked)).present_missing(resume_text)
+        present, missing = sorted(present), sorted(missing)
+        report = {
+            "jd_tokens": ranked,
+            "present": present,
+            "missing": missing,
+            "coverage_percent": round(100 * len(present) / max(1, len(ranked)), 1),
+        }
+
+    issues = _lint_docx(doc, timer, profile, style=style)
+    lint_text = "\n".join(issues) if issues else "No ATS lint issues detected."
+
+    rendered = {}
+    for fmt in extra:
+        with stage(timer, f"{fmt}_render", style=style) as rec:
+            rendered[fmt] = render(blocks, fmt)
+            rec["bytes"] = len(rendered[fmt])
+
+    if not write:
+        with stage(timer, "docx_save", style=style) as rec:
+            data = docx_bytes(doc)
+            rec["bytes"] = len(data)
+        return {"name": out_docx.name, "docx_bytes": data, "report_data": report, "lint_text": lint_text,
+                **{k: v for f in extra for k, v in ((f"{f}_name", paths[f].name), (f"{f}_bytes", rendered[f]))}}
 
-    return {"docx": str(out_docx), "report": str(out_report), "lint": str(out_lint)}
+    # Artifacts go through the content-addressed store: identical files across slugs share one blob,
+    # and each file appears atomically (concurrent builds never see or leave a half-written one).
+    store = get_store()
+    if "docx" in stages:
+        with stage(timer, "docx_save", style=style) as rec:
+            data = docx_bytes(doc)
+            store.place(out_docx, data)
+            rec["bytes"] = len(data)
+    if "report" in stages:
+        with stage(timer, "write_report", style=style) as rec:
+            data = json.dumps(report, indent=2).encode("utf-8")
+            store.place(out_report, data)
+            rec["bytes"] = len(data)
+    if "lint" in stages:
+        with stage(timer, "write_lint", style=style) as rec:
+            data = lint_text.encode("utf-8")
+            store.place(out_lint, data)
+            rec["bytes"] = len(data)
+    for fmt in extra:
+        with stage(timer, f"write_{fmt}", style=style) as rec:
+            store.place(paths[fmt], rendered[fmt])
+            rec["bytes"] = len(rendered[fmt])
+    return {s: str(p) for s, p in paths.items()}
 
-def build_pair(primary_style: str = "balanced", company_slug: str = "generic", jd_text: str | None = None):
-    profile = _load_profile()
-    answers = _load_answers()
+def _own_or_reusable(jd_text: str, slug: str, threshold: float | None,
+                     timer: StageTimer | None = None) -> tuple[list[str], list[str] | None, dict | None]:
+    # (the JD's keywords, its own cached ranking, else the most similar earlier build of another slug). The
+    # exact-JD cache wins: a near-duplicate's ranking is only borrowed for a JD that was never ranked itself.
+    with stage(timer, "extract_keywords"):
+        keywords = jd_keywords(jd_text)
+    with stage(timer, "rank_cache") as rec:
+        own = cached_ranking(jd_text, keywords)
+        rec["hit"] = own is not None
+    if own is not None or threshold is None: return keywords, own, None
+    with stage(timer, "jd_lookup"):
+        return keywords, None, get_jd_index().find(keywords, threshold, exclude=slug, ranker=RANKER)
+
+def _copy_reused(donor: BuildManifest, style: str, key: str, paths: dict[str, Path], stages: list[str],
+                 timer: StageTimer | None = None) -> list[str]:
+    # Stages whose artifact the donor build made from identical inputs (same stage key): placed from its file
+    # instead of being rendered again. Returns the stages copied.
+    store, copied = get_store(), []
+    for s in stages:
+        entry = donor.stages.get(f"{s}:{style}")
+        src = Path(entry["outputs"][0]) if entry and entry.get("key") == key and entry.get("outputs") else None
+        if src is None or not src.exists(): continue
+        with stage(timer, f"reuse_{s}", style=style) as rec:
+            data = src.read_bytes()
+            store.place(paths[s], data)
+            rec["bytes"] = len(data)
+        copied.append(s)
+    return copied
+
+def _build_incremental(styles: list[str], out_root: Path, jd_text: str, profile: ProfileSchema, answers: AnswersSchema,
+                       templates: TemplateRegistry | dict[str, str] | None, use_cache: bool, force: bool,
+                       timer: StageTimer | None = None, ranked: list[str] | None = None,
+                       formats=("docx",), reuse: float | None = DEFAULT_THRESHOLD, rank_source: str = "caller") -> dict[str, dict]:
+    # Stages: "rank" (JD -> ranked keywords) and docx/report/lint (+ one per extra format) per style. Each
+    # stage is keyed by a hash of its inputs plus the tool version (see build_manifest); fresh stages are skipped.
+    # A new JD within `reuse` (Jaccard) of another slug's build takes that build's ranking, and any of its
+    # artifacts whose stage key still matches are copied rather than rendered. A fallback ranking (no model
+    # answer) is used for this build but neither recorded nor indexed, so the next build ranks the JD again and
+    # no other JD reuses it. A borrowed ranking records the donor's JD hash (reused_jd): it stands only until
+    # this JD has a cached ranking of its own, or reuse is turned off.
+    manifest = BuildManifest(out_root)
+    jd_sha = digest(jd_text)
+    rank_key = stage_key(jd=jd_sha, model=MODEL, prompt=PROMPT_VERSION)
+    supplied = ranked is not None
+    rank_fresh = supplied or (not force and use_cache and manifest.fresh("rank", rank_key))
+    keywords = own = reused = None
+    source = rank_source if supplied else "manifest"
+    if rank_fresh and not supplied and manifest.stages["rank"].get("reused_jd", jd_sha) != jd_sha:
+        keywords, own, _ = _own_or_reusable(jd_text, out_root.name, None, timer)
+        rank_fresh = own is None and reuse is not None
+    if not supplied:
+        if rank_fresh: ranked = manifest.stages["rank"]["ranked"]
+        else:
+            if use_cache and not force and keywords is None:
+                keywords, own, reused = _own_or_reusable(jd_text, out_root.name, reuse, timer)
+            if own is not None: ranked, source = own, "cache"
+            elif reused: ranked, source = reused["ranked"], "reused"
+            else:
+                # keywords set: the exact-JD cache was already checked (and missed) above.
+                ranked, source = _rank_with_source(jd_text, use_cache=use_cache, timer=timer, candidates=keywords,
+                                                   lookup=keywords is None)
+    if source != "fallback" and (supplied or not rank_fresh):
+        manifest.record("rank", rank_key, ranked=ranked,
+                        **({"reused_from": reused["slug"], "reused_jd": reused["jd_sha"]} if reused else {}))
+        with stage(timer, "jd_index"):
+            get_jd_index().add(out_root.name, keywords if keywords is not None else jd_keywords(jd_text), ranked,
+                               jd_sha, RANKER)
+    manifest.mark("rank", rank_fresh or reused is not None)
+    donor = BuildManifest(out_root.parent / reused["slug"]) if reused else None
+
+    answers_data = answers.model_dump(by_alias=True)
+    doc_inputs = {"profile": digest(profile.model_dump_json().encode("utf-8")), "ranked": digest(ranked),
+                  "answers": {f: digest(field(answers_data, f)) for f in DOCX_ANSWER_FIELDS}}
+    all_stages = _artifact_stages(formats)
+    ctx = None
+    results = {}
+    for style in styles:
+        label = _style_label(style)
+        paths = _artifact_paths(out_root, profile, label, formats)
+        # Every format, the report and lint are rendered from the same parsed document, so they share its key.
+        key = stage_key(**doc_inputs, template=_template(style, templates).sha256)
+        stale = [s for s in all_stages if force or not manifest.fresh(f"{s}:{style}", key, [paths[s]])]
+        copied = _copy_reused(donor, style, key, paths, stale, timer) if donor and stale else []
+        todo = [s for s in stale if s not in copied]
+        if todo:
+            if ctx is None: ctx = _tailoring_context(profile, answers, jd_text, use_cache=use_cache, ranked=ranked, timer=timer)
+            _write_all(_render_markdown(ctx, style, templates, timer=timer), ranked, profile, out_root, style_label=label,
+                       matcher=ctx["matcher"], stages=todo, timer=timer, formats=formats)
+        for s in all_stages:
+            if s in stale: manifest.record(f"{s}:{style}", key, [paths[s]], **({"reused_from": reused["slug"]} if s in copied else {}))
+            manifest.mark(f"{s}:{style}", s not in todo)
+        results[style] = {**{s: str(p) for s, p in paths.items()},
+                          "skipped": (["rank"] if rank_fresh else []) + [s for s in all_stages if s not in stale]}
+        if reused:
+            results[style]["reused"] = {"from": reused["slug"], "similarity": reused["similarity"], "stages": ["rank", *copied]}
+    manifest.save()
+    return results
+
+def build_all_styles(styles: list[str] | tuple[str, ...] = STYLES, company_slug: str = "generic", jd_text: str | None = None,
+                     profile: ProfileSchema | dict | None = None, answers: AnswersSchema | dict | None = None,
+                     templates: TemplateRegistry | dict[str, str] | None = None, use_cache: bool = True, write: bool = True,
+                     force: bool = False, timer: StageTimer | None = None,
+                     ranked: list[str] | None = None, formats=("docx",),
+                     reuse: float | None = DEFAULT_THRESHOLD, rank_source: str = "caller") -> dict[str, dict]:
+    # ranked: keywords already ranked by the caller for this JD (skips the rank stage); rank_source says where
+    # they came from ("fallback" ones are not recorded, see _build_incremental).
+    # formats: output formats besides the .docx, e.g. ("pdf", "txt") (see parse_formats).
+    # reuse: Jaccard threshold for reusing a near-duplicate earlier build (blocks then carry "reused"); None disables.
+    # Every block carries the build's per-stage "timings" (also written to outputs/<slug>/timings.json).
+    timer = timer or StageTimer()
+    profile = _load_profile() if profile is None else as_profile(profile)
+    answers = _load_answers() if answers is None else as_answers(answers)
     if jd_text is None:
         jd_file = BASE / "data" / "job_posting.txt"
         jd_text = jd_file.read_text(encoding="utf-8") if jd_file.exists() else ""
     company_slug = slugify(company_slug)
     out_root = BASE / "outputs" / company_slug
+    styles = list(dict.fromkeys(s.lower() for s in styles))
+    formats = parse_formats(formats)
+    if write:
+        results = _build_incremental(styles, out_root, jd_text, profile, answers, templates, use_cache, force, timer, ranked,
+                                     formats, reuse, rank_source)
+    else:
+        reused = None
+        if ranked is None and use_cache and not force:
+            _, ranked, reused = _own_or_reusable(jd_text, company_slug, reuse, timer)
+            if reused: ranked = reused["ranked"]
+        ctx = _tailoring_context(profile, answers, jd_text, use_cache=use_cache, ranked=ranked, timer=timer)
+        results = {}
+        for style in styles:
+            md = _render_markdown(ctx, style, templates, timer=timer)
+            results[style] = _write_all(md, ctx["ranked"], profile, out_root, style_label=_style_label(style),
+                                        matcher=ctx["matcher"], write=write, timer=timer, formats=formats)
+            if reused: results[style]["reused"] = {"from": reused["slug"], "similarity": reused["similarity"], "stages": ["rank"]}
+    timer.close()
+    timings = timer.to_dict()
+    if write: atomic_write(out_root / "timings.json", json.dumps(timings, indent=2))
+    export(timings, out_root if write else None)
+    for block in results.values(): block["timings"] = timings
+    return results
 
-    md_primary, ranked_primary = _compose_markdown(profile, answers, jd_text, style=primary_style)
-    primary = _write_all(md_primary, ranked_primary, profile, out_root, style_label=primary_style.capitalize())
-
-    md_cv, ranked_cv = _compose_markdown(profile, answers, jd_text, style="cv")
-    cv = _write_all(md_cv, ranked_cv, profile, out_root, style_label="CV")
-
-    return {"primary": primary, "cv": cv}
+def build_pair(primary_style: str = "balanced", company_slug: str = "generic", jd_text: str | None = None,
+               profile: ProfileSchema | dict | None = None, answers: AnswersSchema | dict | None = None, templates: TemplateRegistry | dict[str, str] | None = None,
+               use_cache: bool = True, write: bool = True, force: bool = False, timer: StageTimer | None = None,
+               ranked: list[str] | None = None, formats=("docx",), reuse: float | None = DEFAULT_THRESHOLD,
+               rank_source: str = "caller"):
+    primary_style = primary_style.lower()
+    results = build_all_styles([primary_style, "cv"], company_slug, jd_text, profile=profile, answers=answers,
+                               templates=templates, use_cache=use_cache, write=write, force=force, timer=timer,
+                               ranked=ranked, formats=formats, reuse=reuse, rank_source=rank_source)
+    return {"primary": results[primary_style], "cv": results["cv"]}
 
 def main():
-    primary_style = (sys.argv[1] if len(sys.argv)>1 else "balanced").lower()
-    company_slug = sys.argv[2] if len(sys.argv)>2 else "generic"
+    ap = argparse.ArgumentParser(description="Build a tailored resume + CV for one job posting.")
+    ap.add_argument("style", nargs="?", default="balanced", help="Primary style, or 'all' for every template")
+    ap.add_argument("company", nargs="?", default="generic")
+    ap.add_argument("jd_file", nargs="?", default=None)
+    ap.add_argument("--no-cache", action="store_true", help="Bypass the on-disk LLM ranking cache")
+    ap.add_argument("--force", action="store_true", help="Rebuild every stage even if its inputs are unchanged")
+    ap.add_argument("--formats", default="docx", metavar="LIST",
+                    help=f"Comma-separated output formats ({', '.join(FORMATS)}); the .docx is always written")
+    ap.add_argument("--reuse-threshold", type=float, default=DEFAULT_THRESHOLD,
+                    help="Reuse the ranking/artifacts of an earlier build whose JD keywords are this similar (Jaccard)")
+    ap.add_argument("--no-reuse", action="store_true", help="Never reuse a near-duplicate earlier build")
+    ap.add_argument("--timings", action="store_true", help="Print the per-stage timing breakdown")
+    ap.add_argument("--trace-memory", action="store_true", help="Record per-stage peak memory (tracemalloc; slower)")
+    ap.add_argument("--export-timings", action="append", default=[], choices=EXPORT_KINDS,
+                    help="Also export timings: otel (timings.otel.json), prom (timings.prom), opentelemetry (installed SDK)")
+    args = ap.parse_args()
+    try:
+        formats = parse_formats(args.formats)
+    except ValueError as e:
+        ap.error(str(e))
+    for kind in args.export_timings: register_exporter(make_exporter(kind))
+    timer = StageTimer(memory=True) if args.trace_memory else None
+    reuse = None if args.no_reuse else args.reuse_threshold
     jd = None
-    if len(sys.argv)>3:
-        p = Path(sys.argv[3])
+    if args.jd_file:
+        p = Path(args.jd_file)
         if p.exists(): jd = p.read_text(encoding="utf-8")
-    result = build_pair(primary_style, company_slug, jd)
-    for label in ("primary","cv"):
-        block = result[label]
-        print(block["docx"]); print(block["report"]); print(block["lint"])
+    if args.style.lower() == "all":
+        result = build_all_styles(STYLES, args.company, jd, use_cache=not args.no_cache, force=args.force, timer=timer,
+                                  formats=formats, reuse=reuse)
+    else:
+        result = build_pair(args.style.lower(), args.company, jd, use_cache=not args.no_cache, force=args.force, timer=timer,
+                            formats=formats, reuse=reuse)
+    for block in result.values():
+        for s in _artifact_stages(formats): print(block[s])
+        if block.get("reused"):
+            r = block["reused"]
+            print(f"  reused from {r['from']} (similarity {r['similarity']:.2f}): {', '.join(r['stages'])}")
+        if block["skipped"]: print(f"  skipped (inputs unchanged): {', '.join(block['skipped'])}")
+    if args.timings:
+        timings = next(iter(result.values()))["timings"]
+        for s in timings["stages"]:
+            label = f"{s['stage']}:{s['style']}" if "style" in s else s["stage"]
+            mem = f"  peak {s['peak_kb']:.0f} KB" if s["peak_kb"] is not None else ""
+            print(f"  {label:<28} {s['wall_ms']:>9.2f} ms wall {s['cpu_ms']:>9.2f} ms cpu {s['bytes']:>8} B{mem}")
+        print(f"  {'total':<28} {timings['total_wall_ms']:>9.2f} ms wall {timings['total_cpu_ms']:>9.2f} ms cpu {timings['bytes_written']:>8} B")
 
 if __name__ == "__main__":
     main()
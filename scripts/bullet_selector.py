@@ -0,0 +1,139 @@
+# scripts/bullet_selector.py
+# BM25 scoring of experience bullets (profile + answers extra_bullets) against the ranked JD keywords,
+# and per-role selection of the best bullets within a character budget.
+from __future__ import annotations
+import argparse, math, re, sys, threading, time
+from pathlib import Path
+from utils import ExperienceItem, ProfileSchema, AnswersSchema, extract_keywords, role_bullets, to_ascii, STOPWORDS
+
+BULLETS_PER_ROLE = 5
+EXPERIENCE_CHARS = 4500  # bullet text across all roles; roughly 1.5 pages of experience
+K1, B = 1.2, 0.75
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+def terms(text: str) -> list[str]:
+    # Unigrams plus adjacent bigrams, so "zero trust" in a keyword and a bullet scores above the two words apart.
+    words = [w for w in _TOKEN.findall(to_ascii(text).lower()) if len(w) > 1 and w not in STOPWORDS]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+class BulletIndex:
+    # Built once per (profile, answers): term -> postings of (bullet id, BM25 term-frequency part) and IDF.
+    # The tf part only depends on the bullet, so scoring a posting is one multiply-add per posting entry
+    # of its query terms.
+    def __init__(self, experience: list[ExperienceItem], answers: AnswersSchema):
+        self.roles: list[list[int]] = []
+        self.texts: list[str] = []
+        postings: dict[str, list[tuple[int, int]]] = {}
+        lengths: list[int] = []
+        for role in experience:
+            ids = []
+            for text in role_bullets(role, answers):
+                doc = len(self.texts)
+                self.texts.append(text); ids.append(doc)
+                toks = terms(text)
+                lengths.append(len(toks))
+                tf: dict[str, int] = {}
+                for t in toks: tf[t] = tf.get(t, 0) + 1
+                for t, n in tf.items(): postings.setdefault(t, []).append((doc, n))
+            self.roles.append(ids)
+        n_docs = len(self.texts)
+        avgdl = (sum(lengths) / n_docs if n_docs else 0) or 1.0
+        norm = [K1 * (1 - B + B * dl / avgdl) for dl in lengths]
+        self._postings = {t: [(doc, tf * (K1 + 1) / (tf + norm[doc])) for doc, tf in p] for t, p in postings.items()}
+        self._idf = {t: math.log(1 + (n_docs - len(p) + 0.5) / (len(p) + 0.5)) for t, p in postings.items()}
+
+    def query_weights(self, ranked: list[str]) -> dict[str, float]:
+        # Earlier (more important) keywords weigh up to 2x the last one; a term keeps its best weight.
+        weights: dict[str, float] = {}
+        n = len(ranked)
+        for i, kw in enumerate(ranked):
+            w = 1 + (n - i) / n
+            for t in terms(kw):
+                if t in self._idf and w > weights.get(t, 0): weights[t] = w
+        return weights
+
+    def score(self, ranked: list[str]) -> list[float]:
+        scores = [0.0] * len(self.texts)
+        for t, w in self.query_weights(ranked).items():
+            wi = w * self._idf[t]
+            for doc, part in self._postings[t]:
+                scores[doc] += wi * part
+        return scores
+
+    def select(self, ranked: list[str], per_role: int = BULLETS_PER_ROLE,
+               budget: int | None = EXPERIENCE_CHARS) -> list[list[str]]:
+        # Best `per_role` bullets of each role, most relevant first (profile order on ties / no keywords).
+        # Every role keeps its top bullet; the rest are added by score while the text fits the budget.
+        scores = self.score(ranked) if ranked else [0.0] * len(self.texts)
+        cands = [sorted(ids, key=lambda d: -scores[d])[:per_role] for ids in self.roles]
+        cost = lambda d: len(self.texts[d]) + 3  # "- " + newline
+        keep = {ids[0] for ids in cands if ids}
+        if budget is None:
+            keep.update(d for ids in cands for d in ids)
+        else:
+            used = sum(cost(d) for d in keep)
+            for d in sorted((d for ids in cands for d in ids[1:]), key=lambda d: (-scores[d], d)):
+                if used + cost(d) <= budget: keep.add(d); used += cost(d)
+        return [[self.texts[d] for d in ids if d in keep] for ids in cands]
+
+_INDEXES: dict[tuple[int, int], tuple[ProfileSchema, AnswersSchema, BulletIndex]] = {}
+_LOCK = threading.Lock()
+
+def get_index(profile: ProfileSchema, answers: AnswersSchema) -> BulletIndex:
+    # The stores hand out the same model objects until a file changes, so identity is the cache key;
+    # the entry holds both models, which keeps their ids from being reused while cached.
+    key = (id(profile), id(answers))
+    hit = _INDEXES.get(key)
+    if hit and hit[0] is profile and hit[1] is answers: return hit[2]
+    index = BulletIndex(profile.experience, answers)
+    with _LOCK:
+        if len(_INDEXES) >= 8: _INDEXES.pop(next(iter(_INDEXES)))
+        _INDEXES[key] = (profile, answers, index)
+    return index
+
+def select_bullets(profile: ProfileSchema, answers: AnswersSchema, ranked: list[str],
+                   per_role: int = BULLETS_PER_ROLE, budget: int | None = EXPERIENCE_CHARS) -> list[list[str]]:
+    return get_index(profile, answers).select(ranked, per_role, budget)
+
+def main():
+    from scripts.bench_pipeline import synthetic_profile
+    from scripts.bench_keywords import synthetic_jd
+    from scripts.profile_store import PROFILE_STORE, ANSWERS_STORE
+    from scripts.build_resume import _rank
+
+    ap = argparse.ArgumentParser(description="Show the bullets chosen for a JD, or time index build + selection on synthetic profiles.")
+    ap.add_argument("jd_file", nargs="?", help="Job description to select bullets for (uses the real profile/answers)")
+    ap.add_argument("--per-role", type=int, default=BULLETS_PER_ROLE)
+    ap.add_argument("--budget", type=int, default=EXPERIENCE_CHARS, help="Bullet characters across all roles (0 = no limit)")
+    ap.add_argument("--bench", action="store_true", help="Time index build and per-posting selection for 5/50/200 roles")
+    args = ap.parse_args()
+    budget = args.budget or None
+
+    if args.bench:
+        jd = synthetic_jd(10_000, seed=1)
+        ranked = extract_keywords(jd)
+        answers = AnswersSchema.model_validate({"global": {}})
+        print(f"{'roles':>5} {'bullets':>7}  {'index build':>11}  {'select/posting':>14}")
+        for roles in (5, 50, 200):
+            profile = synthetic_profile(roles, seed=roles)
+            t0 = time.perf_counter(); index = BulletIndex(profile.experience, answers); build = time.perf_counter() - t0
+            n = 200
+            t0 = time.perf_counter()
+            for _ in range(n): index.select(ranked, args.per_role, budget)
+            sel = (time.perf_counter() - t0) / n
+            print(f"{roles:>5} {len(index.texts):>7}  {build * 1000:>9.2f}ms  {sel * 1000:>12.3f}ms")
+        return
+
+    if not args.jd_file: ap.error("jd_file is required unless --bench is given")
+    path = Path(args.jd_file)
+    if not path.exists(): print(f"JD file not found: {path}"); sys.exit(1)
+    profile, answers = PROFILE_STORE.get(), ANSWERS_STORE.get()
+    ranked = _rank(path.read_text(encoding="utf-8"))
+    index = get_index(profile, answers)
+    scores = dict(zip(index.texts, index.score(ranked)))
+    for role, chosen in zip(profile.experience, index.select(ranked, args.per_role, budget)):
+        print(f"{role.company} - {role.title}")
+        for text in chosen: print(f"  {scores[text]:6.2f}  {text}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# scripts/check_startup.py
+# Start-up regression check for the CLI: runs each fast subcommand under `python -X importtime`, fails if it
+# imports a heavy dependency or its wall time exceeds the budget, and lists the slowest imports.
+#   python -m scripts startup-check [--budget-ms 100] [--runs 5]
+from __future__ import annotations
+import argparse, os, subprocess, sys, time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parents[1]
+HEAVY = ("docx", "lxml", "pydantic", "pydantic_core", "openai", "numpy", "scipy")
+BUDGET_MS = 100.0
+# (subcommand args, modules it must not import, held to the time budget). Commands that must write or
+# run for a while are checked through --help, which still imports the module.
+CHECKS = [
+    ((), HEAVY, True),
+    (("lint-profile",), HEAVY, True),
+    (("preview",), HEAVY, True),
+    (("store", "stats"), HEAVY, True),
+    (("templates", "--help"), HEAVY, True),
+    (("curate", "--help"), HEAVY, True),
+    (("rank-cache",), HEAVY, True),
+    (("answers", "stats"), HEAVY, True),
+    # The builder needs pydantic, but python-docx/openai/numpy load only when it renders or calls the API.
+    (("build", "--help"), ("docx", "lxml", "openai", "numpy", "scipy"), False),
+    (("serve", "--help"), ("docx", "lxml", "openai", "numpy", "scipy"), False),
+]
+
+def _run(args: tuple[str, ...], importtime: bool = False) -> tuple[float, str]:
+    cmd = [sys.executable, *(["-X", "importtime"] if importtime else []), "-m", "scripts", *args]
+    t0 = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=BASE, capture_output=True, text=True, env={**os.environ, "PYTHONIOENCODING": "utf-8"})
+    elapsed = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0:
+        raise SystemExit(f"`python -m scripts {' '.join(args)}` exited {proc.returncode}:\n{proc.stderr[-2000:]}")
+    return elapsed, proc.stderr
+
+def parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    # "import time: self [us] | cumulative | imported package" lines -> (module, self_us, cumulative_us)
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line: continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cum_us)))
+    return rows
+
+def check(args: tuple[str, ...], forbidden: tuple[str, ...], timed: bool, runs: int, budget_ms: float,
+          top: int) -> list[str]:
+    label = " ".join(args) or "(list)"
+    rows = parse_importtime(_run(args, importtime=True)[1])
+    loaded = {name.split(".")[0] for name, _, _ in rows}
+    problems = [f"{label}: imports {mod}" for mod in forbidden if mod in loaded]
+    best = min(_run(args)[0] for _ in range(runs))
+    if timed and best > budget_ms: problems.append(f"{label}: {best:.0f} ms > {budget_ms:.0f} ms budget")
+    slow = sorted((r for r in rows if r[0].split(".")[0] not in sys.stdlib_module_names), key=lambda r: -r[2])[:top]
+    print(f"{label:<18} {best:>6.1f} ms {'' if timed else '(untimed)':<9} {len(rows):>4} modules  "
+          + ", ".join(f"{name} {cum / 1000:.1f}" for name, _, cum in slow))
+    return problems
+
+def main():
+    ap = argparse.ArgumentParser(description="Fail if fast CLI subcommands import heavy modules or start too slowly.")
+    ap.add_argument("--budget-ms", type=float, default=BUDGET_MS, help="Best-of-runs wall time per fast command")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=3, help="Slowest non-stdlib imports (cumulative ms) to list per command")
+    args = ap.parse_args()
+
+    _run(())  # warm the bytecode cache so the first timing isn't a compile
+    problems = []
+    for cmd, forbidden, timed in CHECKS:
+        problems += check(cmd, forbidden, timed, args.runs, args.budget_ms, args.top)
+    if problems:
+        print("\n".join(["", "start-up check failed:", *problems])); raise SystemExit(1)
+    print("start-up check passed")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-@"
+# scripts/ci_smoke.py
 from pathlib import Path
 import json, subprocess, sys
 
@@ -48,8 +48,8 @@ Requirements: prospecting, discovery, closing, CRM hygiene, endpoint, identity-f
 
 def run_build():
     print("Running smoke build…")
-    subprocess.run([sys.executable, str(BASE / "scripts" / "build_resume.py"), "balanced", "ci"], check=True)
-    subprocess.run([sys.executable, str(BASE / "scripts" / "build_resume.py"), "cv", "ci"], check=True)
+    subprocess.run([sys.executable, "-m", "scripts", "build", "balanced", "ci"], cwd=BASE, check=True)
+    subprocess.run([sys.executable, "-m", "scripts", "build", "cv", "ci"], cwd=BASE, check=True)
     out = BASE / "outputs" / "ci"
     print("Artifacts:", sorted(p.name for p in out.glob("*")))
 
@@ -58,4 +58,3 @@ if __name__ == "__main__":
     write_minimal_profile()
     write_minimal_jd()
     run_build()
-"@ | Out-File -Encoding utf8 "scripts\ci_smoke.py"
@@ -0,0 +1,228 @@
+# scripts/coverage_matrix.py
+# Keyword coverage of many resume variants against many postings at once: sparse JD x keyword and
+# variant x keyword matrices, multiplied in one step. Same coverage_percent as the per-build match
+# report. Needs numpy + scipy (pinned in requirements.txt); imported on first use only.
+from __future__ import annotations
+import argparse, json, random, sys, time
+from pathlib import Path
+from utils import md_experience, ProfileSchema, AnswersSchema
+from scripts.matcher import KeywordMatcher
+
+def _np():
+    try:
+        import numpy as np
+        from scipy import sparse
+    except ImportError as e:
+        raise ImportError("coverage_matrix needs numpy and scipy: pip install -r requirements.txt") from e
+    return np, sparse
+
+def rank_weight(i: int, n: int) -> float:
+    # Same weighting as bullet_selector: the first keyword counts 2x, the last about 1x.
+    return 1 + (n - i) / n
+
+class CoverageMatrix:
+    # coverage[j, v]: % of posting j's ranked keywords found in variant v (as in match_report coverage_percent).
+    # weighted[j, v]: the same with each keyword weighted by its rank.
+    def __init__(self, jds: list[str], variants: list[str], coverage, weighted, vocab_size: int):
+        self.jds = jds
+        self.variants = variants
+        self.coverage = coverage
+        self.weighted = weighted
+        self.vocab_size = vocab_size
+
+    def summary(self) -> list[dict]:
+        # Per variant: mean/min over postings, and for how many postings it is the best (weighted) variant.
+        np, _ = _np()
+        best = np.bincount(self.weighted.argmax(axis=1), minlength=len(self.variants))
+        mean_cov, mean_wtd, min_cov = self.coverage.mean(axis=0), self.weighted.mean(axis=0), self.coverage.min(axis=0)
+        rows = [{"variant": v, "mean_coverage": round(float(mean_cov[i]), 2), "mean_weighted": round(float(mean_wtd[i]), 2),
+                 "min_coverage": round(float(min_cov[i]), 2), "best_for": int(best[i])}
+                for i, v in enumerate(self.variants)]
+        return sorted(rows, key=lambda r: (-r["mean_weighted"], r["variant"]))
+
+    def best_variant(self) -> dict[str, str]:
+        return {jd: self.variants[int(i)] for jd, i in zip(self.jds, self.weighted.argmax(axis=1))}
+
+    def to_dict(self, matrices: bool = True) -> dict:
+        out = {"jds": self.jds, "variants": self.variants, "vocab_size": self.vocab_size, "summary": self.summary()}
+        if matrices:
+            out["coverage"] = self.coverage.round(2).tolist()
+            out["weighted"] = self.weighted.round(2).tolist()
+        return out
+
+def score(jd_keywords: list[list[str]], variant_texts: list[str]):
+    # -> (coverage, weighted) arrays of shape (len(jd_keywords), len(variant_texts)), in percent.
+    np, sparse = _np()
+    vocab: dict[str, int] = {}
+    rows, cols, weights = [], [], []
+    for j, kws in enumerate(jd_keywords):
+        n = len(kws)
+        for i, kw in enumerate(kws):
+            rows.append(j); cols.append(vocab.setdefault(kw.lower(), len(vocab))); weights.append(rank_weight(i, n))
+    n_jd, n_var, n_kw = len(jd_keywords), len(variant_texts), max(1, len(vocab))
+    # Repeated keywords in a ranked list sum, so they count as often as the match report counts them.
+    counts = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(n_jd, n_kw))
+    weighted = sparse.csr_matrix((np.asarray(weights), (rows, cols)), shape=(n_jd, n_kw))
+
+    # Which keywords each variant contains: one Aho-Corasick pass per variant over the whole vocabulary.
+    matcher = KeywordMatcher(list(vocab))
+    vrows, vcols = [], []
+    for v, text in enumerate(variant_texts):
+        found = matcher.search(text)
+        vrows.extend([v] * len(found)); vcols.extend(vocab[k] for k in found)
+    present = sparse.csr_matrix((np.ones(len(vrows)), (vrows, vcols)), shape=(n_var, n_kw))
+
+    hits = (sparse.vstack([counts, weighted]).tocsr() @ present.T).toarray()
+    totals = np.concatenate([np.asarray(counts.sum(axis=1)).ravel(), np.asarray(weighted.sum(axis=1)).ravel()])
+    pct = np.divide(100 * hits, totals[:, None], out=np.zeros_like(hits), where=totals[:, None] > 0)
+    return pct[:n_jd], pct[n_jd:]
+
+def coverage_matrix(postings: list[dict], variants: dict[str, str], rank: bool = False) -> CoverageMatrix:
+    # postings: [{"company", "jd_text"}] (see ingest.iter_postings); variants: name -> resume text.
+    if not postings or not variants: raise ValueError("coverage_matrix needs at least one posting and one variant")
+    keywords = jd_keywords(postings, rank)
+    cov, wtd = score(keywords, list(variants.values()))
+    return CoverageMatrix([p["company"] for p in postings], list(variants), cov, wtd,
+                          len({k.lower() for kws in keywords for k in kws}))
+
+def jd_keywords(postings: list[dict], rank: bool = False) -> list[list[str]]:
+    # rank=False: the offline ranking (top 40 extracted keywords), as a build without an API key uses;
+    # rank=True: the build's ranking (rank cache, then the LLM when configured).
+    if rank:
+        from scripts.build_resume import _rank
+        return [_rank(p["jd_text"]) for p in postings]
+    from scripts.ingest import jd_keywords
+    from scripts.prompt_engine import fallback_ranking
+    return [fallback_ranking(jd_keywords(p["jd_text"])) for p in postings]
+
+def set_keywords(keyword_lists: list[list[str]], top_k: int = 60) -> list[str]:
+    # One ranked list for a whole set of postings: keywords by summed rank weight across postings.
+    total: dict[str, float] = {}
+    first: dict[str, str] = {}
+    for kws in keyword_lists:
+        n = len(kws)
+        for i, kw in enumerate(kws):
+            k = kw.lower(); first.setdefault(k, kw)
+            total[k] = total.get(k, 0.0) + rank_weight(i, n)
+    return [first[k] for k, _ in sorted(total.items(), key=lambda x: (-x[1], x[0]))[:top_k]]
+
+# --- resume variants ---
+
+def _text(md: str, profile: ProfileSchema) -> str:
+    from scripts.build_resume import _docx_lines
+    return "\n".join(_docx_lines(md, profile))
+
+def style_variants(profile: ProfileSchema, answers: AnswersSchema, ranked: list[str], templates=None) -> dict[str, str]:
+    # Every style template, tailored to `ranked` (e.g. set_keywords of the target postings).
+    from scripts.build_resume import STYLES, _context_fields, _render_markdown
+    ctx = {"fields": _context_fields(profile, answers, ranked)}
+    return {style: _text(_render_markdown(ctx, style, templates), profile) for style in STYLES}
+
+def bullet_variants(profile: ProfileSchema, answers: AnswersSchema, ranked: list[str], style: str = "balanced",
+                    per_role=(1, 2, 3, 5), budgets=(1500, 3000, 4500, None), templates=None) -> dict[str, str]:
+    # One style with different bullet selections (bullets per role x experience character budget).
+    from scripts.build_resume import _context_fields, _render_markdown
+    from scripts.bullet_selector import get_index
+    fields = _context_fields(profile, answers, ranked)
+    index = get_index(profile, answers)
+    out = {}
+    for n in per_role:
+        for budget in budgets:
+            exp = md_experience(profile.experience, answers, index.select(ranked, n, budget))
+            md = _render_markdown({"fields": {**fields, "EXPERIENCE": exp}}, style, templates)
+            out[f"{style}/bullets={n},budget={budget or 'none'}"] = _text(md, profile)
+    return out
+
+def file_variant(path: Path) -> str:
+    if path.suffix.lower() == ".docx":
+        from docx import Document
+        return "\n".join(p.text for p in Document(str(path)).paragraphs)
+    return path.read_text(encoding="utf-8")
+
+# --- CLI ---
+
+def _print_summary(result: CoverageMatrix, top: int):
+    print(f"{'variant':<40} {'mean cov':>8} {'mean wtd':>8} {'min cov':>7} {'best for':>8}")
+    for r in result.summary()[:top]:
+        print(f"{r['variant']:<40} {r['mean_coverage']:>8.1f} {r['mean_weighted']:>8.1f} {r['min_coverage']:>7.1f} {r['best_for']:>8}")
+
+def _bench(n_jds: int, n_variants: int, check: int):
+    from scripts.bench_keywords import WORDS, synthetic_jd
+    rnd = random.Random(0)
+    t0 = time.perf_counter()
+    postings = [{"company": f"jd-{i}", "jd_text": synthetic_jd(rnd.choice((2_000, 5_000, 10_000)), seed=i)} for i in range(n_jds)]
+    variants = {f"v{i}": " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(300, 1500))) for i in range(n_variants)}
+    t1 = time.perf_counter()
+    keywords = jd_keywords(postings)
+    t2 = time.perf_counter()
+    cov, wtd = score(keywords, list(variants.values()))
+    t3 = time.perf_counter()
+    print(f"{n_jds} JDs x {n_variants} variants: keywords {t2 - t1:.2f}s, coverage matrix {t3 - t2:.3f}s "
+          f"(synthetic data {t1 - t0:.2f}s)")
+    # Pairwise reference: one KeywordMatcher per posting, as the per-build match report computes it.
+    names = list(variants)
+    t0 = time.perf_counter()
+    for j in range(min(check, n_jds)):
+        m = KeywordMatcher(keywords[j])
+        for v, name in enumerate(names):
+            present, _ = m.present_missing(variants[name])
+            ref = round(100 * len(present) / max(1, len(keywords[j])), 1)
+            if ref != round(float(cov[j, v]), 1): raise SystemExit(f"mismatch at jd {j}, {name}: {ref} vs {cov[j, v]:.1f}")
+    pair = (time.perf_counter() - t0) / max(1, min(check, n_jds) * n_variants)
+    print(f"pairwise reference: {pair * 1000:.3f} ms/pair -> {pair * n_jds * n_variants:.1f}s for the full grid "
+          f"(checked {min(check, n_jds)} JDs: identical)")
+
+def main():
+    ap = argparse.ArgumentParser(description="Keyword coverage of resume variants across a set of postings.")
+    ap.add_argument("postings", nargs="?", help="Postings: directory, JSONL or CSV (see scripts/ingest.py)")
+    ap.add_argument("--variants", default="styles,bullets", help="Built-in variant sets: styles, bullets (comma-separated, or 'none')")
+    ap.add_argument("--variant", action="append", default=[], help="Extra resume file to score (.docx/.md/.txt); repeatable")
+    ap.add_argument("--bullet-style", default="balanced", help="Template used for the bullet-subset variants")
+    ap.add_argument("--rank", action="store_true", help="Use the build ranking (rank cache/LLM) instead of the offline keyword ranking")
+    ap.add_argument("--top", type=int, default=25, help="Variants shown in the table")
+    ap.add_argument("--out", default=None, help="Write the full matrices + summary as JSON here")
+    ap.add_argument("--bench", action="store_true", help="Time a synthetic 1000 JD x 50 variant grid against pairwise matching")
+    ap.add_argument("--bench-jds", type=int, default=1000)
+    ap.add_argument("--bench-variants", type=int, default=50)
+    args = ap.parse_args()
+
+    if args.bench:
+        return _bench(args.bench_jds, args.bench_variants, check=20)
+    if not args.postings: ap.error("postings is required unless --bench is given")
+    src = Path(args.postings)
+    if not src.exists(): print(f"Postings not found: {src}"); sys.exit(1)
+
+    from scripts.ingest import iter_postings
+    from scripts.profile_store import PROFILE_STORE, ANSWERS_STORE
+    t0 = time.perf_counter()
+    postings = [p for p in iter_postings(src) if p["jd_text"].strip()]
+    if not postings: print("No postings with text found."); sys.exit(1)
+    keywords = jd_keywords(postings, args.rank)
+    t1 = time.perf_counter()
+
+    profile, answers = PROFILE_STORE.get(), ANSWERS_STORE.get()
+    ranked = set_keywords(keywords)
+    sets = {s.strip() for s in args.variants.split(",")} - {"none", ""}
+    variants: dict[str, str] = {}
+    if "styles" in sets: variants.update(style_variants(profile, answers, ranked))
+    if "bullets" in sets: variants.update(bullet_variants(profile, answers, ranked, style=args.bullet_style))
+    for f in args.variant:
+        path = Path(f)
+        if not path.exists(): print(f"Variant not found: {path}"); sys.exit(1)
+        variants[path.name] = file_variant(path)
+    if not variants: ap.error("no variants to score")
+    t2 = time.perf_counter()
+
+    cov, wtd = score(keywords, list(variants.values()))
+    result = CoverageMatrix([p["company"] for p in postings], list(variants), cov, wtd,
+                            len({k.lower() for kws in keywords for k in kws}))
+    t3 = time.perf_counter()
+    print(f"{len(postings)} postings x {len(variants)} variants, {result.vocab_size} distinct keywords "
+          f"(keywords {t1 - t0:.2f}s, variants {t2 - t1:.2f}s, matrix {t3 - t2:.3f}s)")
+    _print_summary(result, args.top)
+    if args.out:
+        Path(args.out).write_text(json.dumps(result.to_dict(), indent=2), encoding="utf-8")
+        print(f"Full matrices: {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,13 @@
 from __future__ import annotations
-from pathlib import Path
-import json
-BASE = Path(__file__).resolve().parents[1]
-ANSWERS = BASE / "profile" / "answers.json"
+import argparse
+from scripts.answers_db import get_answers_db
 def main():
-    data = json.loads(ANSWERS.read_text(encoding="utf-8"))
-    g = data.setdefault("global", {})
-    lst = g.setdefault("summary_additions", [])
+    ap = argparse.ArgumentParser(description="Trim and normalize global.summary_additions in the answers database.")
+    ap.add_argument("--export", action="store_true", help="Also rewrite profile/answers.json from the database")
+    args = ap.parse_args()
+    db = get_answers_db()
+    db.sync_json()
+    lst = db.global_items("summary_additions")
     print("=== Curate summary additions (interactive) ===")
     print("Rules: keep 6–24 words, single sentence, crisp & quantified where possible.\n")
     cleaned = []
@@ -14,8 +15,8 @@ def main():
         s = item.strip().rstrip(".")
         if len(s.split()) > 30: s = " ".join(s.split()[:24])
         cleaned.append(s.capitalize() + ".")
-    g["summary_additions"] = cleaned
-    ANSWERS.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    db.replace_global("summary_additions", cleaned)
+    if args.export: db.export()
     print(f"Saved. summary_additions = {len(cleaned)} item(s).")
 if __name__ == "__main__":
     main()
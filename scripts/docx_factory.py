@@ -0,0 +1,126 @@
+# scripts/docx_factory.py
+from __future__ import annotations
+import copy, threading
+from io import BytesIO
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+from xml.sax.saxutils import escape
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml.ns import nsdecls, qn
+from docx.oxml.parser import parse_xml
+from docx.opc.pkgwriter import PackageWriter
+from docx.package import Package
+from docx.parts.document import DocumentPart
+
+BASE = Path(__file__).resolve().parents[1]
+# Optional custom style/page-setup package; python-docx's default template is used when absent.
+STYLE_TEMPLATE = BASE / "templates" / "base.docx"
+
+class DocxFactory:
+    # Parses the base package once. Each new document gets a deep copy of the (emptied) main
+    # document part only; styles, numbering, settings, theme etc. are shared read-only parts.
+    def __init__(self, template: Path | None = None):
+        doc = Document(str(template)) if template else Document()
+        body = doc.element.body
+        for child in list(body):
+            if child.tag != qn("w:sectPr"): body.remove(child)
+        self.template = template
+        self._part = doc.part
+        self._pkg = doc.part.package
+
+    def new_document(self):
+        pkg = Package()
+        part = DocumentPart(self._part.partname, self._part.content_type, copy.deepcopy(self._part.element), pkg)
+        for rId, rel in self._part.rels.items():
+            part.rels.add_relationship(rel.reltype, rel.target_ref if rel.is_external else rel.target_part, rId, rel.is_external)
+        for rId, rel in self._pkg.rels.items():
+            target = part if rel.reltype == RT.OFFICE_DOCUMENT else (rel.target_ref if rel.is_external else rel.target_part)
+            pkg.rels.add_relationship(rel.reltype, target, rId, rel.is_external)
+        return part.document
+
+    def render(self, lines: list[str]):
+        doc = self.new_document()
+        append_paragraphs(doc, lines)
+        return doc
+
+    def render_styled(self, paragraphs: list[tuple]):
+        doc = self.new_document()
+        append_styled(doc, paragraphs)
+        return doc
+
+def _run_xml(text: str, bold: bool = False) -> str:
+    # Same markup add_paragraph(text) produces: one run, tabs as <w:tab/>; empty text -> no run.
+    if not text: return ""
+    parts = [f'<w:t xml:space="preserve">{escape(t)}</w:t>' if t else "" for t in text.split("\t")]
+    return "<w:r>" + ("<w:rPr><w:b/></w:rPr>" if bold else "") + "<w:tab/>".join(parts) + "</w:r>"
+
+def append_paragraphs(doc, lines: list[str]):
+    _append_xml(doc, "".join(f"<w:p>{_run_xml(line)}</w:p>" for line in lines))
+
+def append_styled(doc, paragraphs: list[tuple]):
+    # paragraphs: (style id or None, ((text, bold), ...)) -> one <w:p> each, styled like add_paragraph(style=...).
+    xml = []
+    for style, spans in paragraphs:
+        ppr = f'<w:pPr><w:pStyle w:val="{escape(style)}"/></w:pPr>' if style else ""
+        xml.append(f"<w:p>{ppr}{''.join(_run_xml(t, b) for t, b in spans)}</w:p>")
+    _append_xml(doc, "".join(xml))
+
+def _append_xml(doc, xml: str):
+    # Build every <w:p> in one XML fragment and parse it once, instead of one add_paragraph call per line.
+    frag = parse_xml(f"<w:body {nsdecls('w')}>{xml}</w:body>")
+    body = doc.element.body
+    sect = body.sectPr
+    if sect is None: body.extend(list(frag))
+    else:
+        for p in list(frag): sect.addprevious(p)
+
+# python-docx stamps every zip member with the current time, so two saves of the same document differ
+# byte-wise. Members written with this fixed timestamp make equal documents equal files (and equal hashes).
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+
+def _zip_info(name: str) -> ZipInfo:
+    info = ZipInfo(name, date_time=ZIP_EPOCH)
+    info.compress_type = ZIP_DEFLATED
+    info.external_attr = 0o600 << 16  # what ZipFile.writestr(name, ...) sets
+    return info
+
+class _StableZipWriter:
+    # python-docx PhysPkgWriter interface (write/close) over a ZipFile with fixed member timestamps.
+    def __init__(self, f):
+        self._zipf = ZipFile(f, "w", compression=ZIP_DEFLATED)
+
+    def write(self, pack_uri, blob):
+        self._zipf.writestr(_zip_info(pack_uri.membername), blob)
+
+    def close(self):
+        self._zipf.close()
+
+def docx_bytes(doc) -> bytes:
+    # doc.save() with reproducible output: same parts -> same bytes.
+    pkg = doc.part.package
+    for part in pkg.parts: part.before_marshal()
+    buf = BytesIO()
+    writer = _StableZipWriter(buf)
+    PackageWriter._write_content_types_stream(writer, pkg.parts)
+    PackageWriter._write_pkg_rels(writer, pkg.rels)
+    PackageWriter._write_parts(writer, pkg.parts)
+    writer.close()
+    return buf.getvalue()
+
+def normalize_docx(data: bytes) -> bytes:
+    # An existing .docx rewritten with fixed member timestamps (for deduplicating files saved by doc.save()).
+    src, buf = ZipFile(BytesIO(data)), BytesIO()
+    with src, ZipFile(buf, "w", compression=ZIP_DEFLATED) as dst:
+        for info in src.infolist(): dst.writestr(_zip_info(info.filename), src.read(info))
+    return buf.getvalue()
+
+_factories: dict[str, DocxFactory] = {}
+_lock = threading.Lock()
+
+def get_factory(template: Path | None = None) -> DocxFactory:
+    if template is None and STYLE_TEMPLATE.exists(): template = STYLE_TEMPLATE
+    key = str(template or "")
+    with _lock:
+        if key not in _factories: _factories[key] = DocxFactory(template)
+        return _factories[key]
@@ -0,0 +1,185 @@
+# scripts/ingest.py
+# Streaming ingestion of posting exports (JSONL / CSV / directories), paragraph-aligned chunking,
+# per-chunk keyword counts merged into one table, and a condensed JD for the ranking prompt.
+from __future__ import annotations
+import argparse, csv, heapq, json, re, sys, time
+from pathlib import Path
+from utils import extract_keywords, keyword_counts
+from scripts.matcher import KeywordMatcher
+
+POSTING_SUFFIXES = (".txt", ".md")
+JD_FIELDS = ("jd_text", "jd", "description", "job_description")
+COMPANY_FIELDS = ("company", "company_name", "employer")
+CHUNK_CHARS = 4000
+RANK_JD_CHARS = 4000  # JD budget inside the ranking prompt
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+_UNIT = re.compile(r"\n+|(?<=[.!?;])\s+")
+
+# --- postings ---
+
+def _row_posting(row: dict, fallback_company: str) -> dict:
+    jd = next((row[k] for k in JD_FIELDS if row.get(k)), "")
+    company = next((row[k] for k in COMPANY_FIELDS if row.get(k)), fallback_company)
+    return {"company": company, "jd_text": jd}
+
+def postings_from_jsonl(lines, stem: str):
+    # lines: any iterable of text lines (open file, uploaded file wrapper, list).
+    for n, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line: continue
+        yield _row_posting(json.loads(line), f"{stem}-{n}")
+
+def postings_from_csv(f, stem: str):
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))  # JD columns easily exceed the 128 KB default
+    for n, row in enumerate(csv.DictReader(f), 1):
+        yield _row_posting(row, f"{stem}-{n}")
+
+def iter_jsonl(path: Path):
+    with path.open(encoding="utf-8") as f:
+        yield from postings_from_jsonl(f, path.stem)
+
+def iter_csv(path: Path):
+    with path.open(encoding="utf-8", newline="") as f:
+        yield from postings_from_csv(f, path.stem)
+
+def iter_postings(src: Path):
+    # One posting in memory at a time, whatever the size of the export.
+    if src.is_dir():
+        for p in sorted(src.iterdir()):
+            suffix = p.suffix.lower()
+            if suffix in POSTING_SUFFIXES:
+                yield {"company": p.stem, "jd_text": p.read_text(encoding="utf-8")}
+            elif suffix == ".jsonl":
+                yield from iter_jsonl(p)
+            elif suffix == ".csv":
+                yield from iter_csv(p)
+    elif src.suffix.lower() == ".csv":
+        yield from iter_csv(src)
+    else:
+        yield from iter_jsonl(src)
+
+# --- chunking ---
+
+def iter_paragraphs(lines):
+    # Blank-line separated paragraphs from any line iterator (a str's lines, or an open file).
+    buf = []
+    for line in lines:
+        if line.strip():
+            buf.append(line.rstrip("\n"))
+        elif buf:
+            yield "\n".join(buf); buf = []
+    if buf: yield "\n".join(buf)
+
+def _split_long(para: str, max_chars: int):
+    # Oversized paragraph: break at sentence ends, and hard-split anything still too long.
+    buf = ""
+    for sent in _SENTENCE_END.split(para):
+        while len(sent) > max_chars:
+            if buf: yield buf; buf = ""
+            yield sent[:max_chars]; sent = sent[max_chars:]
+        if buf and len(buf) + 1 + len(sent) > max_chars:
+            yield buf; buf = ""
+        buf = f"{buf} {sent}" if buf else sent
+    if buf: yield buf
+
+def chunk_paragraphs(paragraphs, max_chars: int = CHUNK_CHARS):
+    # Packs whole paragraphs into chunks of at most max_chars.
+    buf, size = [], 0
+    for para in paragraphs:
+        for piece in (_split_long(para, max_chars) if len(para) > max_chars else (para,)):
+            if buf and size + len(piece) + 2 > max_chars:
+                yield "\n\n".join(buf); buf, size = [], 0
+            buf.append(piece); size += len(piece) + 2
+    if buf: yield "\n\n".join(buf)
+
+def chunk_text(text: str, max_chars: int = CHUNK_CHARS):
+    return chunk_paragraphs(iter_paragraphs(text.splitlines()), max_chars)
+
+def chunk_file(path: Path, max_chars: int = CHUNK_CHARS):
+    # Same chunks as chunk_text(path.read_text()) without reading the whole file.
+    with path.open(encoding="utf-8") as f:
+        yield from chunk_paragraphs(iter_paragraphs(f), max_chars)
+
+# --- keywords ---
+
+def merged_keyword_counts(chunks) -> dict[str, int]:
+    # Sum of per-chunk keyword_counts. Equals keyword_counts(whole text) except for phrases that would
+    # have spanned a chunk (paragraph) boundary.
+    total: dict[str, int] = {}
+    get = total.get
+    for chunk in chunks:
+        for tok, n in keyword_counts(chunk).items():
+            total[tok] = get(tok, 0) + n
+    return total
+
+def top_keywords(counts: dict[str, int], top_k: int = 60) -> list[str]:
+    return [k for k, _ in heapq.nsmallest(top_k, counts.items(), key=lambda x: (-x[1], x[0]))]
+
+def jd_keywords(jd_text: str, top_k: int = 60, chunk_chars: int = CHUNK_CHARS) -> list[str]:
+    # A JD's ranking candidates, counted chunk by chunk so a very long posting never needs one pass over
+    # all of it. A single-chunk JD gives exactly extract_keywords(). Builds, pre-ranking and the JD index
+    # all use this, so their rank-cache keys and MinHash signatures agree.
+    if len(jd_text) <= chunk_chars: return extract_keywords(jd_text, top_k)
+    return top_keywords(merged_keyword_counts(chunk_text(jd_text, chunk_chars)), top_k)
+
+def condense_jd(jd_text: str, keywords: list[str], budget: int = RANK_JD_CHARS) -> str:
+    # JD text for the ranking prompt: short postings pass through unchanged; longer ones keep the
+    # opening line plus the lines/sentences richest in top keywords (weighted by rank), in document
+    # order, up to `budget` characters -- so late requirements are seen, not cut off at budget.
+    if len(jd_text) <= budget: return jd_text
+    units, seen = [], set()
+    for u in _UNIT.split(jd_text):
+        u = u.strip()
+        if u and u not in seen: seen.add(u); units.append(u[:budget])
+    if not units: return ""
+    weights: dict[str, int] = {}
+    for i, k in enumerate(keywords): weights.setdefault(k.lower(), len(keywords) - i)
+    matcher = KeywordMatcher(keywords)
+    scored = []
+    for i, u in enumerate(units):
+        score = sum(weights.get(k, 0) for k in matcher.search(u))
+        if score: scored.append((-score, i))
+    keep, used = {0}, len(units[0]) + 1
+    for _, i in sorted(scored):
+        if i in keep: continue
+        cost = len(units[i]) + 1
+        if used + cost > budget: continue
+        keep.add(i); used += cost
+    return "\n".join(units[i] for i in sorted(keep))[:budget]
+
+def digest_posting(post: dict, chunk_chars: int = CHUNK_CHARS, top_k: int = 60) -> dict:
+    jd = post["jd_text"]
+    chunks = 0
+    def counted(it):
+        nonlocal chunks
+        for c in it: chunks += 1; yield c
+    candidates = top_keywords(merged_keyword_counts(counted(chunk_text(jd, chunk_chars))), top_k)  # == jd_keywords(jd)
+    return {"company": post["company"], "chars": len(jd), "chunks": chunks, "candidates": candidates,
+            "condensed": condense_jd(jd, candidates)}
+
+def main():
+    ap = argparse.ArgumentParser(description="Stream a postings export (JSONL/CSV/directory) into per-posting keyword digests.")
+    ap.add_argument("src", help="JSONL or CSV export, or a directory of .txt/.md/.jsonl/.csv postings")
+    ap.add_argument("--out", default=None, help="Write one JSON digest per line here (default: stdout)")
+    ap.add_argument("--chunk-chars", type=int, default=CHUNK_CHARS)
+    ap.add_argument("--top-k", type=int, default=60)
+    args = ap.parse_args()
+
+    src = Path(args.src)
+    if not src.exists():
+        print(f"Source not found: {src}"); sys.exit(1)
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    t0, n, chars = time.perf_counter(), 0, 0
+    try:
+        for post in iter_postings(src):
+            d = digest_posting(post, args.chunk_chars, args.top_k)
+            out.write(json.dumps(d, ensure_ascii=False) + "\n")
+            n += 1; chars += d["chars"]
+    finally:
+        if args.out: out.close()
+    elapsed = time.perf_counter() - t0
+    print(f"{n} postings, {chars / 1e6:.1f} M chars in {elapsed:.2f}s ({chars / 1e6 / max(elapsed, 1e-9):.1f} M chars/s)",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+# scripts/instrument.py
+from __future__ import annotations
+import json, os, secrets, sys, time, tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+# Per-stage peak memory needs tracemalloc, which slows allocation-heavy stages noticeably; opt in with
+# StageTimer(memory=True) or RESUME_TRACE_MEMORY=1. tracemalloc is process-wide, so peaks are only exact
+# when one build runs at a time (not under the threaded server).
+TRACE_MEMORY = os.environ.get("RESUME_TRACE_MEMORY", "") not in ("", "0")
+
+def _max_rss_kb() -> int | None:
+    if resource is None: return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss  # bytes on macOS, KiB elsewhere
+
+class StageTimer:
+    # Collects one record per stage: wall/CPU time, bytes written and (optionally) peak traced memory.
+    def __init__(self, memory: bool | None = None):
+        self.memory = TRACE_MEMORY if memory is None else memory
+        self.trace_id = secrets.token_hex(16)
+        self.stages: list[dict] = []
+        self._started_here = False
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(); self._started_here = True
+
+    @contextmanager
+    def stage(self, name: str, **attrs):
+        rec = {"stage": name, **attrs, "bytes": 0}
+        if self.memory: tracemalloc.reset_peak(); mem0 = tracemalloc.get_traced_memory()[0]
+        start_ns, wall0, cpu0 = time.time_ns(), time.perf_counter(), time.process_time()
+        try:
+            yield rec
+        finally:
+            rec["wall_ms"] = round((time.perf_counter() - wall0) * 1000, 3)
+            rec["cpu_ms"] = round((time.process_time() - cpu0) * 1000, 3)
+            rec["peak_kb"] = round((tracemalloc.get_traced_memory()[1] - mem0) / 1024, 1) if self.memory else None
+            rec["start_unix_ns"] = start_ns
+            self.stages.append(rec)
+
+    def close(self):
+        if self._started_here: tracemalloc.stop(); self._started_here = False
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "total_wall_ms": round(sum(s["wall_ms"] for s in self.stages), 3),
+            "total_cpu_ms": round(sum(s["cpu_ms"] for s in self.stages), 3),
+            "bytes_written": sum(s["bytes"] for s in self.stages),
+            "max_rss_kb": _max_rss_kb(),
+            "stages": self.stages,
+        }
+
+def stage(timer: StageTimer | None, name: str, **attrs):
+    # `with stage(timer, "lint", style=...) as rec:` -- a plain dict sink when no timer is active.
+    return timer.stage(name, **attrs) if timer else nullcontext({})
+
+# --- exporters: each takes the to_dict() payload ---
+
+def otel_spans(timings: dict, service: str = "resume-creator") -> dict:
+    # OTLP/JSON-shaped trace: one root "build" span with a child span per stage.
+    def attrs(d: dict) -> list[dict]:
+        out = []
+        for k, v in d.items():
+            if v is None: continue
+            key = "intValue" if isinstance(v, int) and not isinstance(v, bool) else \
+                  "doubleValue" if isinstance(v, float) else "stringValue"
+            out.append({"key": f"resume.{k}", "value": {key: str(v) if key == "intValue" else v}})
+        return out
+
+    trace_id, root_id = timings["trace_id"], secrets.token_hex(8)
+    spans = []
+    for s in timings["stages"]:
+        end = s["start_unix_ns"] + int(s["wall_ms"] * 1e6)
+        extra = {k: v for k, v in s.items() if k not in ("stage", "start_unix_ns", "wall_ms")}
+        spans.append({"traceId": trace_id, "spanId": secrets.token_hex(8), "parentSpanId": root_id, "name": s["stage"],
+                      "startTimeUnixNano": str(s["start_unix_ns"]), "endTimeUnixNano": str(end), "attributes": attrs(extra)})
+    if spans:
+        start = min(int(s["startTimeUnixNano"]) for s in spans)
+        end = max(int(s["endTimeUnixNano"]) for s in spans)
+        spans.insert(0, {"traceId": trace_id, "spanId": root_id, "name": "build", "startTimeUnixNano": str(start),
+                         "endTimeUnixNano": str(end), "attributes": attrs({"bytes_written": timings["bytes_written"]})})
+    return {"resourceSpans": [{"resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service}}]},
+                               "scopeSpans": [{"scope": {"name": "scripts.instrument"}, "spans": spans}]}]}
+
+def prometheus_text(timings: dict, labels: dict[str, str] | None = None) -> str:
+    # Prometheus text exposition format; one sample per stage (and style, when the stage has one).
+    metrics = (("wall_ms", "resume_stage_wall_seconds", "Wall time per build stage", 1e-3),
+               ("cpu_ms", "resume_stage_cpu_seconds", "CPU time per build stage", 1e-3),
+               ("bytes", "resume_stage_bytes_written", "Bytes written per build stage", 1),
+               ("peak_kb", "resume_stage_peak_memory_bytes", "Peak traced memory per build stage", 1024))
+    esc = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    lines = []
+    for key, name, help_text, scale in metrics:
+        samples = [s for s in timings["stages"] if s.get(key) is not None]
+        if not samples: continue
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for s in samples:
+            lab = {**(labels or {}), "stage": s["stage"], **({"style": s["style"]} if "style" in s else {})}
+            lab_text = ",".join(k + '="' + esc(v) + '"' for k, v in lab.items())
+            lines.append(f"{name}{{{lab_text}}} {s[key] * scale:g}")
+    return "\n".join(lines) + "\n"
+
+def to_opentelemetry(timings: dict, tracer_name: str = "resume-creator"):
+    # Replays the recorded stages through the OpenTelemetry API when it is installed (pip install opentelemetry-sdk).
+    from opentelemetry import trace
+    tracer = trace.get_tracer(tracer_name)
+    stages = timings["stages"]
+    if not stages: return
+    start = min(s["start_unix_ns"] for s in stages)
+    end = max(s["start_unix_ns"] + int(s["wall_ms"] * 1e6) for s in stages)
+    root = tracer.start_span("build", start_time=start)
+    ctx = trace.set_span_in_context(root)
+    for s in stages:
+        span = tracer.start_span(s["stage"], context=ctx, start_time=s["start_unix_ns"],
+                                 attributes={k: v for k, v in s.items() if k not in ("stage", "start_unix_ns") and v is not None})
+        span.end(end_time=s["start_unix_ns"] + int(s["wall_ms"] * 1e6))
+    root.end(end_time=end)
+
+_EXPORTERS: list = []
+
+def register_exporter(fn):
+    # fn(timings: dict, out_root: Path | None) is called after every instrumented build.
+    _EXPORTERS.append(fn)
+    return fn
+
+def export(timings: dict, out_root=None):
+    for fn in _EXPORTERS:
+        try:
+            fn(timings, out_root)
+        except Exception as e:
+            print(f"timings exporter {getattr(fn, '__name__', fn)} failed: {e}")
+
+EXPORT_KINDS = ("otel", "prom", "opentelemetry")
+
+def make_exporter(kind: str):
+    # otel/prom write timings.otel.json / timings.prom next to the artifacts (skipped for in-memory builds);
+    # opentelemetry hands the spans to an installed OpenTelemetry SDK.
+    def _write(timings: dict, out_root=None):
+        if kind == "opentelemetry": return to_opentelemetry(timings)
+        if out_root is None: return
+        root = Path(out_root)
+        if kind == "otel":
+            (root / "timings.otel.json").write_text(json.dumps(otel_spans(timings), indent=2), encoding="utf-8")
+        elif kind == "prom":
+            (root / "timings.prom").write_text(prometheus_text(timings, {"slug": root.name}), encoding="utf-8")
+    _write.__name__ = f"{kind}_exporter"
+    return _write
@@ -0,0 +1,218 @@
+# scripts/jd_index.py
+# Near-duplicate job descriptions: every build records a MinHash signature of its JD's jd_keywords()
+# set (the same candidates the ranking prompt sees) in outputs/.cache/jd_index.sqlite, bucketed by LSH
+# bands. A new JD whose keyword set is within the threshold (Jaccard) of an earlier build reuses that
+# build's ranking, and build_resume copies its artifacts when their inputs still match.
+#   python -m scripts jd-index stats | query <jd file> | dupes <postings> | clear | bench   [--threshold 0.8]
+from __future__ import annotations
+import argparse, hashlib, json, random, sqlite3, struct, sys, threading, time
+from functools import lru_cache
+from pathlib import Path
+from utils import extract_keywords
+from scripts.ingest import jd_keywords
+
+BASE = Path(__file__).resolve().parents[1]
+INDEX_PATH = BASE / "outputs" / ".cache" / "jd_index.sqlite"
+DEFAULT_THRESHOLD = 0.8
+NUM_PERM, BANDS = 64, 16  # 4 rows per band: a pair at Jaccard 0.7 shares a bucket with p = 0.99, at 0.3 with p = 0.12
+_ROWS = NUM_PERM // BANDS
+# 64 independent 32-bit hashes per shingle: four salted 64-byte BLAKE2b digests. Bucket ids are stored, so
+# the salts must never change.
+_SALTS = tuple(f"jd-minhash-{i}".encode() for i in range(NUM_PERM // 16))
+_UNPACK = struct.Struct(f"<{NUM_PERM}I").unpack
+
+def shingles(keywords: list[str]) -> set[str]:
+    return {k.strip().lower() for k in keywords if k.strip()}
+
+def signature(shingle_set: set[str]) -> list[int]:
+    # Per position, the minimum hash over the set: P(two sets agree) = their Jaccard similarity.
+    if not shingle_set: return [0xFFFFFFFF] * NUM_PERM
+    rows = [_UNPACK(b"".join(hashlib.blake2b(s.encode("utf-8"), salt=salt).digest() for salt in _SALTS))
+            for s in shingle_set]
+    return [min(col) for col in zip(*rows)]
+
+def band_buckets(sig: list[int]) -> list[int]:
+    # One signed 64-bit bucket id per band (SQLite INTEGER).
+    return [int.from_bytes(hashlib.blake2b(struct.pack(f"<{_ROWS}I", *sig[i * _ROWS:(i + 1) * _ROWS]), digest_size=8,
+                                           person=b"band%d" % i).digest(), "little", signed=True) for i in range(BANDS)]
+
+@lru_cache(maxsize=256)
+def _buckets(keywords: tuple[str, ...]) -> list[int]:
+    # A build looks its JD up and then indexes it: the signature is computed once.
+    return band_buckets(signature(shingles(keywords)))
+
+def jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+class JDIndex:
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS builds (slug TEXT PRIMARY KEY, jd_sha TEXT NOT NULL, "
+                         "keywords TEXT NOT NULL, ranked TEXT NOT NULL, ranker TEXT NOT NULL, built REAL NOT NULL)")
+            conn.execute("CREATE TABLE IF NOT EXISTS bands (band INTEGER NOT NULL, bucket INTEGER NOT NULL, "
+                         "slug TEXT NOT NULL, PRIMARY KEY (band, bucket, slug)) WITHOUT ROWID")
+            conn.execute("CREATE INDEX IF NOT EXISTS bands_slug ON bands(slug)")
+            self._conn = conn
+        return self._conn
+
+    def add(self, slug: str, keywords: list[str], ranked: list[str], jd_sha: str = "", ranker: str = ""):
+        # (Re)indexes one build. ranker names the model + prompt version the ranking came from.
+        buckets = _buckets(tuple(keywords))
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("DELETE FROM bands WHERE slug = ?", (slug,))
+                db.execute("INSERT OR REPLACE INTO builds(slug, jd_sha, keywords, ranked, ranker, built) VALUES(?, ?, ?, ?, ?, ?)",
+                           (slug, jd_sha, json.dumps(sorted(shingles(keywords)), ensure_ascii=False), json.dumps(ranked, ensure_ascii=False),
+                            ranker, time.time()))
+                db.executemany("INSERT OR IGNORE INTO bands(band, bucket, slug) VALUES(?, ?, ?)",
+                               [(i, b, slug) for i, b in enumerate(buckets)])
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK"); raise
+
+    def candidates(self, keywords: list[str]) -> list[str]:
+        # Builds sharing at least one LSH bucket with this keyword set.
+        buckets = _buckets(tuple(keywords))
+        with self._lock:
+            rows = self._db().execute(
+                # OR of (band, bucket) terms: one primary-key search each (a row-value IN list scans the table)
+                "SELECT DISTINCT slug FROM bands WHERE " + " OR ".join(["(band = ? AND bucket = ?)"] * BANDS),
+                [v for i, b in enumerate(buckets) for v in (i, b)]).fetchall()
+        return [r[0] for r in rows]
+
+    def find(self, keywords: list[str], threshold: float = DEFAULT_THRESHOLD, exclude: str | None = None,
+             ranker: str | None = None) -> dict | None:
+        # Most similar earlier build (exact Jaccard of the keyword sets, checked on the LSH candidates only);
+        # ties go to the most recent build. None when nothing reaches the threshold.
+        slugs = [s for s in self.candidates(keywords) if s != exclude]
+        if not slugs: return None
+        mine = shingles(keywords)
+        with self._lock:
+            rows = self._db().execute(f"SELECT slug, jd_sha, keywords, ranked, ranker, built FROM builds "
+                                      f"WHERE slug IN ({','.join('?' * len(slugs))})", slugs).fetchall()
+        best = None
+        for slug, jd_sha, kws, ranked, rk, built in rows:
+            if ranker is not None and rk != ranker: continue
+            sim = jaccard(mine, set(json.loads(kws)))  # stored already normalized
+            if sim >= threshold and (best is None or (sim, built) > (best["similarity"], best["built"])):
+                best = {"slug": slug, "similarity": round(sim, 4), "jd_sha": jd_sha, "ranked": json.loads(ranked), "built": built}
+        return best
+
+    def remove(self, slug: str):
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM bands WHERE slug = ?", (slug,)); db.execute("DELETE FROM builds WHERE slug = ?", (slug,))
+
+    def stats(self) -> dict:
+        with self._lock:
+            db = self._db()
+            builds = db.execute("SELECT COUNT(*) FROM builds").fetchone()[0]
+            buckets = db.execute("SELECT COUNT(*) FROM (SELECT DISTINCT band, bucket FROM bands)").fetchone()[0]
+        return {"path": str(self.path), "builds": builds, "buckets": buckets, "num_perm": NUM_PERM, "bands": BANDS}
+
+    def clear(self):
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM bands"); db.execute("DELETE FROM builds")
+
+_default: JDIndex | None = None
+
+def get_jd_index() -> JDIndex:
+    global _default
+    if _default is None: _default = JDIndex()
+    return _default
+
+def near_duplicates(src: Path, threshold: float = DEFAULT_THRESHOLD) -> list[dict]:
+    # Groups of postings in a backlog whose keyword sets are within the threshold of the group's first posting
+    # (an in-memory index, nothing is written): the postings a batch build would serve by reuse.
+    from scripts.ingest import iter_postings
+    index = JDIndex(":memory:")
+    groups: dict[str, dict] = {}
+    for n, post in enumerate(iter_postings(src)):
+        kws = jd_keywords(post["jd_text"])
+        hit = index.find(kws, threshold)
+        if hit: groups[hit["slug"]]["duplicates"].append({"company": post["company"], "similarity": hit["similarity"]})
+        else:
+            key = f"{n}"
+            index.add(key, kws, [])
+            groups[key] = {"company": post["company"], "duplicates": []}
+    return [g for g in groups.values() if g["duplicates"]]
+
+def _bench(n: int, threshold: float):
+    from scripts.bench_keywords import WORDS
+    rng = random.Random(7)
+    vocab = [f"{a}{b}" for a in WORDS for b in WORDS if a != b]
+    def sentence(topic): return " ".join(rng.choices(topic, k=8))
+    texts = []
+    for i in range(n):
+        if i % 4 == 3:
+            # A repost of an earlier posting with a few sentences rewritten.
+            src = texts[rng.randrange(i)].split(". ")
+            for _ in range(2): src[rng.randrange(len(src))] = sentence(rng.sample(vocab, 20))
+            texts.append(". ".join(src))
+        else:
+            topic = rng.sample(vocab, 80)
+            texts.append(". ".join(sentence(topic) for _ in range(40)))
+    t0 = time.perf_counter()
+    kws = [extract_keywords(t) for t in texts]
+    extract_s = time.perf_counter() - t0
+    sets = [shingles(k) for k in kws]
+
+    t0 = time.perf_counter()
+    brute = [max(((jaccard(sets[i], sets[j]), j) for j in range(i)), default=(0.0, None)) for i in range(n)]
+    brute_s = time.perf_counter() - t0
+    index = JDIndex(":memory:")
+    t0 = time.perf_counter()
+    lsh = []
+    for i, k in enumerate(kws):
+        hit = index.find(k, threshold)
+        lsh.append(hit["slug"] if hit else None)
+        index.add(str(i), k, [])
+    lsh_s = time.perf_counter() - t0
+
+    truth = [str(j) if sim >= threshold else None for sim, j in brute]
+    found = sum(1 for t, l in zip(truth, lsh) if t is not None and l is not None)
+    wrong = sum(1 for t, l in zip(truth, lsh) if t is None and l is not None)
+    print(f"{n} JDs, threshold {threshold}: {sum(t is not None for t in truth)} near-duplicates "
+          f"(LSH found {found}, {wrong} false matches)")
+    print(f"  extract_keywords     {extract_s / n * 1000:>8.3f} ms/JD (shared)")
+    print(f"  pairwise Jaccard     {brute_s / n * 1000:>8.3f} ms/JD (grows with the index)")
+    print(f"  LSH query + insert   {lsh_s / n * 1000:>8.3f} ms/JD")
+
+def main():
+    ap = argparse.ArgumentParser(description="Near-duplicate JD index used to reuse earlier builds' rankings and artifacts.")
+    ap.add_argument("cmd", choices=["stats", "query", "dupes", "clear", "bench"])
+    ap.add_argument("path", nargs="?", help="query: a JD file; dupes: a postings directory or JSONL/CSV export")
+    ap.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Minimum Jaccard similarity of the keyword sets")
+    ap.add_argument("-n", type=int, default=2000, help="bench: number of synthetic JDs")
+    args = ap.parse_args()
+
+    if args.cmd == "bench": _bench(args.n, args.threshold); return
+    if args.cmd in ("query", "dupes"):
+        if not args.path: ap.error(f"{args.cmd} needs a path")
+        if not Path(args.path).exists(): print(f"Not found: {args.path}"); sys.exit(1)
+    if args.cmd == "dupes":
+        groups = near_duplicates(Path(args.path), args.threshold)
+        for g in groups:
+            print(f"{g['company']}: " + ", ".join(f"{d['company']} ({d['similarity']:.2f})" for d in g["duplicates"]))
+        if not groups: print("No near-duplicate postings.")
+        return
+    index = get_jd_index()
+    if args.cmd == "clear": index.clear()
+    if args.cmd == "query":
+        hit = index.find(jd_keywords(Path(args.path).read_text(encoding="utf-8")), args.threshold)
+        print(json.dumps({k: v for k, v in hit.items() if k != "ranked"} if hit else None, indent=2)); return
+    print(json.dumps(index.stats(), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+# scripts/lint_engine.py
+# One rule-based ATS lint for generated documents and the profile. Rules are plugins registered with
+# @register_rule and read a LintContext: plain views (table count, header/footer text, body text and its
+# UTF-8 bytes) built from an in-memory python-docx Document, or straight from a .docx file's XML (no
+# python-docx) when linting directories of output in parallel. Results are cached by file content.
+#   python -m scripts lint [outputs/] [--workers N] [--out report.json] [--profile] [--no-cache]
+from __future__ import annotations
+import argparse, hashlib, io, json, os, sys, time, zipfile
+from pathlib import Path
+from xml.etree import ElementTree as ET
+
+BASE = Path(__file__).resolve().parents[1]
+OUTPUTS = BASE / "outputs"
+PROFILE_PATH = BASE / "profile" / "profile.json"
+CACHE_PATH = OUTPUTS / ".cache" / "lint.json"
+ENGINE_VERSION = "1"  # bump when a rule's behaviour changes so cached results are not reused
+CACHE_MAX_ENTRIES = 50_000
+CONTACT_FIELDS = ("name", "location", "email", "phone", "linkedin")
+SKILL_FIELDS = ("domains", "methods", "platforms", "security_terms")
+ROLE_FIELDS = ("company", "title", "start", "end")
+MAX_BULLET_CHARS = 300
+# bytes.translate(None, _NOT_LEAD) keeps only UTF-8 lead bytes of multi-byte sequences: one per non-ASCII char.
+_NOT_LEAD = bytes(range(0xC0))
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# --- context ---
+
+class LintContext:
+    # Views are computed once and shared by every rule; `profile` is the profile.json dict (or None).
+    def __init__(self, tables: int = 0, header_text: str = "", footer_text: str = "", paragraphs: list[str] | None = None,
+                 profile: dict | None = None, path: str | None = None):
+        self.tables = tables
+        self.header_text = header_text
+        self.footer_text = footer_text
+        self.paragraphs = paragraphs
+        self.profile = profile
+        self.path = path
+        self._text: str | None = None
+        self._data: bytes | None = None
+
+    @property
+    def has_document(self) -> bool:
+        return self.paragraphs is not None
+
+    @property
+    def text(self) -> str:
+        if self._text is None: self._text = "\n".join(self.paragraphs or ())
+        return self._text
+
+    @property
+    def data(self) -> bytes:
+        if self._data is None: self._data = self.text.encode("utf-8", "surrogatepass")
+        return self._data
+
+    @classmethod
+    def from_document(cls, doc, profile: dict | None = None) -> LintContext:
+        header = footer = ""
+        try:
+            sec = doc.sections[0]
+            # Only read defined headers/footers: .paragraphs on an undefined one adds an empty part to the document.
+            if not sec.header.is_linked_to_previous: header = "\n".join(p.text for p in sec.header.paragraphs)
+            if not sec.footer.is_linked_to_previous: footer = "\n".join(p.text for p in sec.footer.paragraphs)
+        except Exception:
+            pass
+        return cls(len(getattr(doc, "tables", None) or ()), header, footer, [p.text for p in doc.paragraphs], profile)
+
+    @classmethod
+    def from_docx(cls, source: str | Path | bytes, profile: dict | None = None) -> LintContext:
+        # Same views as from_document, read from the package XML with the standard library.
+        with zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source) as z:
+            rels = {r.get("Id"): r.get("Target") for r in ET.fromstring(z.read("word/_rels/document.xml.rels")).iter(f"{_PKG_REL}Relationship")}
+            body = ET.fromstring(z.read("word/document.xml")).find(f"{_W}body")
+            paragraphs = [_paragraph_text(p) for p in body.iterfind(f"{_W}p")]
+            tables = sum(1 for _ in body.iterfind(f"{_W}tbl"))
+            sect = next(body.iter(f"{_W}sectPr"), None)  # python-docx sections[0]: the first sectPr in the document
+
+            def part_text(kind: str) -> str:
+                if sect is None: return ""
+                ref = next((r for r in sect.iterfind(f"{_W}{kind}Reference") if r.get(f"{_W}type") == "default"), None)
+                target = rels.get(ref.get(f"{_R}id")) if ref is not None else None
+                if not target: return ""
+                root = ET.fromstring(z.read(target[1:] if target.startswith("/") else f"word/{target}"))
+                return "\n".join(_paragraph_text(p) for p in root.iterfind(f"{_W}p"))
+            return cls(tables, part_text("header"), part_text("footer"), paragraphs, profile, str(source) if not isinstance(source, bytes) else None)
+
+    @classmethod
+    def from_profile(cls, profile: dict) -> LintContext:
+        return cls(profile=profile)
+
+def _paragraph_text(p) -> str:
+    # Paragraph.text: runs directly in the paragraph or in its hyperlinks (tabs as \t, breaks as \n).
+    out = []
+    for child in p:
+        runs = (child,) if child.tag == f"{_W}r" else child.iterfind(f"{_W}r") if child.tag == f"{_W}hyperlink" else ()
+        for r in runs:
+            for el in r:
+                if el.tag == f"{_W}t": out.append(el.text or "")
+                elif el.tag in (f"{_W}tab", f"{_W}ptab"): out.append("\t")
+                elif el.tag in (f"{_W}br", f"{_W}cr"): out.append("\n")
+                elif el.tag == f"{_W}noBreakHyphen": out.append("-")
+    return "".join(out)
+
+# --- rules ---
+
+class Rule:
+    def __init__(self, fn, name: str, target: str, severity: str):
+        self.fn, self.name, self.target, self.severity = fn, name, target, severity
+
+_RULES: list[Rule] = []
+
+def register_rule(name: str, target: str = "docx", severity: str = "warning"):
+    # fn(ctx) -> iterable of messages. target "docx" rules need a document, "profile" rules a profile,
+    # "both" rules run only when the context has the two. Rules run in registration order.
+    def deco(fn):
+        _RULES.append(Rule(fn, name, target, severity))
+        return fn
+    return deco
+
+def rules(targets=("docx", "profile", "both")) -> list[Rule]:
+    return [r for r in _RULES if r.target in targets]
+
+@register_rule("tables", severity="error")
+def _tables(ctx):
+    if ctx.tables: yield f"Found {ctx.tables} table(s) — remove tables for ATS."
+
+@register_rule("header_text", severity="error")
+def _header(ctx):
+    if ctx.header_text.strip(): yield "Header contains text — clear it (ATS can skip headers)."
+
+@register_rule("footer_text", severity="error")
+def _footer(ctx):
+    if ctx.footer_text.strip(): yield "Footer contains text — clear it (ATS can skip footers)."
+
+@register_rule("non_ascii")
+def _non_ascii(ctx):
+    if ctx.text.isascii(): return  # C-speed check; the common case for generated documents
+    yield f"Non-ASCII chars detected: {len(ctx.data.translate(None, _NOT_LEAD))} — keep ASCII only."
+
+@register_rule("contact_in_document", target="both")
+def _contact_in_document(ctx):
+    head = "\n".join((ctx.paragraphs or [])[:5])
+    missing = [k for k in ("name", "email", "phone") if ctx.profile.get(k) and ctx.profile[k] not in head]
+    if missing: yield f"Contact details missing from the top of the document: {', '.join(missing)}."
+
+@register_rule("profile_contact", target="profile")
+def _profile_contact(ctx):
+    missing = [k for k in CONTACT_FIELDS if not str(ctx.profile.get(k) or "").strip()]
+    if missing: yield f"Contact missing: {', '.join(missing)}"
+
+@register_rule("profile_roles", target="profile")
+def _profile_roles(ctx):
+    exp = ctx.profile.get("experience") or []
+    if not exp: yield "No experience entries."; return
+    for r in exp:
+        company, title = str(r.get("company") or "").strip(), str(r.get("title") or "").strip()
+        if any(not str(r.get(k) or "").strip() for k in ROLE_FIELDS):
+            yield f"Role missing fields: {company} | {title} | {r.get('start') or ''}–{r.get('end') or ''}"
+
+@register_rule("profile_bullets", target="profile")
+def _profile_bullets(ctx):
+    for r in ctx.profile.get("experience") or []:
+        label = f"{str(r.get('company') or '').strip()} — {str(r.get('title') or '').strip()}"
+        bullets = [str(b) for b in r.get("bullets") or []]
+        if not bullets: yield f"{label}: 0 bullets"; continue
+        long = sum(len(b) > MAX_BULLET_CHARS for b in bullets)
+        no_period = sum(not b.strip().endswith(".") for b in bullets)
+        if long: yield f"{label}: {long} very long bullet(s) (>{MAX_BULLET_CHARS} chars)."
+        if no_period: yield f"{label}: {no_period} bullet(s) do not end with a period."
+
+@register_rule("profile_skills", target="profile")
+def _profile_skills(ctx):
+    for k in SKILL_FIELDS:
+        if not ctx.profile.get(k): yield f"No values in {k}."
+
+# --- engine ---
+
+def run_rules(ctx: LintContext, selected: list[Rule] | None = None) -> list[dict]:
+    targets = {"docx"} if ctx.has_document else set()
+    if ctx.profile is not None: targets.add("profile")
+    if targets == {"docx", "profile"}: targets.add("both")
+    issues = []
+    for r in selected if selected is not None else _RULES:
+        if r.target not in targets: continue
+        try:
+            issues += [{"rule": r.name, "severity": r.severity, "message": m} for m in r.fn(ctx)]
+        except Exception as e:
+            issues.append({"rule": r.name, "severity": "error", "message": f"Lint error: {e}"})
+    return issues
+
+def lint_document(doc, profile: dict | None = None) -> list[str]:
+    # Messages for an in-memory Document (the build's ats_lint_*.txt lines).
+    return [i["message"] for i in run_rules(LintContext.from_document(doc, profile))]
+
+def lint_profile(profile: dict) -> list[dict]:
+    return run_rules(LintContext.from_profile(profile))
+
+def load_profile_dict(path: Path = PROFILE_PATH) -> dict | None:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else None
+
+# --- directory lint ---
+
+_WORKER_PROFILE: dict | None = None
+
+def _init_worker(profile: dict | None):
+    global _WORKER_PROFILE
+    _WORKER_PROFILE = profile
+
+def _lint_file(path: str) -> list[dict]:
+    try:
+        return run_rules(LintContext.from_docx(path, _WORKER_PROFILE))
+    except Exception as e:  # not a readable .docx
+        return [{"rule": "read", "severity": "error", "message": f"Lint error: {e}"}]
+
+def _file_sha(path: Path, index_cache: dict) -> str:
+    # Files placed by the artifact store already have their hash in the slug's .artifacts.json.
+    from scripts.artifact_store import read_index
+    index = index_cache.get(path.parent)
+    if index is None: index = index_cache[path.parent] = read_index(path.parent)
+    entry = index.get(path.name)
+    if entry and path.stat().st_size == entry["size"]: return entry["sha256"]
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+def find_docx(root: Path) -> list[Path]:
+    return sorted(p for p in root.rglob("*.docx")
+                  if not p.name.startswith((".", "~$")) and not any(part.startswith(".") for part in p.relative_to(root).parts[:-1]))
+
+def lint_directory(root: Path, workers: int | None = None, profile: dict | None = None, use_cache: bool = True,
+                   cache_path: Path = CACHE_PATH) -> dict:
+    # Each distinct document (by SHA-256) is linted once; results are reused across runs until the
+    # content, the engine version or (for profile-aware rules) the profile changes.
+    t0 = time.perf_counter()
+    paths = find_docx(root)
+    index_cache: dict = {}
+    shas = [_file_sha(p, index_cache) for p in paths]
+    key_suffix = ENGINE_VERSION + ":" + ",".join(r.name for r in _RULES)
+    if profile is not None: key_suffix += ":" + hashlib.sha256(json.dumps(profile, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    cache: dict = {}
+    if use_cache:
+        try: cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError): cache = {}
+    results: dict[str, list[dict]] = {}
+    todo: dict[str, str] = {}
+    for p, sha in zip(paths, shas):
+        key = f"{sha}:{key_suffix}"
+        if key in cache: results[sha] = cache[key]
+        elif sha not in todo: todo[sha] = str(p)
+    if todo:
+        workers = workers or min(len(todo), os.cpu_count() or 1)
+        if workers > 1 and len(todo) > 8:
+            from concurrent.futures import ProcessPoolExecutor  # ~20 ms of multiprocessing imports; lint-profile never needs it
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(profile,)) as pool:
+                linted = list(pool.map(_lint_file, todo.values(), chunksize=max(1, len(todo) // (workers * 8))))
+        else:
+            _init_worker(profile)
+            linted = [_lint_file(p) for p in todo.values()]
+        for sha, issues in zip(todo, linted):
+            results[sha] = issues
+            cache[f"{sha}:{key_suffix}"] = issues
+        if use_cache:
+            from scripts.artifact_store import atomic_write
+            if len(cache) > CACHE_MAX_ENTRIES: cache = dict(list(cache.items())[-CACHE_MAX_ENTRIES:])  # oldest first out
+            atomic_write(cache_path, json.dumps(cache))
+    files, counts = [], {}
+    for p, sha in zip(paths, shas):
+        issues = results[sha]
+        for i in issues: counts[i["rule"]] = counts.get(i["rule"], 0) + 1
+        files.append({"path": str(p.relative_to(root)), "sha256": sha, "issues": issues})
+    return {"root": str(root), "engine_version": ENGINE_VERSION, "rules": [r.name for r in rules()],
+            "files": len(paths), "unique_documents": len(set(shas)), "linted": len(todo),
+            "cached": len(set(shas)) - len(todo), "files_with_issues": sum(1 for f in files if f["issues"]),
+            "issue_counts": counts, "seconds": round(time.perf_counter() - t0, 3), "results": files}
+
+def main():
+    ap = argparse.ArgumentParser(description="Lint every generated .docx under a directory (and optionally the profile) in parallel.")
+    ap.add_argument("root", nargs="?", default=str(OUTPUTS))
+    ap.add_argument("--workers", type=int, default=None, help="Processes (default: CPU count)")
+    ap.add_argument("--out", help="Write the JSON report here (default: summary only)")
+    ap.add_argument("--profile", action="store_true", help="Also run profile rules and check each document's contact lines against it")
+    ap.add_argument("--no-cache", action="store_true", help="Re-lint every document")
+    args = ap.parse_args()
+
+    root = Path(args.root)
+    if not root.is_dir(): print(f"Not a directory: {root}"); sys.exit(1)
+    profile = load_profile_dict() if args.profile else None
+    report = lint_directory(root, args.workers, profile, use_cache=not args.no_cache)
+    if profile is not None: report["profile"] = lint_profile(profile)
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"{report['files']} files ({report['unique_documents']} distinct): {report['linted']} linted, {report['cached']} cached, "
+          f"{report['files_with_issues']} with issues in {report['seconds']}s")
+    for rule, n in sorted(report["issue_counts"].items(), key=lambda x: -x[1]): print(f"  {rule:<20} {n}")
+    for issue in report.get("profile", []): print(f"  profile: {issue['message']}")
+    if args.out: print(f"Report: {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# scripts/matcher.py
+from __future__ import annotations
+from collections import deque
+from typing import Iterable
+
+class KeywordMatcher:
+    # Aho-Corasick automaton over case-folded patterns, compiled to a DFA so each text
+    # character costs a single dict lookup. Same semantics as `pattern.lower() in text.lower()`
+    # for every pattern at once; with word_chars set, a hit must not touch those characters on either side.
+    def __init__(self, patterns: Iterable[str], word_chars: str | None = None):
+        self.patterns = list(patterns)
+        self.keys = [p.lower() for p in self.patterns]
+        self.word_chars = frozenset(word_chars) if word_chars else None
+        uniq = list(dict.fromkeys(self.keys))
+        self._always = {k for k in uniq if not k}
+        goto: list[dict[str, int]] = [{}]
+        out: list[list[str]] = [[]]
+        for key in uniq:
+            if not key: continue
+            state = 0
+            for ch in key:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto); goto[state][ch] = nxt
+                    goto.append({}); out.append([])
+                state = nxt
+            out[state].append(key)
+        fail = [0] * len(goto)
+        delta: list[dict[str, int]] = [{} for _ in goto]
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        while queue:
+            s = queue.popleft()
+            delta[s] = {**delta[fail[s]], **goto[s]}
+            for ch, t in goto[s].items():
+                fail[t] = delta[fail[s]].get(ch, 0) if s else 0
+                out[t] = out[t] + out[fail[t]]
+                queue.append(t)
+        self._delta = delta
+        self._out = [tuple(o) for o in out]
+        self._n = len(uniq) - len(self._always)
+
+    def search(self, text: str) -> set[str]:
+        # Returns the (lower-cased) keys found in text, in one pass over it.
+        found = set(self._always)
+        if not self._n: return found
+        text = text.lower()
+        delta, out, wc = self._delta, self._out, self.word_chars
+        remaining, n = self._n, len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if not out[state]: continue
+            for key in out[state]:
+                if key in found: continue
+                if wc is not None:
+                    start = i - len(key) + 1
+                    if (start > 0 and text[start - 1] in wc) or (i + 1 < n and text[i + 1] in wc): continue
+                found.add(key); remaining -= 1
+            if not remaining: break
+        return found
+
+    def present_missing(self, text: str) -> tuple[list[str], list[str]]:
+        found = self.search(text)
+        present, missing = [], []
+        for p, k in zip(self.patterns, self.keys):
+            (present if k in found else missing).append(p)
+        return present, missing
@@ -2,15 +2,45 @@
 from __future__ import annotations
 import re, json, argparse
 from pathlib import Path
+from scripts.matcher import KeywordMatcher
 
 BASE = Path(__file__).resolve().parents[1]
 PROFILE_PATH = BASE / "profile" / "profile.json"
-ANSWERS_PATH = BASE / "profile" / "answers.json"
+
+TOKEN_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789-+"
+IGNORE = {"the","and","with","for","of","to","a","in","on","at","as","by","or"}
 
 def extract_keywords(jd_text: str) -> set[str]:
     words = re.findall(r"[A-Za-z0-9\-\+]+", jd_text)
-    ignore = {"the","and","with","for","of","to","a","in","on","at","as","by","or"}
-    return set(w.lower() for w in words if len(w) > 2 and w.lower() not in ignore)
+    return set(w.lower() for w in words if len(w) > 2 and w.lower() not in IGNORE)
+
+def _is_jd_token(tok: str) -> bool:
+    return len(tok) > 2 and tok not in IGNORE and all(ch in TOKEN_CHARS for ch in tok)
+
+LABELS = ("domains","methods","platforms","security_terms")
+
+def preview_alignment(profile, jd_text: str) -> dict:
+    # profile: profile.json as a dict, or a validated ProfileSchema
+    if not isinstance(profile, dict): profile = profile.model_dump()
+    kw = extract_keywords(jd_text)
+    # One whole-token scan of the JD for every profile token that could be a JD token.
+    tokens = {tok for label in LABELS for i in profile.get(label, []) for tok in i.lower().split() if _is_jd_token(tok)}
+    in_jd = KeywordMatcher(tokens, word_chars=TOKEN_CHARS).search(jd_text)
+
+    def filter_relevant(items):
+        keep, drop = [], []
+        for i in items:
+            if any(tok in in_jd for tok in i.lower().split()):
+                keep.append(i)
+            else:
+                drop.append(i)
+        return keep, drop
+
+    report = {"jd_tokens": sorted(kw)}
+    for label in LABELS:
+        keep, drop = filter_relevant(profile.get(label, []))
+        report[label] = {"keep": keep, "drop": drop}
+    return report
 
 def _load_txt(p: Path) -> str:
     return p.read_text(encoding="utf-8") if p.exists() else ""
@@ -22,40 +52,27 @@ def main():
     args = ap.parse_args()
 
     profile = json.loads(PROFILE_PATH.read_text(encoding="utf-8"))
-    answers = json.loads(ANSWERS_PATH.read_text(encoding="utf-8")) if ANSWERS_PATH.exists() else {"global": {}}
 
     jd_text = _load_txt(Path(args.jd_file))
     if not jd_text.strip():
         print("No JD found. Provide --jd-file or put text in data/job_posting.txt")
         return
 
-    kw = extract_keywords(jd_text)
-    kw_lower = set(kw)
-
-    def filter_relevant(items):
-        keep, drop = [], []
-        for i in items:
-            if any(tok in kw_lower for tok in i.lower().split()):
-                keep.append(i)
-            else:
-                drop.append(i)
-        return keep, drop
-
-    report = {}
-    for label in ("domains","methods","platforms","security_terms"):
-        keep, drop = filter_relevant(profile.get(label, []))
-        report[label] = {"keep": keep, "drop": drop}
-
+    report = preview_alignment(profile, jd_text)
+    kw = report["jd_tokens"]
     print("\n=== JD Filter Preview ===")
     print("JD tokens detected:", ", ".join(sorted(kw))[:800] + ("…" if len(",".join(sorted(kw)))>800 else ""))
-    for label in ("domains","methods","platforms","security_terms"):
+    for label in LABELS:
         block = report[label]
         print(f"\n[{label.upper()}]")
         print("  Keep:", ", ".join(block["keep"]) or "(none)")
         print("  Drop:", ", ".join(block["drop"]) or "(none)")
 
     # Show summary additions that will appear (curated only, no write)
-    curated = answers.get("global", {}).get("summary_additions", [])
+    from scripts.answers_db import get_answers_db
+    db = get_answers_db()
+    db.sync_json()
+    curated = db.global_items("summary_additions")
     if curated:
         print("\n[SUMMARY ADDITIONS (curated)]")
         for i, line in enumerate(curated[:10], 1):
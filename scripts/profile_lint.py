@@ -1,58 +1,29 @@
 # scripts/profile_lint.py
+# Profile rules of scripts/lint_engine.py (contact, roles, bullets, skills) over profile/profile.json.
 from __future__ import annotations
-import json, re
-from pathlib import Path
-
-BASE = Path(__file__).resolve().parents[1]
-PROFILE_PATH = BASE / "profile" / "profile.json"
+import argparse, json
+from scripts.lint_engine import PROFILE_PATH, SKILL_FIELDS, lint_profile, load_profile_dict
 
 def warn(msg): print("⚠︎", msg)
 def ok(msg): print("✓", msg)
 
 def main():
-    if not PROFILE_PATH.exists():
+    ap = argparse.ArgumentParser(description="Sanity-check profile/profile.json (contact, roles, bullets, skills).")
+    ap.add_argument("--json", action="store_true", help="Print the issues as JSON")
+    args = ap.parse_args()
+    profile = load_profile_dict(PROFILE_PATH)
+    if profile is None:
         print("profile/profile.json not found.")
         return
-    profile = json.loads(PROFILE_PATH.read_text(encoding="utf-8"))
-
-    # Contact
-    c = profile.get("contact", {})
-    missing = [k for k in ("location","email","phone","linkedin") if not c.get(k)]
-    if missing:
-        warn(f"Contact missing: {', '.join(missing)}")
-    else:
-        ok("Contact block complete.")
-
-    # Experience sanity
-    exp = profile.get("experience", [])
-    if not exp:
-        warn("No experience entries.")
-    else:
-        ok(f"{len(exp)} experience entries found.")
-        for r in exp:
-            company = r.get("company","").strip()
-            title = r.get("title","").strip()
-            dates = r.get("dates","").strip()
-            bullets = r.get("bullets", []) or []
-            if not company or not title or not dates:
-                warn(f"Role missing fields: {company} | {title} | {dates}")
-            if not bullets:
-                warn(f"{company} — {title}: 0 bullets")
-            # Basic bullet quality checks
-            long = [b for b in bullets if len(b) > 300]
-            no_period = [b for b in bullets if not str(b).strip().endswith(".")]
-            if long:
-                warn(f"{company} — {title}: {len(long)} very long bullet(s) (>300 chars).")
-            if no_period:
-                warn(f"{company} — {title}: {len(no_period)} bullet(s) do not end with a period.")
+    issues = lint_profile(profile)
+    if args.json: print(json.dumps(issues, indent=2, ensure_ascii=False)); return
 
-    # Skills presence (unfiltered; filtering happens at build-time)
-    for k in ("domains","methods","platforms","security_terms"):
-        items = profile.get(k, [])
-        if not items:
-            warn(f"No values in {k}.")
-        else:
-            ok(f"{k}: {len(items)} item(s).")
+    for issue in issues: warn(issue["message"])
+    flagged = {i["rule"] for i in issues}
+    if "profile_contact" not in flagged: ok("Contact block complete.")
+    if profile.get("experience"): ok(f"{len(profile['experience'])} experience entries found.")
+    for k in SKILL_FIELDS:
+        if profile.get(k): ok(f"{k}: {len(profile[k])} item(s).")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,103 @@
+# scripts/profile_store.py
+from __future__ import annotations
+import hashlib, json, threading
+from pathlib import Path
+from pydantic import BaseModel, ValidationError
+from utils import ProfileSchema, AnswersSchema
+from scripts.answers_db import AnswersDB, get_answers_db
+
+BASE = Path(__file__).resolve().parents[1]
+PROFILE_PATH = BASE / "profile" / "profile.json"
+ANSWERS_PATH = BASE / "profile" / "answers.json"
+
+class ModelStore:
+    # A JSON file validated straight from bytes (model_validate_json) and kept as a typed model.
+    # get() costs one stat() while (mtime_ns, size) is unchanged; after a change the bytes are
+    # re-read and only re-validated when their SHA-256 differs (e.g. not for a bare `touch`).
+    def __init__(self, path: Path, model: type[BaseModel], default: bytes | None = None):
+        self.path = path
+        self.model = model
+        self.default = default
+        self.sha256: str | None = None
+        self.loads = 0
+        self._stamp = None
+        self._value: BaseModel | None = None
+        self._lock = threading.Lock()
+
+    def _current_stamp(self):
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            if self.default is None: raise
+            return "default"
+        return st.st_mtime_ns, st.st_size
+
+    def get(self):
+        stamp = self._current_stamp()
+        if self._value is not None and stamp == self._stamp: return self._value
+        with self._lock:
+            if self._value is not None and stamp == self._stamp: return self._value
+            data = self.default if stamp == "default" else self.path.read_bytes()
+            sha = hashlib.sha256(data).hexdigest()
+            if self._value is None or sha != self.sha256:
+                try:
+                    self._value = self.model.model_validate_json(data)
+                except ValidationError as e:
+                    raise ValueError(f"{self.path} is not a valid {self.model.__name__}:\n{e}") from e
+                self.sha256 = sha
+                self.loads += 1
+            self._stamp = stamp
+            return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._stamp = None
+
+class AnswersStore:
+    # Typed view of the answers database. get() costs a stat() of answers.json (imported when edited) plus a
+    # revision read; the model is rebuilt only after some session or process recorded a change. The model's
+    # `asked` is left empty: the history only grows, builds never read it, and the database answers
+    # get_asked()/asked_for_role() lookups directly, so a rebuild stays proportional to global + roles.
+    def __init__(self, db: AnswersDB | None = None):
+        self._db = db
+        self.sha256: str | None = None
+        self.loads = 0
+        self._revision = None
+        self._value: AnswersSchema | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def db(self) -> AnswersDB:
+        return self._db or get_answers_db()
+
+    def stamp(self) -> int:
+        self.db.sync_json()
+        return self.db.revision()
+
+    def get(self) -> AnswersSchema:
+        rev = self.stamp()
+        if self._value is not None and rev == self._revision: return self._value
+        with self._lock:
+            rev, data = self.db.snapshot(asked=False)
+            if self._value is not None and rev == self._revision: return self._value
+            try:
+                self._value = AnswersSchema.model_validate(data)
+            except ValidationError as e:
+                raise ValueError(f"{self.db.path} does not hold valid answers:\n{e}") from e
+            self.sha256 = hashlib.sha256(json.dumps(data, sort_keys=True).encode("utf-8")).hexdigest()
+            self._revision = rev
+            self.loads += 1
+            return self._value
+
+    def invalidate(self):
+        with self._lock:
+            self._revision = None
+
+PROFILE_STORE = ModelStore(PROFILE_PATH, ProfileSchema)
+ANSWERS_STORE = AnswersStore()
+
+def as_profile(profile) -> ProfileSchema:
+    return profile if isinstance(profile, ProfileSchema) else ProfileSchema.model_validate(profile)
+
+def as_answers(answers) -> AnswersSchema:
+    return answers if isinstance(answers, AnswersSchema) else AnswersSchema.model_validate(answers)
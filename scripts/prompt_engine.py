@@ -1,6 +1,14 @@
 from __future__ import annotations
-import os, json, hashlib
+import os, json
 from utils import extract_keywords, dedupe_list
+from scripts.rank_cache import cache_key, get_cache
+from scripts.ingest import condense_jd
+from scripts.question_bank import get_bank
+
+MODEL = "gpt-4o-mini"
+LEGACY_MODEL = "gpt-3.5-turbo"
+PROMPT_VERSION = "2"  # bump whenever the ranking prompt changes so cached rankings are not reused
+REQUEST_TIMEOUT = 30.0  # seconds per ranking request
 
 def _get_openai_client():
     key = os.environ.get("OPENAI_API_KEY")
@@ -16,48 +24,85 @@ def _get_openai_client():
         except Exception:
             return None
 
-def rank_keywords_with_llm(jd_text: str, candidates: list[str]) -> list[str]:
-    client = _get_openai_client()
-    if not client: return candidates[:40]
-    prompt = f"""You are an ATS expert. Given a job description, select and rank the 35–45 MOST IMPORTANT skills/keywords
+def build_rank_prompt(jd_text: str, candidates: list[str]) -> str:
+    return f"""You are an ATS expert. Given a job description, select and rank the 35–45 MOST IMPORTANT skills/keywords
 that would impact resume parsing and keyword matching. Return a JSON array of strings only.
 
 JD:
-{jd_text[:4000]}
+{condense_jd(jd_text, candidates)}
 Candidates:
 {candidates[:80]}
 """
+
+def build_batch_rank_prompt(items: list[tuple[str, list[str]]]) -> str:
+    blocks = "\n\n".join(f"### JD {i}\n{condense_jd(jd, cands)}\nCandidates {i}:\n{cands[:80]}" for i, (jd, cands) in enumerate(items, 1))
+    return f"""You are an ATS expert. For EACH numbered job description below, select and rank the 35–45 MOST IMPORTANT
+skills/keywords that would impact resume parsing and keyword matching. Return a JSON object only, mapping each JD
+number (as a string) to its ranked JSON array of strings.
+
+{blocks}
+"""
+
+def parse_ranking(txt: str) -> list[str] | None:
     try:
-        try:
-            resp = client.chat.completions.create(model="gpt-4o-mini", messages=[{"role":"user","content":prompt}], temperature=0.2)
+        arr = json.loads(txt)
+    except Exception:
+        return None
+    return dedupe_list([str(x) for x in arr])[:45] if isinstance(arr, list) else None
+
+def parse_batch_ranking(txt: str, n: int) -> list[list[str] | None]:
+    try:
+        obj = json.loads(txt)
+    except Exception:
+        return [None] * n
+    if not isinstance(obj, dict): return [None] * n
+    out = []
+    for i in range(1, n + 1):
+        arr = obj.get(str(i))
+        out.append(dedupe_list([str(x) for x in arr])[:45] if isinstance(arr, list) else None)
+    return out
+
+def fallback_ranking(candidates: list[str]) -> list[str]:
+    return candidates[:40]
+
+def cached_ranking(jd_text: str, candidates: list[str]) -> list[str] | None:
+    # This exact JD's cached model ranking, if any.
+    return get_cache().get(cache_key(jd_text, candidates, MODEL, PROMPT_VERSION))
+
+def rank_keywords_with_source(jd_text: str, candidates: list[str], use_cache: bool = True,
+                              lookup: bool = True) -> tuple[list[str], str]:
+    # (ranking, where it came from: "cache", "llm" or "fallback"). Fallback rankings are never cached, and
+    # callers must not persist them either, so the next run asks the model again. lookup=False: the caller
+    # already missed cached_ranking (the answer is still cached).
+    key = cache_key(jd_text, candidates, MODEL, PROMPT_VERSION) if use_cache else None
+    if key and lookup:
+        cached = get_cache().get(key)
+        if cached is not None: return cached, "cache"
+    client = _get_openai_client()
+    if not client: return fallback_ranking(candidates), "fallback"
+    messages = [{"role":"user","content":build_rank_prompt(jd_text, candidates)}]
+    try:
+        if hasattr(client, "chat"):
+            resp = client.chat.completions.create(model=MODEL, messages=messages, temperature=0.2, timeout=REQUEST_TIMEOUT)
             txt = resp.choices[0].message.content.strip()
-        except Exception:
-            resp = client.ChatCompletion.create(model="gpt-3.5-turbo", messages=[{"role":"user","content":prompt}], temperature=0.2)
+        else:
+            # openai<1.0: module-level legacy API
+            resp = client.ChatCompletion.create(model=LEGACY_MODEL, messages=messages, temperature=0.2, request_timeout=REQUEST_TIMEOUT)
             txt = resp["choices"][0]["message"]["content"].strip()
-        arr = json.loads(txt)
-        if isinstance(arr, list):
-            return dedupe_list([str(x) for x in arr])[:45]
+        ranked = parse_ranking(txt)
+        if ranked is not None:
+            if key: get_cache().put(key, ranked)
+            return ranked, "llm"
     except Exception:
         pass
-    return candidates[:40]
+    return fallback_ranking(candidates), "fallback"
+
+def rank_keywords_with_llm(jd_text: str, candidates: list[str], use_cache: bool = True) -> list[str]:
+    return rank_keywords_with_source(jd_text, candidates, use_cache)[0]
 
 def generate_questions(jd_text: str, existing: dict | None = None, **kwargs):
+    # Questions come from the data-driven bank (data/question_bank.json); see scripts/question_bank.py.
     asked = set()
     if existing and isinstance(existing, dict):
         asked |= {h for h in existing.get("asked_prompts", [])}
-    kws = extract_keywords(jd_text)
-    qs = []
-    if any("quota" in k for k in kws):
-        qs.append("What was your average quota attainment by role (%, quarters/years)?")
-    if any("pipeline" in k for k in kws):
-        qs.append("What was your average qualified pipeline ($) and win rate?")
-    if any("government" in k or "public sector" in k for k in kws):
-        qs.append("List notable public-sector/enterprise logos relevant to this posting.")
-    if any("rfp" in k for k in kws):
-        qs.append("Provide specific RFP wins or contributions (value, year).")
-    out = []
-    for q in qs:
-        h = hashlib.sha1(q.encode("utf-8")).hexdigest()[:16]
-        if h in asked: continue
-        out.append({"id":h,"prompt":q})
-    return out
+    return get_bank().generate(jd_text, asked)
@@ -0,0 +1,148 @@
+# scripts/question_bank.py
+# Follow-up questions as data (data/question_bank.json): each question lists trigger terms, and it is asked
+# when a trigger occurs in one of the JD's top keywords. One Aho-Corasick pass over the keyword list finds every
+# trigger; an inverted index maps triggers to questions. IDs (prompt_hash of the prompt) are computed at load.
+#   python -m scripts questions <postings dir | .jsonl | .csv> [--out pending.json] | --bench
+from __future__ import annotations
+import argparse, json, random, sys, threading, time
+from pathlib import Path
+from utils import extract_keywords, prompt_hash
+from scripts.matcher import KeywordMatcher
+
+BASE = Path(__file__).resolve().parents[1]
+BANK_PATH = BASE / "data" / "question_bank.json"
+_SEP = "\n"  # joins the keywords for the single pass; triggers can't contain it, so no hit spans two keywords
+
+class QuestionBankError(ValueError):
+    pass
+
+class QuestionBank:
+    def __init__(self, questions: list[dict], source: str = "<memory>"):
+        self.source = source
+        self.questions: list[dict] = []
+        self.index: dict[str, list[int]] = {}  # lower-cased trigger -> question positions
+        for n, q in enumerate(questions, 1):
+            prompt, triggers = q.get("prompt"), q.get("triggers")
+            if not isinstance(prompt, str) or not prompt.strip():
+                raise QuestionBankError(f"{source}: question {n} has no prompt")
+            if not isinstance(triggers, list) or not triggers or not all(isinstance(t, str) and t.strip() for t in triggers):
+                raise QuestionBankError(f"{source}: question {n} needs a non-empty list of trigger terms")
+            if any(_SEP in t for t in triggers):
+                raise QuestionBankError(f"{source}: question {n} has a multi-line trigger")
+            pos = len(self.questions)
+            self.questions.append({"id": q.get("id") or prompt_hash(prompt), "prompt": prompt})
+            for t in dict.fromkeys(t.strip().lower() for t in triggers):
+                self.index.setdefault(t, []).append(pos)
+        self._matcher = KeywordMatcher(self.index)
+
+    @classmethod
+    def load(cls, path: Path = BANK_PATH) -> QuestionBank:
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except ValueError as e:
+            raise QuestionBankError(f"{path}: {e}") from e
+        return cls(data.get("questions", []) if isinstance(data, dict) else data, str(path))
+
+    def match(self, keywords: list[str], asked=()) -> list[dict]:
+        # Questions whose triggers occur in any keyword (same test as `trigger in keyword`), in bank order.
+        hits = sorted({pos for t in self._matcher.search(_SEP.join(keywords)) for pos in self.index[t]})
+        return [dict(self.questions[pos]) for pos in hits if self.questions[pos]["id"] not in asked]
+
+    def generate(self, jd_text: str, asked=()) -> list[dict]:
+        return self.match(extract_keywords(jd_text), asked)
+
+    def generate_many(self, postings, asked=()):
+        # postings: iterable of {"company", "jd_text"} (e.g. ingest.iter_postings); yields (posting, questions).
+        asked = set(asked)
+        for post in postings:
+            yield post, self.generate(post["jd_text"], asked)
+
+_BANK: QuestionBank | None = None
+_STAMP = None
+_LOCK = threading.Lock()
+
+def get_bank(path: Path = BANK_PATH) -> QuestionBank:
+    # Reloaded when the bank file's (mtime_ns, size) changes, like the template registry.
+    global _BANK, _STAMP
+    st = path.stat()
+    stamp = (str(path), st.st_mtime_ns, st.st_size)
+    if _BANK is None or stamp != _STAMP:
+        with _LOCK:
+            if _BANK is None or stamp != _STAMP: _BANK, _STAMP = QuestionBank.load(path), stamp
+    return _BANK
+
+def pending_questions(src: Path, asked=(), bank: QuestionBank | None = None) -> list[dict]:
+    # Unasked questions across a posting backlog, each once, with the postings that triggered it;
+    # most-triggered first (bank order on ties).
+    bank = bank or get_bank()
+    from scripts.ingest import iter_postings
+    found: dict[str, dict] = {}
+    for post, questions in bank.generate_many(iter_postings(src), asked):
+        for q in questions:
+            found.setdefault(q["id"], {**q, "postings": []})["postings"].append(post["company"])
+    order = {q["id"]: i for i, q in enumerate(bank.questions)}
+    return sorted(found.values(), key=lambda q: (-len(q["postings"]), order[q["id"]]))
+
+def _bench(rules: int, jds: int):
+    from scripts.bench_keywords import WORDS, synthetic_jd
+    rng = random.Random(3)
+    vocab = sorted({*WORDS, *(f"{a}{b}" for a in WORDS[:30] for b in WORDS[:30])})
+    bank = [{"prompt": f"Question {i} about {t}?", "triggers": [t, *rng.sample(vocab, 2)]}
+            for i, t in enumerate(rng.choices(vocab, k=rules))]
+    texts = [synthetic_jd(3000, seed=i) for i in range(jds)]
+    kws = [extract_keywords(t) for t in texts]
+
+    t0 = time.perf_counter()
+    qb = QuestionBank(bank)
+    build = time.perf_counter() - t0
+    # Previous approach: a full keyword scan per rule, and every prompt re-hashed per call.
+    t0 = time.perf_counter()
+    scan = [[{"id": prompt_hash(q["prompt"]), "prompt": q["prompt"]} for q in bank
+             if any(t in k for t in q["triggers"] for k in kw)] for kw in kws]
+    scan_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    indexed = [qb.match(kw) for kw in kws]
+    index_s = time.perf_counter() - t0
+    if scan != indexed: raise SystemExit("indexed questions differ from the per-rule scan")
+    t0 = time.perf_counter()
+    for t in texts: extract_keywords(t)
+    extract_s = time.perf_counter() - t0
+    print(f"{rules} rules, {jds} JDs, {sum(map(len, indexed)) / jds:.1f} questions/JD")
+    print(f"  per-rule scan    {scan_s / jds * 1000:>8.3f} ms/JD")
+    print(f"  indexed match    {index_s / jds * 1000:>8.3f} ms/JD  ({scan_s / index_s:.1f}x, index built in {build * 1000:.1f} ms)")
+    print(f"  extract_keywords {extract_s / jds * 1000:>8.3f} ms/JD  (shared by both)")
+
+def main():
+    ap = argparse.ArgumentParser(description="Pre-generate follow-up questions for a posting backlog from the question bank.")
+    ap.add_argument("src", nargs="?", help="Directory of postings, or a JSONL/CSV export")
+    ap.add_argument("--bank", default=str(BANK_PATH))
+    ap.add_argument("--all", action="store_true", help="Include questions already answered")
+    ap.add_argument("--out", help="Write the pending questions as JSON here")
+    ap.add_argument("--bench", action="store_true", help="Per-rule scan vs indexed match for 10/100/1000-rule banks")
+    args = ap.parse_args()
+
+    if args.bench:
+        for rules in (10, 100, 1000): _bench(rules, 200)
+        return
+    if not args.src: ap.error("src is required unless --bench is given")
+    src = Path(args.src)
+    if not src.exists(): print(f"Source not found: {src}"); sys.exit(1)
+    try:
+        bank = get_bank(Path(args.bank))
+    except (QuestionBankError, OSError) as e:
+        raise SystemExit(f"question bank: {e}")
+    asked = ()
+    if not args.all:
+        from scripts.answers_db import get_answers_db
+        db = get_answers_db(); db.sync_json()
+        asked = set(db.asked_ids())
+    pending = pending_questions(src, asked, bank)
+    for q in pending:
+        print(f"[{len(q['postings'])}] {q['prompt']}  ({q['id']})")
+    if not pending: print("No pending questions for these postings.")
+    if args.out:
+        Path(args.out).write_text(json.dumps(pending, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# scripts/rank_cache.py
+from __future__ import annotations
+import argparse, hashlib, json, sqlite3, threading, time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parents[1]
+CACHE_PATH = BASE / "outputs" / ".cache" / "ranking.sqlite"
+DEFAULT_TTL = 30 * 24 * 3600          # seconds
+DEFAULT_MAX_ENTRIES = 20_000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+def cache_key(jd_text: str, candidates: list[str], model: str, prompt_version: str) -> str:
+    payload = json.dumps([prompt_version, model, jd_text, list(candidates)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class RankCache:
+    def __init__(self, path: Path = CACHE_PATH, ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = self.misses = self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS ranking (key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                         "size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ranking_accessed ON ranking(accessed)")
+            conn.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def _bump(self, db: sqlite3.Connection, name: str, n: int = 1):
+        db.execute("INSERT INTO counters(name, value) VALUES(?, ?) "
+                   "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value", (name, n))
+
+    def get(self, key: str) -> list[str] | None:
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT value, created FROM ranking WHERE key = ?", (key,)).fetchone()
+            if row and now - row[1] > self.ttl:
+                db.execute("DELETE FROM ranking WHERE key = ?", (key,))
+                self.evictions += 1; self._bump(db, "evictions")
+                row = None
+            if row is None:
+                self.misses += 1; self._bump(db, "misses")
+                return None
+            db.execute("UPDATE ranking SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1; self._bump(db, "hits")
+            return json.loads(row[0])
+
+    def put(self, key: str, value: list[str]):
+        blob = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO ranking(key, value, size, created, accessed) VALUES(?, ?, ?, ?, ?)",
+                       (key, blob, len(blob.encode("utf-8")), now, now))
+            self._evict(db, now)
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        removed = db.execute("DELETE FROM ranking WHERE created < ?", (now - self.ttl,)).rowcount
+        count, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ranking").fetchone()
+        while count > self.max_entries or total > self.max_bytes:
+            # Drop least-recently-used rows until back under both limits.
+            n = count - self.max_entries if count > self.max_entries else 1
+            rows = db.execute("SELECT key, size FROM ranking ORDER BY accessed LIMIT ?", (n,)).fetchall()
+            if not rows: break
+            db.executemany("DELETE FROM ranking WHERE key = ?", [(k,) for k, _ in rows])
+            removed += len(rows); count -= len(rows); total -= sum(s for _, s in rows)
+        if removed:
+            self.evictions += removed; self._bump(db, "evictions", removed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            db = self._db()
+            count, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ranking").fetchone()
+            lifetime = dict(db.execute("SELECT name, value FROM counters").fetchall())
+        return {"entries": count, "bytes": total,
+                "session": {"hits": self.hits, "misses": self.misses, "evictions": self.evictions},
+                "lifetime": {k: lifetime.get(k, 0) for k in ("hits", "misses", "evictions")}}
+
+    def clear(self):
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM ranking"); db.execute("DELETE FROM counters")
+
+_default: RankCache | None = None
+
+def get_cache() -> RankCache:
+    global _default
+    if _default is None: _default = RankCache()
+    return _default
+
+def main():
+    ap = argparse.ArgumentParser(description="Inspect or clear the LLM keyword-ranking cache.")
+    ap.add_argument("--clear", action="store_true", help="Delete all cached rankings and counters")
+    args = ap.parse_args()
+    cache = get_cache()
+    if args.clear: cache.clear()
+    print(json.dumps({"path": str(cache.path), **cache.stats()}, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+# scripts/rank_client.py
+from __future__ import annotations
+import abc, argparse, ast, asyncio, json, os, random, re, threading, time, urllib.error, urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from scripts.ingest import jd_keywords
+from scripts.prompt_engine import (
+    MODEL, PROMPT_VERSION, REQUEST_TIMEOUT, build_rank_prompt, build_batch_rank_prompt,
+    parse_ranking, parse_batch_ranking, fallback_ranking
+)
+from scripts.rank_cache import cache_key, get_cache
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+class BackendError(Exception):
+    # status is the HTTP status, or None for timeouts / connection failures. Retried: those two, 429 and 5xx;
+    # never a malformed response (retryable=False), which falls back at once.
+    def __init__(self, status: int | None, message: str = "", retry_after: float | None = None,
+                 retryable: bool | None = None):
+        super().__init__(f"{status}: {message}" if status else message)
+        self.status = status
+        self.retry_after = retry_after
+        self.retryable = (status is None or status in RETRY_STATUS) if retryable is None else retryable
+
+# What one failed ranking may raise: it falls back for that JD only, never for the rest of the gather().
+_RANK_ERRORS = (BackendError, ValueError, KeyError, IndexError, TypeError)
+
+# --- backends: anything with `async complete(prompt, model, timeout) -> str` ---
+
+class RankingBackend(abc.ABC):
+    name = "base"
+    @abc.abstractmethod
+    async def complete(self, prompt: str, model: str, timeout: float) -> str: ...
+
+class OpenAIBackend(RankingBackend):
+    name = "openai"
+    def __init__(self, api_key: str | None = None):
+        from openai import AsyncOpenAI
+        # Retries are handled by AsyncRanker so they share its jitter and bookkeeping.
+        self._client = AsyncOpenAI(api_key=api_key or os.environ.get("OPENAI_API_KEY"), max_retries=0)
+
+    async def complete(self, prompt: str, model: str, timeout: float) -> str:
+        try:
+            resp = await self._client.chat.completions.create(
+                model=model, messages=[{"role":"user","content":prompt}], temperature=0.2, timeout=timeout)
+        except Exception as e:
+            raise BackendError(getattr(e, "status_code", None), str(e)) from e
+        try:
+            return resp.choices[0].message.content.strip()
+        except (AttributeError, IndexError, TypeError) as e:
+            raise BackendError(None, f"malformed response: {e!r}", retryable=False) from e
+
+class HTTPBackend(RankingBackend):
+    # Any OpenAI-compatible /chat/completions endpoint (including the stub server below), stdlib only.
+    name = "http"
+    def __init__(self, base_url: str, api_key: str | None = None):
+        self.url = base_url.rstrip("/") + "/chat/completions"
+        self.api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+
+    def _post(self, payload: dict, timeout: float) -> dict:
+        req = urllib.request.Request(self.url, data=json.dumps(payload).encode("utf-8"), headers={
+            "Content-Type": "application/json", "Authorization": f"Bearer {self.api_key}"})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as r:
+                return json.loads(r.read())
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get("Retry-After")
+            try: retry_after = float(retry_after) if retry_after else None
+            except ValueError: retry_after = None
+            raise BackendError(e.code, str(e.reason), retry_after) from e
+        except (urllib.error.URLError, OSError) as e:
+            raise BackendError(None, str(e)) from e
+
+    async def complete(self, prompt: str, model: str, timeout: float) -> str:
+        payload = {"model": model, "messages": [{"role":"user","content":prompt}], "temperature": 0.2}
+        try:
+            data = await asyncio.to_thread(self._post, payload, timeout)
+            return data["choices"][0]["message"]["content"].strip()
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+            # A 200 that is not JSON, or JSON without a message, fails this JD only.
+            raise BackendError(None, f"malformed response: {e!r}", retryable=False) from e
+
+_CANDIDATES = re.compile(r"^Candidates(?: (\d+))?:\n(\[.*\])$", re.M)
+
+def stub_completion(prompt: str) -> str:
+    # Deterministic answer for a ranking prompt: each JD's candidates in their given (frequency) order.
+    found = [(m.group(1), ast.literal_eval(m.group(2))) for m in _CANDIDATES.finditer(prompt)]
+    if found and found[0][0] is not None:
+        return json.dumps({n: list(c[:40]) for n, c in found})
+    return json.dumps(list(found[-1][1][:40]) if found else [])
+
+class StubBackend(RankingBackend):
+    name = "stub"
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency, self.jitter, self.error_rate = latency, jitter, error_rate
+        self._rng = random.Random(seed)
+
+    async def complete(self, prompt: str, model: str, timeout: float) -> str:
+        await asyncio.sleep(self.latency + self._rng.uniform(0, self.jitter))
+        if self._rng.random() < self.error_rate:
+            raise BackendError(self._rng.choice([429, 503]), "stub injected failure")
+        return stub_completion(prompt)
+
+def start_stub_server(host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, error_rate: float = 0.0,
+                      seed: int = 0) -> ThreadingHTTPServer:
+    # Local OpenAI-compatible server for offline load tests; port 0 picks a free port (server.server_port).
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+            time.sleep(latency)
+            with lock: fail = rng.random() < error_rate
+            if fail:
+                data = json.dumps({"error": {"message": "stub rate limit"}}).encode("utf-8")
+                self.send_response(429); self.send_header("Retry-After", "0")
+            else:
+                prompt = body.get("messages", [{}])[-1].get("content", "")
+                data = json.dumps({"choices": [{"message": {"role": "assistant", "content": stub_completion(prompt)}}]}).encode("utf-8")
+                self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, fmt, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def make_backend(name: str | None = None, base_url: str | None = None, **stub_opts) -> RankingBackend | None:
+    name = name or ("http" if (base_url or os.environ.get("RESUME_RANK_BASE_URL")) else "openai")
+    if name == "stub": return StubBackend(**stub_opts)
+    if name == "http": return HTTPBackend(base_url or os.environ["RESUME_RANK_BASE_URL"])
+    if not os.environ.get("OPENAI_API_KEY"): return None
+    try:
+        return OpenAIBackend()
+    except Exception:
+        return None
+
+# --- client ---
+
+class AsyncRanker:
+    def __init__(self, backend: RankingBackend, concurrency: int = 8, timeout: float = REQUEST_TIMEOUT,
+                 retries: int = 3, backoff: float = 0.5, max_backoff: float = 8.0, model: str = MODEL,
+                 use_cache: bool = True, seed: int | None = None):
+        self.backend = backend
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff, self.max_backoff = backoff, max_backoff
+        self.model = model
+        self.use_cache = use_cache
+        self._sem = asyncio.Semaphore(concurrency)
+        self._rng = random.Random(seed)
+        self.stats = {"requests": 0, "retries": 0, "timeouts": 0, "failures": 0, "cache_hits": 0}
+        self.latencies: list[float] = []
+
+    async def _call(self, prompt: str) -> str:
+        attempt = 0
+        while True:
+            async with self._sem:
+                self.stats["requests"] += 1
+                t0 = time.perf_counter()
+                try:
+                    txt = await asyncio.wait_for(self.backend.complete(prompt, self.model, self.timeout), self.timeout)
+                    self.latencies.append(time.perf_counter() - t0)
+                    return txt
+                except asyncio.TimeoutError:
+                    self.stats["timeouts"] += 1
+                    err = BackendError(None, f"timed out after {self.timeout}s")
+                except BackendError as e:
+                    err = e
+            if attempt >= self.retries or not err.retryable:
+                raise err
+            # Full jitter: uniform(0, min(cap, base * 2^attempt)), unless the server said when to come back.
+            delay = err.retry_after if err.retry_after is not None else \
+                self._rng.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            attempt += 1
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    def _cached(self, jd_text: str, candidates: list[str]) -> tuple[str | None, list[str] | None]:
+        if not self.use_cache: return None, None
+        key = cache_key(jd_text, candidates, self.model, PROMPT_VERSION)
+        hit = get_cache().get(key)
+        if hit is not None: self.stats["cache_hits"] += 1
+        return key, hit
+
+    async def rank(self, jd_text: str, candidates: list[str] | None = None) -> list[str]:
+        candidates = jd_keywords(jd_text) if candidates is None else candidates
+        key, hit = self._cached(jd_text, candidates)
+        if hit is not None: return hit
+        try:
+            ranked = parse_ranking(await self._call(build_rank_prompt(jd_text, candidates)))
+        except _RANK_ERRORS:
+            self.stats["failures"] += 1
+            ranked = None
+        if ranked is None: return fallback_ranking(candidates)
+        if key: get_cache().put(key, ranked)
+        return ranked
+
+    async def rank_many(self, jds: list[str], batch_size: int = 1) -> list[list[str]]:
+        # batch_size > 1 packs that many JDs into one prompt; results are cached per JD either way.
+        items = [(jd, jd_keywords(jd)) for jd in jds]
+        if batch_size <= 1:
+            return list(await asyncio.gather(*(self.rank(jd, c) for jd, c in items)))
+        results: list[list[str] | None] = [None] * len(items)
+        keys: list[str | None] = [None] * len(items)
+        misses = []
+        for i, (jd, c) in enumerate(items):
+            keys[i], hit = self._cached(jd, c)
+            if hit is not None: results[i] = hit
+            else: misses.append(i)
+
+        async def run_group(group: list[int]):
+            sub = [items[i] for i in group]
+            try:
+                parsed = parse_batch_ranking(await self._call(build_batch_rank_prompt(sub)), len(sub))
+            except _RANK_ERRORS:
+                self.stats["failures"] += 1
+                parsed = [None] * len(sub)
+            for i, ranked in zip(group, parsed):
+                if ranked is None:
+                    results[i] = fallback_ranking(items[i][1])
+                else:
+                    results[i] = ranked
+                    if keys[i]: get_cache().put(keys[i], ranked)
+
+        await asyncio.gather(*(run_group(misses[i:i + batch_size]) for i in range(0, len(misses), batch_size)))
+        return results
+
+    def summary(self) -> dict:
+        lat = sorted(self.latencies)
+        pct = lambda q: round(lat[min(len(lat) - 1, int(len(lat) * q))] * 1000, 1) if lat else None
+        return {**self.stats, "p50_ms": pct(0.5), "p95_ms": pct(0.95)}
+
+# --- CLI ---
+
+async def _loadtest(args) -> dict:
+    from scripts.bench_keywords import synthetic_jd
+    server = None
+    if args.backend == "http" and not args.base_url:
+        server = start_stub_server(latency=args.latency, error_rate=args.error_rate)
+        args.base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    backend = make_backend(args.backend, args.base_url, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate)
+    if backend is None: raise SystemExit("No backend available (set OPENAI_API_KEY or use --backend stub/http)")
+    ranker = AsyncRanker(backend, concurrency=args.concurrency, timeout=args.timeout, retries=args.retries,
+                         use_cache=False, seed=0)
+    jds = [synthetic_jd(args.jd_size, seed=i) for i in range(args.n)]
+    t0 = time.perf_counter()
+    await ranker.rank_many(jds, batch_size=args.batch_size)
+    elapsed = time.perf_counter() - t0
+    if server: server.shutdown()
+    return {"backend": backend.name, "jds": args.n, "batch_size": args.batch_size, "concurrency": args.concurrency,
+            "seconds": round(elapsed, 3), "jds_per_second": round(args.n / elapsed, 1), **ranker.summary()}
+
+def main():
+    ap = argparse.ArgumentParser(description="Async keyword-ranking client: offline stub server and ranking load tests.")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    st = sub.add_parser("stub-server", help="Run a deterministic OpenAI-compatible stub on localhost")
+    st.add_argument("--port", type=int, default=8790)
+    st.add_argument("--latency", type=float, default=0.05)
+    st.add_argument("--error-rate", type=float, default=0.0)
+    lt = sub.add_parser("loadtest", help="Rank N synthetic JDs and report throughput")
+    lt.add_argument("--backend", choices=["stub","http","openai"], default="stub",
+                    help="http without --base-url spins up a local stub server")
+    lt.add_argument("--base-url", default=None)
+    lt.add_argument("--n", type=int, default=200)
+    lt.add_argument("--jd-size", type=int, default=4000)
+    lt.add_argument("--concurrency", type=int, default=16)
+    lt.add_argument("--batch-size", type=int, default=1)
+    lt.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT)
+    lt.add_argument("--retries", type=int, default=3)
+    lt.add_argument("--latency", type=float, default=0.05)
+    lt.add_argument("--jitter", type=float, default=0.0)
+    lt.add_argument("--error-rate", type=float, default=0.0)
+    args = ap.parse_args()
+
+    if args.cmd == "stub-server":
+        server = start_stub_server(port=args.port, latency=args.latency, error_rate=args.error_rate)
+        print(f"Stub ranking server on http://127.0.0.1:{server.server_port}/v1 (Ctrl+C to stop)")
+        try:
+            while True: time.sleep(3600)
+        except KeyboardInterrupt:
+            server.shutdown()
+    else:
+        print(json.dumps(asyncio.run(_loadtest(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
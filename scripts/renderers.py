@@ -0,0 +1,233 @@
+# scripts/renderers.py
+# One parsed document model for the composed markdown, rendered to every output format from the same blocks:
+# DOCX (styled paragraphs via docx_factory), PDF (written directly, pure Python: standard Helvetica fonts, no
+# embedding, Flate-compressed pages) and plain text. A block is (kind, level, spans) with kind one of
+# title | contact | heading | bullet | para | blank and spans ((text, bold), ...).
+#   python -m scripts bench-formats [-n 50] [--jd-file data/job_posting.txt] [--out DIR]
+from __future__ import annotations
+import argparse, re, time, zlib
+from pathlib import Path
+from utils import to_ascii
+
+BASE = Path(__file__).resolve().parents[1]
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_BULLET = re.compile(r"^[-*]\s+(.*)$")
+
+def _spans(text: str) -> tuple[tuple[str, bool], ...]:
+    # **bold** runs; an unbalanced ** is kept as literal text.
+    parts = text.split("**")
+    if len(parts) % 2 == 0: return ((text, False),)
+    return tuple((p, i % 2 == 1) for i, p in enumerate(parts) if p)
+
+def parse_markdown(md: str, name: str, contact: str) -> list[tuple]:
+    blocks = [("title", 0, ((name, True),)), ("contact", 0, ((contact, False),)), ("blank", 0, ())]
+    for raw in (md or "").splitlines():
+        line = to_ascii(raw.rstrip())
+        if not line.strip(): blocks.append(("blank", 0, ())); continue
+        if m := _HEADING.match(line): blocks.append(("heading", len(m.group(1)), _spans(m.group(2).strip())))
+        elif m := _BULLET.match(line): blocks.append(("bullet", 0, _spans(m.group(1))))
+        else: blocks.append(("para", 0, _spans(line)))
+    return blocks
+
+def block_text(block: tuple) -> str:
+    return "".join(t for t, _ in block[2])
+
+def text_lines(blocks: list[tuple]) -> list[str]:
+    # One entry per DOCX paragraph: what python-docx's paragraph.text returns for the rendered document.
+    return [block_text(b) for b in blocks]
+
+# --- renderers: format -> (blocks -> bytes, file suffix) ---
+
+RENDERERS: dict[str, tuple] = {}
+
+def register_renderer(fmt: str, suffix: str):
+    def deco(fn):
+        RENDERERS[fmt] = (fn, suffix)
+        return fn
+    return deco
+
+def render(blocks: list[tuple], fmt: str) -> bytes:
+    if fmt not in RENDERERS: raise ValueError(f"unknown output format: {fmt} (expected one of {', '.join(RENDERERS)})")
+    return RENDERERS[fmt][0](blocks)
+
+_DOCX_STYLES = {"title": "Title", "bullet": "ListBullet"}  # python-docx default template style ids
+
+def render_docx(blocks: list[tuple], template: Path | None = None):
+    # The in-memory Document (build lint reads it before it is serialized once).
+    from scripts.docx_factory import get_factory
+    styled = [(f"Heading{min(level, 9)}" if kind == "heading" else _DOCX_STYLES.get(kind), spans)
+              for kind, level, spans in blocks]
+    return get_factory(template).render_styled(styled)
+
+@register_renderer("docx", ".docx")
+def docx_renderer(blocks: list[tuple]) -> bytes:
+    from scripts.docx_factory import docx_bytes
+    return docx_bytes(render_docx(blocks))
+
+@register_renderer("txt", ".txt")
+def txt_renderer(blocks: list[tuple]) -> bytes:
+    out = []
+    for kind, level, spans in blocks:
+        text = "".join(t for t, _ in spans)
+        if kind == "heading": out.append(text.upper() if level == 1 else text)
+        elif kind == "bullet": out.append(f"- {text}")
+        else: out.append(text)
+    return ("\n".join(out).strip() + "\n").encode("utf-8")
+
+# --- PDF ---
+# Advance widths (1/1000 em) of Helvetica and Helvetica-Bold for chr(32)..chr(126), from the Adobe core-font
+# AFMs; anything else is measured at 556. Only used to wrap lines, the viewer supplies the glyphs.
+_W_REGULAR = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278, 556, 556, 556, 556,
+    556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556, 1015, 667, 667, 722, 722, 667, 611, 778,
+    722, 278, 500, 667, 556, 833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278,
+    278, 278, 469, 556, 333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584)
+_W_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278, 556, 556, 556, 556,
+    556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611, 975, 722, 722, 722, 722, 667, 611, 778,
+    722, 278, 556, 722, 611, 833, 722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333,
+    278, 333, 584, 556, 333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584)
+_PAGE_W, _PAGE_H, _MARGIN = 612, 792, 54  # US Letter, 0.75in margins
+_BULLET_GLYPH, _BULLET_INDENT = b"\x95", 14  # WinAnsi bullet
+# kind -> (font size, leading, space before)
+_LAYOUT = {"title": (18, 22, 0), "contact": (10, 13, 0), "para": (10.5, 13.5, 0), "bullet": (10.5, 13.5, 0),
+           "heading": (13, 16, 6), "subheading": (11, 14, 4), "blank": (10.5, 6, 0)}
+
+def _width(text: str, bold: bool, size: float) -> float:
+    table = _W_BOLD if bold else _W_REGULAR
+    return sum(table[o - 32] if 32 <= (o := ord(c)) <= 126 else 556 for c in text) * size / 1000
+
+def _pdf_str(text: str) -> bytes:
+    data = text.encode("cp1252", "replace")
+    return b"(" + data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+def _wrap(spans, size: float, width: float) -> list[list[tuple[str, bool]]]:
+    # Greedy word wrap over bold/regular spans; a word may straddle spans ("**Domains:**x"). Each line is
+    # merged into (text, bold) runs. A word wider than the line is left to overflow on its own line.
+    words: list[list[tuple[str, bool]]] = [[]]
+    for text, bold in spans:
+        for i, piece in enumerate(text.split(" ")):
+            if i: words.append([])
+            if piece: words[-1].append((piece, bold))
+    space = _width(" ", False, size)
+    lines, line, used = [], [], 0.0
+    for word in filter(None, words):
+        w = sum(_width(t, b, size) for t, b in word)
+        if line and used + space + w > width:
+            lines.append(line); line, used = [], 0.0
+        if line: line.append((" ", line[-1][1])); used += space
+        line.extend(word); used += w
+    if line: lines.append(line)
+    runs = []
+    for line in lines:
+        merged: list[tuple[str, bool]] = []
+        for t, b in line:
+            if merged and merged[-1][1] == b: merged[-1] = (merged[-1][0] + t, b)
+            else: merged.append((t, b))
+        runs.append(merged)
+    return runs
+
+def _pdf_pages(blocks: list[tuple]) -> list[bytes]:
+    # Content stream per page: lines are set top-down and a new page starts when the next line won't fit.
+    pages, ops, y = [], [], _PAGE_H - _MARGIN
+    def new_page():
+        nonlocal ops, y
+        if ops: pages.append(b"\n".join(ops)); ops = []
+        y = _PAGE_H - _MARGIN
+    for kind, level, spans in blocks:
+        size, leading, before = _LAYOUT["subheading" if kind == "heading" and level > 1 else kind]
+        if kind == "blank":
+            if ops: y -= leading
+            continue
+        x = _MARGIN + (_BULLET_INDENT if kind == "bullet" else 0)
+        lines = _wrap(spans, size, _PAGE_W - _MARGIN - x)
+        # A heading stays with the line after it; short paragraphs and bullets are not split across pages.
+        if y - before - leading * (2 if kind == "heading" else min(len(lines), 3)) < _MARGIN: new_page()
+        if ops: y -= before
+        for n, runs in enumerate(lines):
+            if y - leading < _MARGIN: new_page()
+            y -= leading
+            parts = [b"BT %.2f %.2f Td" % (x, y)]
+            for text, bold in runs: parts.append(b"/F%d %g Tf " % (2 if bold or kind == "heading" else 1, size) + _pdf_str(text) + b" Tj")
+            ops.append(b" ".join(parts) + b" ET")
+            if kind == "bullet" and n == 0:
+                ops.append(b"BT /F1 %g Tf %.2f %.2f Td (%s) Tj ET" % (size, _MARGIN + 3, y, _BULLET_GLYPH))
+        if kind == "heading" and level == 1:
+            y -= 3
+            ops.append(b"0.5 w %d %.2f m %d %.2f l S" % (_MARGIN, y, _PAGE_W - _MARGIN, y))
+    new_page()
+    return pages or [b""]
+
+@register_renderer("pdf", ".pdf")
+def pdf_renderer(blocks: list[tuple]) -> bytes:
+    # PDF 1.4 with the base-14 Helvetica fonts (WinAnsiEncoding): no font files, no third-party packages.
+    # No timestamps or IDs, so the same blocks always give the same bytes.
+    pages = _pdf_pages(blocks)
+    title = block_text(blocks[0]) if blocks else ""
+    objs = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (6 + 2 * i) for i in range(len(pages)))
+        + b"] /Count %d >>" % len(pages),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+        b"<< /Title " + _pdf_str(title) + b" >>",
+    ]
+    for i, content in enumerate(pages):
+        objs.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+                    b"/Contents %d 0 R >>" % (_PAGE_W, _PAGE_H, 7 + 2 * i))
+        data = zlib.compress(content)
+        objs.append(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(data) + data + b"\nendstream")
+    out, offsets = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"), []
+    for n, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % n + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % off for off in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R /Info 5 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+    return bytes(out)
+
+# --- benchmark ---
+
+def _per_doc_ms(fn, n: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(n): fn()
+    return (time.perf_counter() - t0) / n * 1000
+
+def main():
+    ap = argparse.ArgumentParser(description="Cost per output format: parse the composed markdown once, then render DOCX, PDF and TXT.")
+    ap.add_argument("-n", type=int, default=50, help="Documents per measurement")
+    ap.add_argument("--jd-file", default=str(BASE / "data" / "job_posting.txt"))
+    ap.add_argument("--style", default="cv")
+    ap.add_argument("--out", help="Also write one file per format to this directory")
+    args = ap.parse_args()
+
+    from scripts.build_resume import _load_profile, _load_answers, _compose_markdown, _contact_line
+    from scripts.docx_factory import docx_bytes
+    profile, answers = _load_profile(), _load_answers()
+    jd = Path(args.jd_file).read_text(encoding="utf-8") if Path(args.jd_file).exists() else ""
+    md, _ = _compose_markdown(profile, answers, jd, style=args.style, use_cache=False)
+    parse = lambda: parse_markdown(md, profile.name, _contact_line(profile))
+    blocks = parse()
+    docx_bytes(render_docx(blocks))  # warm the DOCX factory (once per process)
+
+    outputs = {fmt: render(blocks, fmt) for fmt in RENDERERS}
+    doc = render_docx(blocks)
+    rows = [("parse markdown", _per_doc_ms(parse, args.n), None),
+            ("docx render", _per_doc_ms(lambda: render_docx(blocks), args.n), None),
+            ("docx serialize", _per_doc_ms(lambda: docx_bytes(doc), args.n), None)]
+    rows += [(f"{fmt} total", _per_doc_ms(lambda fmt=fmt: render(blocks, fmt), args.n), len(outputs[fmt])) for fmt in RENDERERS]
+    rows.append(("all formats", _per_doc_ms(lambda: [render(parse(), fmt) for fmt in RENDERERS], args.n), sum(map(len, outputs.values()))))
+    print(f"{len(blocks)} blocks/doc, {args.n} docs per row")
+    for label, ms, size in rows:
+        print(f"{label:<16} {ms:8.3f} ms/doc" + (f"  {size:>7} B" if size is not None else ""))
+    if args.out:
+        out = Path(args.out); out.mkdir(parents=True, exist_ok=True)
+        for fmt, data in outputs.items():
+            (out / f"resume_{args.style}{RENDERERS[fmt][1]}").write_bytes(data)
+        print(f"Wrote {len(outputs)} files to {out}")
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,16 @@
 from __future__ import annotations
 from pathlib import Path
-import json, sys, datetime
-from utils import slugify, prompt_hash, rewrite_bullet, dedupe_list
+import argparse, json, sys, datetime
+from utils import slugify, rewrite_bullet
+from scripts.answers_db import get_answers_db
 from scripts.prompt_engine import generate_questions
+from scripts.question_bank import pending_questions
 from scripts.build_resume import build_pair
 
 BASE = Path(__file__).resolve().parents[1]
 JD_PATH = BASE / "data" / "job_posting.txt"
-ANSWERS_PATH = BASE / "profile" / "answers.json"
 PROFILE_PATH = BASE / "profile" / "profile.json"
 
-def _load_answers() -> dict:
-    if ANSWERS_PATH.exists(): data = json.loads(ANSWERS_PATH.read_text(encoding="utf-8"))
-    else: data = {}
-    data.setdefault("global", {"extra_keywords": [], "summary_additions": []})
-    data.setdefault("roles", {}); data.setdefault("asked", {})
-    return data
-
-def _save_answers(data: dict) -> None:
-    g = data.get("global", {})
-    g["extra_keywords"] = dedupe_list([x.strip() for x in g.get("extra_keywords", []) if x and x.strip()])
-    g["summary_additions"] = dedupe_list([x.strip() for x in g.get("summary_additions", []) if x and x.strip()])
-    for rk, r in data.get("roles", {}).items():
-        r["extra_bullets"] = dedupe_list([x.strip() for x in r.get("extra_bullets", []) if x and x.strip()])
-    ANSWERS_PATH.write_text(json.dumps(data, indent=2), encoding="utf-8")
-
 def _prompt_multiline(prompt: str) -> str:
     print(prompt + "\n(Type END on its own line to finish.)")
     lines = []
@@ -34,7 +20,38 @@ def _prompt_multiline(prompt: str) -> str:
         lines.append(line)
     return "\n".join(lines).strip()
 
+def _ask(db, questions: list[dict], company_slug: str):
+    global_kw = db.global_items("extra_keywords")
+    for q in questions:
+        pid = q["id"]
+        if db.get_asked(pid) is not None: continue
+        print("\n" + q["prompt"])
+        resp = input("> ").strip()
+        if not resp: continue
+        rewritten = rewrite_bullet(resp, is_current=False, inject_kw=global_kw)
+        entry = {"prompt": q["prompt"], "answer": rewritten, "type":"freeform", "company_used": company_slug, "timestamp": datetime.datetime.utcnow().isoformat() + "Z"}
+        db.add_asked(pid, entry, summary_addition=rewritten)
+
+def _answer_backlog(src: Path):
+    # Every question the backlog's postings trigger, asked once up front, so later builds need no Q&A.
+    db = get_answers_db()
+    db.sync_json()
+    pending = pending_questions(src, set(db.asked_ids()))
+    if not pending: print("No pending questions for these postings."); return
+    print(f"\n=== {len(pending)} question(s) across the backlog (only NEW items will be saved) ===")
+    for q in pending:
+        print(f"\n[{len(q['postings'])} posting(s): {', '.join(q['postings'][:5])}{'…' if len(q['postings']) > 5 else ''}]")
+        _ask(db, [q], slugify(q["postings"][0]))
+
 def main():
+    ap = argparse.ArgumentParser(description="Paste a JD, answer focused follow-up questions, and build resume + CV.")
+    ap.add_argument("--backlog", help="Instead: answer the questions for every posting in a directory or JSONL/CSV export")
+    args = ap.parse_args()
+    if args.backlog:
+        src = Path(args.backlog)
+        if not src.exists(): print(f"Source not found: {src}"); sys.exit(1)
+        _answer_backlog(src); return
+
     (BASE / "data").mkdir(exist_ok=True)
 
     print("\n=== Paste job posting ===")
@@ -54,26 +71,18 @@ def main():
     except Exception as e:
         print(f"Could not read profile.json: {e}"); sys.exit(1)
 
-    answers = _load_answers()
+    # Each answer is its own insert into the answers database: nothing is lost if another session saves
+    # meanwhile, and saving doesn't rewrite the whole history.
+    db = get_answers_db()
+    db.sync_json()
 
     print("\nGenerating focused questions (only if relevant)…")
-    existing = {"asked_prompts": [k for k in answers.get("asked", {}).keys()]}
+    existing = {"asked_prompts": db.asked_ids()}
     questions = generate_questions(jd_text, existing)
 
     if questions:
         print("\n=== Answer the following (only NEW items will be saved) ===")
-        global_kw = answers.get("global", {}).get("extra_keywords", [])
-        for q in questions:
-            pid = q["id"]
-            if pid in answers["asked"]: continue
-            print("\n" + q["prompt"])
-            resp = input("> ").strip()
-            if not resp: continue
-            rewritten = rewrite_bullet(resp, is_current=False, inject_kw=global_kw)
-            answers["asked"][pid] = {"prompt": q["prompt"], "answer": rewritten, "type":"freeform", "company_used": company_slug, "timestamp": datetime.datetime.utcnow().isoformat() + "Z"}
-            answers["global"].setdefault("summary_additions", []).append(rewritten)
-
-    _save_answers(answers)
+        _ask(db, questions, company_slug)
 
     print("\nBuilding primary resume + CV…")
     result = build_pair(primary_style=style, company_slug=company_slug, jd_text=jd_text)
@@ -0,0 +1,198 @@
+# scripts/serve.py
+# Resident build server: python -m scripts.serve [--host 127.0.0.1] [--port 8765]
+from __future__ import annotations
+import argparse, base64, json, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from utils import slugify
+from scripts import build_resume
+from scripts.preview_job_alignment import preview_alignment
+from scripts.rank_cache import get_cache
+
+BASE = Path(__file__).resolve().parents[1]
+WATCHED = {
+    "profile": BASE / "profile" / "profile.json",
+    "answers": BASE / "profile" / "answers.json",
+}
+
+class WarmState:
+    # Profile and answers stay in memory; they are reloaded only when a watched file's mtime changes or
+    # the answers database records a change.
+    # Templates live in the shared TemplateRegistry, which recompiles a template when its file changes.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stamp: tuple = ()
+        self.profile = None
+        self.answers = None
+        self.templates = build_resume._load_templates()
+        self.reloads = 0
+        self.refresh()
+
+    def _current_stamp(self) -> tuple:
+        stamps = []
+        for path in WATCHED.values():
+            if path.exists(): stamps.append((str(path), path.stat().st_mtime_ns))
+        stamps.append(("answers-db", build_resume.ANSWERS_STORE.stamp()))
+        return tuple(stamps)
+
+    def refresh(self):
+        stamp = self._current_stamp()
+        if stamp == self._stamp: return
+        with self._lock:
+            if stamp == self._stamp: return
+            self.profile = build_resume._load_profile()
+            self.answers = build_resume._load_answers()
+            self._stamp = stamp
+            self.reloads += 1
+
+class LatencyStats:
+    def __init__(self, keep: int = 1000):
+        self._lock = threading.Lock()
+        self._keep = keep
+        self._samples: dict[str, list[float]] = {}
+        self._counts: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+
+    def record(self, endpoint: str, ms: float, ok: bool):
+        with self._lock:
+            samples = self._samples.setdefault(endpoint, [])
+            samples.append(ms)
+            if len(samples) > self._keep: del samples[0]
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+            if not ok: self._errors[endpoint] = self._errors.get(endpoint, 0) + 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            out = {}
+            for endpoint, samples in self._samples.items():
+                s = sorted(samples)
+                out[endpoint] = {
+                    "count": self._counts[endpoint],
+                    "errors": self._errors.get(endpoint, 0),
+                    "mean_ms": round(sum(s) / len(s), 2),
+                    "p50_ms": round(s[len(s) // 2], 2),
+                    "p95_ms": round(s[min(len(s) - 1, int(len(s) * 0.95))], 2),
+                    "max_ms": round(s[-1], 2),
+                }
+            return out
+
+STATE: WarmState | None = None
+STATS = LatencyStats()
+STARTED = time.time()
+
+def _styles(value) -> list[str]:
+    # "all", one style name, or a list of style names; anything else is a 400.
+    if value == "all": return list(build_resume.STYLES)
+    if isinstance(value, str): value = [value]
+    if not isinstance(value, list) or not all(isinstance(s, str) for s in value):
+        raise ValueError('styles must be a style name, a list of style names or "all"')
+    unknown = [s for s in value if s.lower() not in build_resume.STYLES]
+    if unknown: raise ValueError(f"unknown style(s): {', '.join(unknown)} (expected {', '.join(build_resume.STYLES)})")
+    return value
+
+def handle_build(body: dict) -> dict:
+    jd_text = body.get("jd_text") or ""
+    if not jd_text.strip(): raise ValueError("jd_text is required")
+    styles = _styles(body.get("styles") or [body.get("style", "balanced"), "cv"])
+    write = bool(body.get("write", True))
+    reuse = float(body.get("reuse_threshold", build_resume.DEFAULT_THRESHOLD)) if body.get("reuse", True) else None
+    results = build_resume.build_all_styles(styles, body.get("company", "generic"), jd_text,
+                                            profile=STATE.profile, answers=STATE.answers, templates=STATE.templates,
+                                            use_cache=bool(body.get("use_cache", True)), write=write,
+                                            force=bool(body.get("force", False)), formats=body.get("formats") or (),
+                                            reuse=reuse)
+    if not write:
+        for block in results.values():
+            for key in [k for k in block if k.endswith("_bytes")]:
+                block[f"{key[:-len('_bytes')]}_base64"] = base64.b64encode(block.pop(key)).decode("ascii")
+    return {"slug": slugify(body.get("company", "generic")), "artifacts": results}
+
+def handle_preview(body: dict) -> dict:
+    jd_text = body.get("jd_text") or ""
+    if not jd_text.strip(): raise ValueError("jd_text is required")
+    report = preview_alignment(STATE.profile, jd_text)
+    report["summary_additions"] = STATE.answers.global_.summary_additions[:10]
+    return report
+
+def handle_lint(body: dict) -> dict:
+    if body.get("docx_base64"):
+        source = base64.b64decode(body["docx_base64"])
+    elif body.get("path"):
+        source = Path(body["path"])
+        if not source.is_absolute(): source = BASE / source
+        if not source.exists(): raise ValueError(f"no such file: {body['path']}")
+    else:
+        raise ValueError("path or docx_base64 is required")
+    return {"issues": build_resume._lint_docx(source, profile=STATE.profile)}
+
+ROUTES = {"/build": handle_build, "/preview": handle_preview, "/lint": handle_lint}
+
+class Handler(BaseHTTPRequestHandler):
+    server_version = "ResumeCreator/3"
+
+    def _send(self, status: int, payload: dict, ms: float):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("X-Latency-Ms", f"{ms:.2f}")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        t0 = time.perf_counter()
+        if self.path == "/health":
+            payload = {"ok": True, "uptime_s": round(time.time() - STARTED, 1), "reloads": STATE.reloads}
+        elif self.path == "/stats":
+            payload = {"latency": STATS.summary(), "ranking_cache": get_cache().stats(), "templates": STATE.templates.stats()}
+        else:
+            return self._send(404, {"error": f"unknown endpoint {self.path}"}, 0.0)
+        self._send(200, payload, (time.perf_counter() - t0) * 1000)
+
+    def do_POST(self):
+        t0 = time.perf_counter()
+        route = ROUTES.get(self.path)
+        if route is None:
+            return self._send(404, {"error": f"unknown endpoint {self.path}"}, 0.0)
+        status, ok = 200, True
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            STATE.refresh()
+            payload = route(body)
+        except (ValueError, KeyError) as e:
+            status, ok, payload = 400, False, {"error": str(e)}
+        except Exception as e:
+            status, ok, payload = 500, False, {"error": f"{type(e).__name__}: {e}"}
+        ms = (time.perf_counter() - t0) * 1000
+        STATS.record(self.path, ms, ok)
+        payload["latency_ms"] = round(ms, 2)
+        self._send(status, payload, ms)
+
+    def log_message(self, fmt, *args):
+        print(f"{self.address_string()} {fmt % args}")
+
+def make_server(host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    global STATE
+    STATE = WarmState()
+    from scripts.docx_factory import get_factory
+    get_factory()  # loads python-docx and the base document before the first request
+    get_cache()
+    return ThreadingHTTPServer((host, port), Handler)
+
+def main():
+    ap = argparse.ArgumentParser(description="Serve build / preview / lint over HTTP with warm in-memory state.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args()
+    server = make_server(args.host, args.port)
+    print(f"Resume build server on http://{args.host}:{args.port}  (POST /build /preview /lint, GET /health /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# scripts/template_registry.py
+# Markdown templates compiled once into literal/slot lists, validated against the context fields,
+# and hot-reloaded per file when its mtime changes.
+from __future__ import annotations
+import argparse, hashlib, string, threading, time
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parents[1]
+TEMPLATE_DIR = BASE / "templates"
+TEMPLATE_FILES = {"executive":"executive.md","balanced":"balanced.md","ats":"ats_strict.md","human":"human.md","cv":"cv.md"}
+DEFAULT_STYLE = "balanced"
+# Every key build_resume._context_fields provides; a template may use any subset of them.
+FIELD_KEYS = frozenset({"NAME", "LOCATION", "LINKEDIN", "EMAIL", "PHONE", "SUMMARY", "DOMAINS", "METHODS",
+                        "PLATFORMS", "SECURITY", "COLLAB", "EXPERIENCE", "EDUCATION", "AWARDS"})
+_FORMATTER = string.Formatter()
+
+class TemplateError(ValueError):
+    pass
+
+class CompiledTemplate:
+    # literals[0] + data[slots[0]] + literals[1] + ... + literals[-1]; same output as source.format(**data)
+    # for plain {NAME} placeholders ({{ and }} are literal braces).
+    def __init__(self, name: str, source: str, allowed: frozenset[str] | None = FIELD_KEYS):
+        self.name = name
+        self.source = source
+        self.sha256 = hashlib.sha256(source.encode("utf-8")).hexdigest()
+        literals, slots, buf = [], [], []
+        try:
+            parsed = list(_FORMATTER.parse(source))
+        except ValueError as e:
+            raise TemplateError(f"{name}: {e} (write literal braces as {{{{ and }}}})") from e
+        for literal, field, spec, conversion in parsed:
+            buf.append(literal)
+            if field is None: continue
+            if not field.isidentifier():
+                raise TemplateError(f"{name}: unsupported placeholder {{{field}}}; use a plain {{NAME}}")
+            if spec or conversion:
+                raise TemplateError(f"{name}: format specs/conversions are not supported in {{{field}}}")
+            if allowed is not None and field not in allowed:
+                raise TemplateError(f"{name}: unknown placeholder {{{field}}} (known: {', '.join(sorted(allowed))})")
+            literals.append("".join(buf)); buf = []
+            slots.append(field)
+        literals.append("".join(buf))
+        self.literals = tuple(literals)
+        self.slots = tuple(slots)
+        self._parts = [None] * (2 * len(slots) + 1)
+        self._parts[::2] = literals
+        self._slot_index = tuple((2 * i + 1, key) for i, key in enumerate(slots))
+
+    def render(self, data: dict[str, str]) -> str:
+        parts = self._parts.copy()
+        for i, key in self._slot_index:
+            parts[i] = data[key]
+        return "".join(parts)
+
+class TemplateRegistry:
+    # Compiles every style's template up front (so a bad placeholder fails at load, not mid-build).
+    # get() re-stats the files and recompiles only the ones whose (mtime_ns, size) changed.
+    def __init__(self, directory: Path = TEMPLATE_DIR, files: dict[str, str] | None = None,
+                 allowed: frozenset[str] | None = FIELD_KEYS):
+        self.directory = Path(directory)
+        self.files = dict(files or TEMPLATE_FILES)
+        self.allowed = allowed
+        self.compiles = 0
+        self._compiled: dict[str, CompiledTemplate] = {}
+        self._stamps: dict[str, tuple] = {}
+        self._renders: dict[str, list] = {}  # style -> [count, total_ns]
+        self._lock = threading.Lock()
+        self.reload()
+
+    def _stamp(self, style: str) -> tuple:
+        st = (self.directory / self.files[style]).stat()
+        return st.st_mtime_ns, st.st_size
+
+    def reload(self, force: bool = False):
+        with self._lock:
+            for style, name in self.files.items():
+                stamp = self._stamp(style)
+                if not force and self._stamps.get(style) == stamp: continue
+                source = (self.directory / name).read_text(encoding="utf-8")
+                old = self._compiled.get(style)
+                if old is None or old.source != source:
+                    self._compiled[style] = CompiledTemplate(name, source, self.allowed)
+                    self.compiles += 1
+                self._stamps[style] = stamp
+
+    def get(self, style: str) -> CompiledTemplate:
+        style = style if style in self.files else DEFAULT_STYLE
+        if self._stamp(style) != self._stamps.get(style): self.reload()
+        return self._compiled[style]
+
+    def render(self, style: str, data: dict[str, str]) -> str:
+        tpl = self.get(style)
+        t0 = time.perf_counter_ns()
+        out = tpl.render(data)
+        elapsed = time.perf_counter_ns() - t0
+        with self._lock:
+            rec = self._renders.setdefault(style, [0, 0])
+            rec[0] += 1; rec[1] += elapsed
+        return out
+
+    def sources(self) -> dict[str, str]:
+        return {style: self.get(style).source for style in self.files}
+
+    def stats(self) -> dict:
+        with self._lock:
+            renders = {style: {"renders": n, "mean_us": round(ns / n / 1000, 2), "renders_per_s": round(n / (ns / 1e9))}
+                       for style, (n, ns) in self._renders.items() if n and ns}
+            return {"compiles": self.compiles, "renders": renders}
+
+def compile_sources(templates: dict[str, str], allowed: frozenset[str] | None = FIELD_KEYS) -> dict[str, CompiledTemplate]:
+    # For callers holding raw template text (e.g. tests, or templates edited in memory).
+    return {style: CompiledTemplate(style, text, allowed) for style, text in templates.items()}
+
+_DEFAULT: TemplateRegistry | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+def get_registry() -> TemplateRegistry:
+    global _DEFAULT
+    if _DEFAULT is None:
+        with _DEFAULT_LOCK:
+            if _DEFAULT is None: _DEFAULT = TemplateRegistry()
+    return _DEFAULT
+
+def _sample_fields(size: int) -> dict[str, str]:
+    return {k: (f"{k.lower()} text; " * (size // (len(k) + 7) + 1))[:size] for k in FIELD_KEYS}
+
+def main():
+    ap = argparse.ArgumentParser(description="Validate templates/*.md and measure compiled render throughput vs str.format.")
+    ap.add_argument("--dir", default=str(TEMPLATE_DIR))
+    ap.add_argument("-n", type=int, default=20000, help="Renders per template")
+    ap.add_argument("--field-chars", type=int, default=400, help="Size of each sample field value")
+    args = ap.parse_args()
+
+    try:
+        registry = TemplateRegistry(Path(args.dir))
+    except (TemplateError, OSError) as e:
+        raise SystemExit(f"template check failed: {e}")
+    data = _sample_fields(args.field_chars)
+    print(f"{'style':<10} {'slots':>5}  {'str.format':>12} {'compiled':>12}  {'speedup':>7}")
+    for style in registry.files:
+        tpl = registry.get(style)
+        if tpl.render(data) != tpl.source.format(**data):
+            raise SystemExit(f"{style}: compiled render differs from str.format")
+        t0 = time.perf_counter()
+        for _ in range(args.n): tpl.source.format(**data)
+        fmt = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        for _ in range(args.n): tpl.render(data)
+        comp = time.perf_counter() - t0
+        print(f"{style:<10} {len(tpl.slots):>5}  {args.n / fmt:>8.0f} r/s {args.n / comp:>8.0f} r/s  {fmt / comp:>6.2f}x")
+    print(f"all {len(registry.files)} templates valid ({registry.compiles} compiled)")
+
+if __name__ == "__main__":
+    main()
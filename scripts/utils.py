@@ -1,6 +1,6 @@
 from __future__ import annotations
-import re, unicodedata, json, hashlib
-from pydantic import BaseModel, Field
+import re, unicodedata, json, hashlib, heapq
+from pydantic import BaseModel, ConfigDict, Field
 
 class ExperienceItem(BaseModel):
     company: str
@@ -24,8 +24,13 @@ class ProfileSchema(BaseModel):
     education: list[str] = Field(default_factory=list)
     awards: list[str] = Field(default_factory=list)
 
+class GlobalAnswers(BaseModel):
+    model_config = ConfigDict(extra="allow")
+    extra_keywords: list[str] = Field(default_factory=list)
+    summary_additions: list[str] = Field(default_factory=list)
+
 class AnswersSchema(BaseModel):
-    global_: dict = Field(alias="global")
+    global_: GlobalAnswers = Field(alias="global", default_factory=GlobalAnswers)
     roles: dict = Field(default_factory=dict)
     asked: dict = Field(default_factory=dict)
 
@@ -61,31 +66,69 @@ def rewrite_bullet(s: str, is_current: bool = False, inject_kw: list[str] | None
                 s = f"{s}; {kw}"; break
     return s + "."
 
-def extract_keywords(jd_text: str, top_k: int = 60) -> list[str]:
+STOPWORDS = frozenset("a an the and or to for with of in into on at from that this those these you your our we they i he she it their be is are was were as by about not will can should would could have has had if but so than then when where which who whose whom such etc per via within without among across under over more most less least few many new use used using also only other same own each every either neither both any all some no nor include including includes included open close free strong great fast nice own role job position company team work remote salary pay compensation benefits etc manager director lead junior senior iii ii i".split())
+# One token per match: an ASCII word plus the run of non-letters that follows it.
+_WORD_GAP = re.compile(r"([a-z]+)([^a-z]*)")
+_FIRST_LETTER = re.compile(r"[a-z]")
+
+def keyword_counts(jd_text: str) -> dict[str, int]:
+    # Single streaming pass equivalent to counting re.findall(r"\b([a-z]+(?:\s+[a-z]+){1,3})\b")
+    # phrases plus re.findall(r"[a-z]{3,}") singles, minus anything containing a stopword.
     text = jd_text.lower()
-    phrases = re.findall(r"\b([a-z]+(?:\s+[a-z]+){1,3})\b", text)
-    singles = re.findall(r"[a-z]{3,}", text)
-    bag = phrases + singles
-    stop = set("a an the and or to for with of in into on at from that this those these you your our we they i he she it their be is are was were as by about not will can should would could have has had if but so than then when where which who whose whom such etc per via within without among across under over more most less least few many new use used using also only other same own each every either neither both any all some no nor include including includes included open close free strong great fast nice own role job position company team work remote salary pay compensation benefits etc manager director lead junior senior iii ii i".split())
-    freq = {}
-    for tok in bag:
-        if any(w in stop for w in tok.split()): continue
-        if len(tok) < 3: continue
-        freq[tok] = freq.get(tok, 0) + 1
-    ranked = sorted(freq.items(), key=lambda x: (-x[1], x[0]))[:top_k]
+    first = _FIRST_LETTER.search(text)
+    if not first: return {}
+    pairs = _WORD_GAP.findall(text, first.start())
+    prev = text[first.start() - 1] if first.start() else " "
+    if pairs[-1][1].isspace(): pairs[-1] = (pairs[-1][0], "")  # trailing whitespace ends the last phrase
+    freq: dict[str, int] = {}
+    get = freq.get
+    stop = STOPWORDS
+    # Sliding window of the phrase being grown: its words, the gaps after them, and whether any is a stopword.
+    words: list[str] = []; gaps: list[str] = []; has_stop = False
+    for word, gap in pairs:
+        is_stop = word in stop
+        if not is_stop and len(word) >= 3:
+            freq[word] = get(word, 0) + 1
+        # A phrase may only start on a word boundary.
+        if words or not (prev.isalnum() or prev == "_"):
+            words.append(word); gaps.append(gap); has_stop = has_stop or is_stop
+        prev = gap[-1] if gap else ""
+        if not words: continue
+        linked = gap.isspace()
+        if linked and len(words) < 4: continue
+        if not linked and gap and (gap[0].isalnum() or gap[0] == "_"):
+            # The last word needs a trailing word boundary, else the phrase drops back one word.
+            words.pop(); gaps.pop()
+            has_stop = any(w in stop for w in words)
+        if len(words) > 1 and not has_stop:
+            gaps[-1] = ""
+            tok = "".join([w + g for w, g in zip(words, gaps)])
+            freq[tok] = get(tok, 0) + 1
+        words = []; gaps = []; has_stop = False
+    return freq
+
+def extract_keywords(jd_text: str, top_k: int = 60) -> list[str]:
+    ranked = heapq.nsmallest(top_k, keyword_counts(jd_text).items(), key=lambda x: (-x[1], x[0]))
     return [k for k,_ in ranked]
 
-def md_experience(experience: list[dict], answers: dict) -> str:
+def md_experience(experience: list[ExperienceItem], answers: AnswersSchema,
+                  selected: list[list[str]] | None = None) -> str:
+    # selected: bullets to print per role (see bullet_selector); default is every profile + answers bullet.
     lines=[]
-    for role in experience:
-        header = f"**{role['company']} — {role['title']} ({role.get('start','')}–{role.get('end','')})**"
+    for i, role in enumerate(experience):
+        header = f"**{role.company} — {role.title} ({role.start}–{role.end})**"
         lines.append(header)
-        for b in role.get('bullets', []): lines.append(f"- {b}")
+        for b in (selected[i] if selected is not None else role_bullets(role, answers)): lines.append(f"- {b}")
         lines.append("")
     return "\n".join(lines).strip()
 
 def role_key(company: str, title: str) -> str:
     return slugify(f"{company}-{title}")
 
+def role_bullets(role: ExperienceItem, answers: AnswersSchema) -> list[str]:
+    # Profile bullets followed by answers.json roles[<role_key>].extra_bullets.
+    extra = (answers.roles.get(role_key(role.company, role.title)) or {}).get("extra_bullets") or []
+    return dedupe_list([*role.bullets, *extra]) if extra else list(role.bullets)
+
 def fill_template(tpl: str, data: dict[str, str]) -> str:
     return tpl.format(**data)
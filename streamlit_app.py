@@ -1,54 +1,197 @@
 # streamlit_app.py
+import io, re, zipfile
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-import json
-from scripts.build_resume import build_pair
-from utils import slugify
+from scripts import build_resume
+from scripts.batch_build import _unique_slugs
+from scripts.ingest import postings_from_csv, postings_from_jsonl
+from scripts.profile_store import PROFILE_PATH, ANSWERS_PATH, ANSWERS_STORE
 
 BASE = Path(__file__).resolve().parent
+DOCX_MIME = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+MAX_WORKERS = 4
+_COMPANY_LINE = re.compile(r"^\s*company\s*:\s*(.+)$", re.I | re.M)
 
 st.set_page_config(page_title="Resume Creator v3", page_icon="🧰", layout="centered")
 st.title("🧰 Resume Creator v3")
 st.caption("Paste a job description, choose a primary style, and generate BOTH a tailored resume and a CV.")
 
+# --- warm state shared by every session and rerun ---
+
+def _input_stamp() -> tuple:
+    files = [PROFILE_PATH, ANSWERS_PATH, *sorted((BASE / "templates").glob("*.md"))]
+    return (*((str(p), p.stat().st_mtime_ns) for p in files if p.exists()), ("answers-db", ANSWERS_STORE.stamp()))
+
+@st.cache_resource(show_spinner=False)
+def _warm_inputs(stamp: tuple):
+    # Keyed by the input files' mtimes and the answers revision (also the build cache key); the template registry hot-reloads on its own.
+    return build_resume._load_profile(), build_resume._load_answers(), build_resume._load_templates()
+
+@st.cache_resource(show_spinner=False)
+def _executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="resume-build")
+
+class _Unranked(Exception):
+    # Raised out of _model_ranked so st.cache_data does not keep a fallback ranking (exceptions are never cached).
+    def __init__(self, ranked: list[str]):
+        self.ranked = ranked
+
+# The cached functions below are called from executor threads; st.cache_data works there
+# (only st.* UI elements need the script thread), hence show_spinner=False.
+@st.cache_data(show_spinner=False, max_entries=1024)
+def _model_ranked(jd_text: str) -> list[str]:
+    ranked, source = build_resume._rank_with_source(jd_text)
+    if source == "fallback": raise _Unranked(ranked)
+    return ranked
+
+def _ranked(jd_text: str) -> tuple[list[str], str]:
+    try:
+        return _model_ranked(jd_text), "llm"
+    except _Unranked as e:
+        return e.ranked, "fallback"
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _build(style: str, slug: str, jd_text: str, ranked: tuple[str, ...], source: str, stamp: tuple, _inputs) -> dict:
+    # Identical (style, company, JD, ranking, inputs) come straight back from the cache; the ranking is part of
+    # the key so a build made from a fallback ranking is not served once the model answers.
+    profile, answers, templates = _inputs
+    return build_resume.build_pair(style, slug, jd_text, profile=profile, answers=answers, templates=templates,
+                                   write=False, ranked=list(ranked), rank_source=source, formats=("pdf", "txt"))
+
+def _run(style: str, slug: str, jd_text: str, stamp: tuple, inputs) -> dict:
+    # Runs on the executor.
+    ranked, source = _ranked(jd_text)
+    return _build(style, slug, jd_text, tuple(ranked), source, stamp, inputs)
+
+def _submit(style: str, postings: list[dict]):
+    stamp = _input_stamp()
+    inputs = _warm_inputs(stamp)
+    pool = _executor()
+    st.session_state["jobs"] = [
+        {**post, "style": style, "future": pool.submit(_run, style, post["slug"], post["jd_text"], stamp, inputs)}
+        for post in _unique_slugs(postings)
+    ]
+    st.session_state["jobs_shown"] = False
+
+# --- postings input ---
+
+def _split_pasted(text: str) -> list[dict]:
+    # Postings separated by a line of three or more dashes; "Company: X" in a posting names it.
+    out = []
+    for n, block in enumerate(re.split(r"^\s*-{3,}\s*$", text, flags=re.M), 1):
+        if not block.strip(): continue
+        m = _COMPANY_LINE.search(block)
+        out.append({"company": m.group(1).strip() if m else f"posting-{n}", "jd_text": block.strip()})
+    return out
+
+def _from_uploads(files) -> list[dict]:
+    out = []
+    for f in files or []:
+        stem, suffix = Path(f.name).stem, Path(f.name).suffix.lower()
+        text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+        if suffix == ".jsonl": out.extend(postings_from_jsonl(text, stem))
+        elif suffix == ".csv": out.extend(postings_from_csv(text, stem))
+        else: out.append({"company": stem, "jd_text": text.read()})
+        text.detach()  # leave the UploadedFile open for Streamlit
+    return [p for p in out if p["jd_text"].strip()]
+
+# --- results ---
+
+def _show_timings(timings: dict):
+    with st.expander(f"Build timings ({timings['total_wall_ms']:.0f} ms wall, {timings['total_cpu_ms']:.0f} ms CPU)"):
+        st.table([
+            {"stage": s["stage"], "style": s.get("style", ""), "wall ms": s["wall_ms"], "cpu ms": s["cpu_ms"],
+             "bytes": s["bytes"], "peak KB": s["peak_kb"]}
+            for s in timings["stages"]
+        ])
+
+def _show_result(result: dict, key: str):
+    _show_timings(result["primary"]["timings"])
+    for part, title in (("primary", "Primary Resume"), ("cv", "CV")):
+        block = result[part]
+        st.subheader(title)
+        st.download_button(f"Download {title} (DOCX)", block["docx_bytes"], file_name=block["name"], mime=DOCX_MIME,
+                           key=f"dl-{key}-{part}")
+        for fmt, mime in (("pdf", "application/pdf"), ("txt", "text/plain")):
+            st.download_button(f"Download {title} ({fmt.upper()})", block[f"{fmt}_bytes"], file_name=block[f"{fmt}_name"],
+                               mime=mime, key=f"dl-{key}-{part}-{fmt}")
+        st.caption(f"Keyword Coverage ({title})")
+        st.json(block["report_data"], expanded=False)
+        st.caption(f"ATS Lint ({title})")
+        st.code(block["lint_text"])
+
+def _zip_all(jobs: list[dict]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        for job in jobs:
+            if job["future"].exception(): continue
+            for block in job["future"].result().values():
+                z.writestr(f"{job['slug']}/{block['name']}", block["docx_bytes"])
+                for fmt in ("pdf", "txt"): z.writestr(f"{job['slug']}/{block[f'{fmt}_name']}", block[f"{fmt}_bytes"])
+    return buf.getvalue()
+
+@st.fragment(run_every=1.0)
+def _progress():
+    # Polls the executor once a second; the page itself stays interactive while builds run.
+    jobs = st.session_state.get("jobs") or []
+    if not jobs: return
+    done = sum(j["future"].done() for j in jobs)
+    st.progress(done / len(jobs), text=f"{done}/{len(jobs)} postings built")
+    for j in jobs:
+        f = j["future"]
+        state = "⏳ building" if not f.done() else ("❌ " + str(f.exception())) if f.exception() else "✅ done"
+        st.write(f"**{j['company']}** ({j['slug']}): {state}")
+    if done == len(jobs) and not st.session_state.get("jobs_shown"):
+        st.session_state["jobs_shown"] = True
+        st.rerun()
+
+# --- page ---
+
+mode = st.radio("Mode", ["Single posting", "Multiple postings"], horizontal=True)
+
 with st.form("jd_form"):
     col1, col2 = st.columns([2, 1])
-    company = col1.text_input("Company name", value="ACME")
     style = col2.selectbox(
         "Primary Resume Style",
         ["balanced", "executive", "ats", "human"],  # default balanced = ATS+human
         index=0,
         help="Balanced = ATS-friendly + human-readable. CV is always generated in addition."
     )
-    jd_text = st.text_area("Job Description (paste)", height=320, placeholder="Paste the full JD here…")
+    if mode == "Single posting":
+        company = col1.text_input("Company name", value="ACME")
+        jd_text = st.text_area("Job Description (paste)", height=320, placeholder="Paste the full JD here…")
+        uploads = None
+    else:
+        company = None
+        jd_text = st.text_area("Job Descriptions (paste)", height=320,
+                               placeholder="Paste several JDs separated by a line of ---; a 'Company: X' line names each one")
+        uploads = st.file_uploader("…or upload postings", type=["txt", "md", "jsonl", "csv"], accept_multiple_files=True)
     submitted = st.form_submit_button("Generate Resume + CV")
 
 if submitted:
-    if not jd_text.strip():
+    if company is not None:
+        postings = [{"company": company, "jd_text": jd_text}] if jd_text.strip() else []
+    else:
+        postings = _split_pasted(jd_text) + _from_uploads(uploads)
+    if not postings:
         st.error("Please paste a job description.")
     else:
-        slug = slugify(company)
-        result = build_pair(primary_style=style, company_slug=slug, jd_text=jd_text)
-        st.success("Generated! Download below.")
-
-        # Primary
-        st.subheader("Primary Resume")
-        p = Path(result["primary"]["docx"])
-        with open(p, "rb") as f:
-            st.download_button("Download Primary Resume (DOCX)", f, file_name=p.name,
-                               mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
-        st.caption("Keyword Coverage (Primary)")
-        st.json(json.loads(Path(result["primary"]["report"]).read_text(encoding="utf-8")), expanded=False)
-        st.caption("ATS Lint (Primary)")
-        st.code(Path(result["primary"]["lint"]).read_text(encoding="utf-8"))
-
-        # CV
-        st.subheader("CV")
-        p2 = Path(result["cv"]["docx"])
-        with open(p2, "rb") as f:
-            st.download_button("Download CV (DOCX)", f, file_name=p2.name,
-                               mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
-        st.caption("Keyword Coverage (CV)")
-        st.json(json.loads(Path(result["cv"]["report"]).read_text(encoding="utf-8")), expanded=False)
-        st.caption("ATS Lint (CV)")
-        st.code(Path(result["cv"]["lint"]).read_text(encoding="utf-8"))
+        _submit(style, postings)
+
+_progress()
+
+jobs = st.session_state.get("jobs") or []
+if jobs and all(j["future"].done() for j in jobs):
+    ok = [j for j in jobs if not j["future"].exception()]
+    if ok: st.success("Generated! Download below.")
+    if len(jobs) > 1 and ok:
+        st.download_button("Download all (ZIP)", _zip_all(jobs), file_name="resumes.zip", mime="application/zip")
+    for j in jobs:
+        if j["future"].exception(): continue
+        if len(jobs) == 1:
+            _show_result(j["future"].result(), j["slug"])
+        else:
+            with st.container(border=True):
+                st.markdown(f"### {j['company']} ({j['slug']})")
+                _show_result(j["future"].result(), j["slug"])
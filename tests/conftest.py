@@ -0,0 +1,48 @@
+# tests/conftest.py
+# Builds in tests write to a temporary outputs/ with their own rank cache, JD index and artifact store,
+# and never call a model (rankings come from the fallback or are seeded into the cache).
+from __future__ import annotations
+import sys
+from pathlib import Path
+import pytest
+
+BASE = Path(__file__).resolve().parents[1]
+if str(BASE) not in sys.path: sys.path.insert(0, str(BASE))
+import scripts  # noqa: E402,F401  (puts scripts/ on sys.path for `utils`)
+
+PROFILE = {
+    "name": "Sam Example", "location": "Toronto, ON", "email": "sam@example.com", "phone": "(555) 555-0100",
+    "linkedin": "https://www.linkedin.com/in/sam-example/",
+    "domains": ["SaaS", "Cybersecurity", "Public Sector"], "methods": ["Prospecting", "Discovery", "MEDDIC", "Closing"],
+    "platforms": ["Salesforce", "HubSpot"], "security_terms": ["endpoint", "identity-first", "passwordless"],
+    "experience": [{"company": "SampleCo", "title": "Enterprise Account Executive", "start": "2022", "end": "Present",
+                    "location": "Remote", "bullets": ["Closed $500K TCV with a 3-year term across public sector accounts.",
+                                                      "Built pipeline with MEDDIC discovery and Salesforce forecasting."]}],
+    "education": ["B.A. (Hons)"], "awards": ["President's Club"],
+}
+ANSWERS = {"global": {"extra_keywords": [], "summary_additions": []}, "roles": {}, "asked": {}}
+JD = """Company: ExampleCorp
+Role: Enterprise Account Executive, Cybersecurity SaaS
+We need an enterprise account executive to prospect and close new public sector business. You will run
+discovery with MEDDIC, forecast in Salesforce, and sell endpoint and identity-first security to government
+buyers. Experience with passwordless authentication, RFP responses and multi-year contracts is a plus.
+"""
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    from scripts import artifact_store, build_resume, jd_index, rank_cache
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.setattr(build_resume, "BASE", tmp_path)
+    monkeypatch.setattr(rank_cache, "_default", rank_cache.RankCache(tmp_path / ".cache" / "ranking.sqlite"))
+    monkeypatch.setattr(jd_index, "_default", jd_index.JDIndex(tmp_path / ".cache" / "jd_index.sqlite"))
+    monkeypatch.setattr(artifact_store, "_STORE", artifact_store.ArtifactStore(tmp_path / "outputs" / ".store"))
+    return tmp_path
+
+@pytest.fixture
+def build(workspace):
+    # build(slug, jd=JD, **build_all_styles kwargs) with the test profile and answers.
+    from scripts import build_resume
+    def run(slug: str, jd: str = JD, styles=("balanced",), **kwargs):
+        kwargs.setdefault("profile", PROFILE); kwargs.setdefault("answers", ANSWERS)
+        return build_resume.build_all_styles(list(styles), slug, jd, **kwargs)
+    return run
@@ -0,0 +1,60 @@
+# tests/test_answers_db.py
+import json, os, threading
+from scripts.answers_db import AnswersDB
+
+def _db(tmp_path, name="answers.sqlite"):
+    return AnswersDB(tmp_path / name, tmp_path / "answers.json")
+
+def _edit(path, data):
+    # Hand edit of answers.json, stamped later than the export so sync_json notices it.
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    st = path.stat(); os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+def test_appends_are_deduplicated_and_only_changes_bump_the_revision(tmp_path):
+    db = _db(tmp_path)
+    assert db.add_global("extra_keywords", ["MEDDIC", "Salesforce"]) and db.revision() == 1
+    assert not db.add_global("extra_keywords", [" meddic ", "SALESFORCE", ""]) and db.revision() == 1
+    assert db.add_role_items("sampleco", "bullets", ["Closed $500K TCV."])
+    assert db.global_items("extra_keywords") == ["MEDDIC", "Salesforce"]
+    assert db.role_items("sampleco") == {"bullets": ["Closed $500K TCV."]}
+
+def test_first_answer_wins_and_carries_its_summary_addition(tmp_path):
+    db = _db(tmp_path)
+    assert db.add_asked("q1", {"answer": "first", "role_key": "r1"}, summary_addition="Public sector closer")
+    assert not db.add_asked("q1", {"answer": "second", "role_key": "r1"}, summary_addition="Ignored")
+    assert db.get_asked("q1")["answer"] == "first"
+    assert db.asked_for_role("r1") == {"q1": db.get_asked("q1")}
+    assert db.global_items("summary_additions") == ["Public sector closer"]
+
+def test_export_round_trips_through_answers_json(tmp_path):
+    db = _db(tmp_path)
+    db.add_global("summary_additions", ["Led RFPs"]); db.add_asked("q1", {"answer": "yes"})
+    data = json.loads(db.export().read_text(encoding="utf-8"))
+    assert data == {"global": {"extra_keywords": [], "summary_additions": ["Led RFPs"]}, "roles": {}, "asked": {"q1": {"answer": "yes"}}}
+    fresh = AnswersDB(tmp_path / "other.sqlite", tmp_path / "answers.json")
+    assert fresh.sync_json() and fresh.to_dict() == data
+    assert not db.stats()["unexported_changes"]
+
+def test_hand_edit_replaces_an_exported_database(tmp_path):
+    db = _db(tmp_path)
+    db.add_global("extra_keywords", ["MEDDIC", "BANT"]); db.export()
+    _edit(db.json_path, {"global": {"extra_keywords": ["MEDDIC"]}, "roles": {}, "asked": {}})
+    assert db.sync_json()
+    assert db.global_items("extra_keywords") == ["MEDDIC"]  # the deletion wins
+
+def test_hand_edit_merges_when_the_database_has_newer_answers(tmp_path):
+    db = _db(tmp_path)
+    db.add_global("extra_keywords", ["MEDDIC"]); db.export()
+    db.add_global("extra_keywords", ["Gong"])  # not exported yet
+    _edit(db.json_path, {"global": {"extra_keywords": ["MEDDIC", "Outreach"]}, "roles": {}, "asked": {}})
+    assert db.sync_json()
+    assert db.global_items("extra_keywords") == ["MEDDIC", "Gong", "Outreach"]
+
+def test_concurrent_writers_lose_nothing(tmp_path):
+    writers = [_db(tmp_path) for _ in range(4)]  # separate connections to one file
+    def run(i, db):
+        for n in range(25): db.add_asked(f"q{i}-{n}", {"answer": n})
+    threads = [threading.Thread(target=run, args=(i, db)) for i, db in enumerate(writers)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert len(writers[0].asked_ids()) == 100 and writers[0].revision() == 100
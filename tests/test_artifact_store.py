@@ -0,0 +1,47 @@
+# tests/test_artifact_store.py
+import os, stat
+from scripts.artifact_store import ArtifactStore, read_index
+
+def _store(tmp_path, links=False):
+    outputs = tmp_path / "outputs"
+    return ArtifactStore(outputs / ".store", links=links), outputs
+
+def test_placed_files_are_writable_copies(tmp_path):
+    store, outputs = _store(tmp_path)
+    dest = outputs / "acme" / "Resume - Sam - Balanced (acme).docx"
+    sha = store.place(dest, b"docx bytes")
+    obj = store.object_path(sha)
+    assert dest.read_bytes() == obj.read_bytes() == b"docx bytes"
+    assert not os.path.samefile(dest, obj)
+    assert os.stat(dest).st_mode & stat.S_IWUSR
+    assert read_index(dest.parent)[dest.name] == {"sha256": sha, "size": len(b"docx bytes")}
+    # A user edit (or any later non-store write) changes the file only, never the blob.
+    dest.write_bytes(b"edited")
+    assert obj.read_bytes() == b"docx bytes"
+    assert store.verify(outputs) == [f"modified: {dest}"]
+
+def test_identical_content_is_stored_once(tmp_path):
+    store, outputs = _store(tmp_path)
+    a = store.place(outputs / "a" / "x.txt", "same")
+    b = store.place(outputs / "b" / "y.txt", "same")
+    assert a == b and len(list(store.iter_objects())) == 1
+    assert store.stats(outputs)["dedup_ratio"] == 2.0
+
+def test_links_opt_in_and_migrate_unlinks(tmp_path):
+    linked, outputs = _store(tmp_path, links=True)
+    dest = outputs / "acme" / "Resume - Sam - Balanced (acme).docx"
+    sha = linked.place(dest, b"docx bytes")
+    assert os.path.samefile(dest, linked.object_path(sha))
+    report = ArtifactStore(outputs / ".store").migrate(outputs)
+    assert report["unlinked"] == 1
+    assert not os.path.samefile(dest, linked.object_path(sha)) and dest.read_bytes() == b"docx bytes"
+    dest.write_bytes(b"edited")  # no PermissionError
+
+def test_gc_keeps_referenced_blobs(tmp_path):
+    store, outputs = _store(tmp_path)
+    keep = store.place(outputs / "a" / "x.txt", "keep")
+    gone = store.place(outputs / "a" / "y.txt", "gone")
+    (outputs / "a" / "y.txt").unlink()
+    result = store.gc(outputs)
+    assert result["objects_removed"] == 1 and result["index_entries_pruned"] == 1
+    assert store.object_path(keep).exists() and not store.object_path(gone).exists()
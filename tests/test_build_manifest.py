@@ -0,0 +1,52 @@
+# tests/test_build_manifest.py
+from pathlib import Path
+from scripts import build_resume, rank_cache
+from scripts.ingest import jd_keywords
+from scripts.prompt_engine import MODEL, PROMPT_VERSION
+from scripts.rank_cache import cache_key
+from conftest import BASE, JD, PROFILE
+
+ARTIFACTS = ["docx", "report", "lint"]
+
+def _seed_ranking(jd=JD):
+    candidates = jd_keywords(jd)
+    rank_cache.get_cache().put(cache_key(jd, candidates, MODEL, PROMPT_VERSION), list(reversed(candidates[:40])))
+
+def _templates(**overrides):
+    texts = {s: (BASE / "templates" / f).read_text(encoding="utf-8") for s, f in build_resume.TEMPLATE_FILES.items()}
+    return {**texts, **overrides}
+
+def test_second_build_skips_every_unchanged_stage(build):
+    _seed_ranking()
+    first = build("acme", styles=("balanced", "cv"))
+    assert all(b["skipped"] == [] for b in first.values())
+    second = build("acme", styles=("balanced", "cv"))
+    assert all(b["skipped"] == ["rank", *ARTIFACTS] for b in second.values())
+    assert all(Path(first["cv"][s]).read_bytes() == Path(second["cv"][s]).read_bytes() for s in ARTIFACTS)
+
+def test_fallback_ranking_is_ranked_again_but_artifacts_are_kept(build):
+    build("acme")
+    again = build("acme")["balanced"]
+    assert again["skipped"] == ARTIFACTS  # no model answer yet: rank runs again, same ranking, same documents
+
+def test_changed_template_rebuilds_only_that_style(build):
+    _seed_ranking()
+    templates = _templates()
+    build("acme", styles=("balanced", "cv"), templates=templates)
+    changed = build("acme", styles=("balanced", "cv"), templates=_templates(cv=templates["cv"] + "\n# Extra\nMore.\n"))
+    assert changed["balanced"]["skipped"] == ["rank", *ARTIFACTS]
+    assert changed["cv"]["skipped"] == ["rank"]
+
+def test_changed_profile_deleted_output_and_force_rebuild(build):
+    _seed_ranking()
+    first = build("acme")["balanced"]
+    assert build("acme", profile={**PROFILE, "phone": "(555) 555-0199"})["balanced"]["skipped"] == ["rank"]
+    Path(first["report"]).unlink()
+    assert build("acme", profile={**PROFILE, "phone": "(555) 555-0199"})["balanced"]["skipped"] == ["rank", "docx", "lint"]
+    assert build("acme", force=True)["balanced"]["skipped"] == []
+
+def test_new_jd_reranks(build):
+    _seed_ranking(); build("acme")
+    other = JD + "\nBonus: Gong and Outreach experience."
+    _seed_ranking(other)
+    assert build("acme", jd=other, reuse=None)["balanced"]["skipped"] == []
@@ -0,0 +1,21 @@
+# tests/test_compose_once.py
+from scripts import build_resume
+
+def _count(monkeypatch, name):
+    calls = []
+    real = getattr(build_resume, name)
+    monkeypatch.setattr(build_resume, name, lambda *a, **k: calls.append(1) or real(*a, **k))
+    return calls
+
+def test_every_style_is_rendered_from_one_ranking_and_context(build, monkeypatch):
+    ranks, contexts = _count(monkeypatch, "rank_keywords_with_source"), _count(monkeypatch, "_context_fields")
+    results = build("acme", styles=build_resume.STYLES, write=False, reuse=None)
+    assert set(results) == set(build_resume.STYLES)
+    assert len(ranks) == 1 and len(contexts) == 1
+
+def test_shared_context_renders_the_same_documents_as_separate_builds(build):
+    together = build("acme", styles=("balanced", "cv"), write=False, reuse=None)
+    for style in ("balanced", "cv"):
+        alone = build("acme", styles=(style,), write=False, reuse=None)[style]
+        assert together[style]["docx_bytes"] == alone["docx_bytes"]
+        assert together[style]["report_data"] == alone["report_data"]
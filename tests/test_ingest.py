@@ -0,0 +1,24 @@
+# tests/test_ingest.py
+from collections import Counter
+from utils import extract_keywords, keyword_counts
+from scripts.bench_keywords import synthetic_jd
+from scripts.ingest import chunk_text, condense_jd, jd_keywords, merged_keyword_counts, top_keywords
+from conftest import JD
+
+def test_single_chunk_jd_gives_the_plain_extractor_output():
+    assert jd_keywords(JD) == extract_keywords(JD, 60)
+
+def test_merged_counts_are_the_sum_of_per_chunk_counts():
+    text = "\n\n".join(synthetic_jd(600, seed=seed) for seed in range(12))
+    chunks = list(chunk_text(text, 1500))
+    assert len(chunks) > 1 and all(len(c) <= 1500 for c in chunks)
+    expected = sum((Counter(keyword_counts(c)) for c in chunks), Counter())
+    assert merged_keyword_counts(chunks) == dict(expected)
+    assert jd_keywords(text, chunk_chars=1500) == top_keywords(dict(expected), 60)
+
+def test_condensed_jd_keeps_late_requirements_within_budget():
+    late = "Must know MEDDIC and Salesforce forecasting."
+    text = "Company: ExampleCorp\n" + "Filler paragraph about our office snacks.\n" * 200 + late
+    condensed = condense_jd(text, jd_keywords(text), budget=600)
+    assert len(condensed) <= 600 and condensed.startswith("Company: ExampleCorp") and late in condensed
+    assert condense_jd(JD, jd_keywords(JD)) == JD
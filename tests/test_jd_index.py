@@ -0,0 +1,66 @@
+# tests/test_jd_index.py
+import json
+from pathlib import Path
+from scripts import build_resume, rank_cache
+from scripts.build_manifest import BuildManifest
+from scripts.ingest import jd_keywords
+from scripts.jd_index import JDIndex, get_jd_index
+from scripts.prompt_engine import MODEL, PROMPT_VERSION
+from scripts.rank_cache import cache_key
+from conftest import JD
+
+NEAR = JD + "\nAlso HubSpot.\n"  # Jaccard ~0.97 with JD's keyword set
+OTHER = "Company: Bistro\nRole: Line Cook\nPrepare pasta, bake bread and plate desserts in a busy kitchen.\n"
+
+def _seed(jd: str, rotate: int = 0) -> list[str]:
+    candidates = jd_keywords(jd)
+    ranked = candidates[rotate:40] + candidates[:rotate]
+    rank_cache.get_cache().put(cache_key(jd, candidates, MODEL, PROMPT_VERSION), ranked)
+    return ranked
+
+def _ranked(block: dict) -> list[str]:
+    return json.loads(Path(block["report"]).read_text(encoding="utf-8"))["jd_tokens"]
+
+def test_find_respects_threshold_ranker_and_exclude(tmp_path):
+    index = JDIndex(tmp_path / "jd.sqlite")
+    index.add("acme", jd_keywords(JD), ["a"], "sha-a", "m/v1")
+    index.add("bistro", jd_keywords(OTHER), ["b"], "sha-b", "m/v1")
+    hit = index.find(jd_keywords(NEAR), 0.8)
+    assert hit["slug"] == "acme" and hit["jd_sha"] == "sha-a" and hit["ranked"] == ["a"] and hit["similarity"] >= 0.9
+    assert index.find(jd_keywords(NEAR), 0.99) is None
+    assert index.find(jd_keywords(NEAR), 0.8, ranker="m/v2") is None
+    assert index.find(jd_keywords(NEAR), 0.8, exclude="acme") is None
+    index.remove("acme")
+    assert index.find(jd_keywords(NEAR), 0.8) is None and index.stats()["builds"] == 1
+
+def test_near_duplicate_jd_reuses_the_earlier_ranking(build):
+    donor = _seed(JD)
+    build("acme")
+    block = build("globex", jd=NEAR)["balanced"]
+    assert block["reused"]["from"] == "acme" and "rank" in block["reused"]["stages"]
+    assert _ranked(block) == donor
+
+def test_exact_cache_hit_takes_precedence_over_a_near_duplicate(build):
+    _seed(JD)
+    own = _seed(NEAR, rotate=5)
+    build("acme")
+    block = build("globex", jd=NEAR)["balanced"]
+    assert "reused" not in block
+    assert _ranked(block) == own
+
+def test_borrowed_ranking_is_replaced_once_the_jd_has_its_own(build, workspace):
+    donor = _seed(JD)
+    build("acme")
+    assert _ranked(build("globex", jd=NEAR)["balanced"]) == donor
+    manifest = BuildManifest(workspace / "outputs" / "globex")
+    assert manifest.stages["rank"]["reused_jd"] == build_resume.digest(JD)
+    own = _seed(NEAR, rotate=5)
+    block = build("globex", jd=NEAR)["balanced"]
+    assert "rank" not in block["skipped"] and "reused" not in block
+    assert _ranked(block) == own
+    assert "reused_jd" not in BuildManifest(workspace / "outputs" / "globex").stages["rank"]
+
+def test_fallback_rankings_are_not_indexed(build):
+    build("acme")  # no cached ranking and no API key: fallback
+    assert get_jd_index().stats()["builds"] == 0
+    assert "reused" not in build("globex", jd=NEAR)["balanced"]
@@ -0,0 +1,28 @@
+# tests/test_keywords.py
+import pytest
+from utils import extract_keywords
+from scripts.bench_keywords import _reference_extract_keywords, synthetic_jd
+from conftest import BASE, JD
+
+EDGE_CASES = [
+    "", "   \n\t ", "a an the", "Salesforce", "HubSpot  HubSpot\n\nhubspot", "enterprise-account executive",
+    "café résumé naïve enterprise saas", "5+ years of B2B SaaS; MEDDIC/BANT, (endpoint) security_x sales.",
+    "closing closing closing deals deals", "end of text with trailing space ", "\nleading newline quota pipeline",
+    "Ünïcödé ﬁ ligature ß sales pipeline", "x" * 50 + " pipeline " + "y" * 2,
+]
+
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_matches_two_pass_baseline_on_edge_cases(text):
+    assert extract_keywords(text) == _reference_extract_keywords(text)
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_two_pass_baseline_on_synthetic_postings(seed):
+    text = synthetic_jd(200 + 150 * seed, seed=seed)
+    assert extract_keywords(text) == _reference_extract_keywords(text)
+    # The whole ranking, not just the top 60.
+    assert extract_keywords(text, top_k=10 ** 6) == _reference_extract_keywords(text, top_k=10 ** 6)
+
+def test_matches_two_pass_baseline_on_repo_postings():
+    texts = [JD, *(p.read_text(encoding="utf-8") for p in (BASE / "data").glob("*.txt"))]
+    for text in texts:
+        assert extract_keywords(text) == _reference_extract_keywords(text)
@@ -0,0 +1,18 @@
+# tests/test_lint_engine.py
+from scripts import build_resume
+from scripts.lint_engine import lint_profile
+from conftest import PROFILE
+
+def test_build_lint_runs_profile_aware_rules(build, monkeypatch):
+    # The name/email/phone line is gone from the top of the document: contact_in_document must report it.
+    monkeypatch.setattr(build_resume, "_contact_line", lambda profile: profile.location)
+    lint = build("acme", write=False, reuse=None)["balanced"]["lint_text"]
+    assert "Contact details missing from the top of the document: email, phone." in lint
+
+def test_build_lint_clean_with_contact_line(build):
+    lint = build("acme", write=False, reuse=None)["balanced"]["lint_text"]
+    assert "Contact details missing" not in lint
+
+def test_profile_lint_flags_missing_contact_fields():
+    messages = [i["message"] for i in lint_profile({**PROFILE, "email": ""})]
+    assert any("email" in m for m in messages)
@@ -0,0 +1,44 @@
+# tests/test_matcher.py
+import random
+import pytest
+from scripts.matcher import KeywordMatcher
+
+def naive(patterns, text, word_chars=None):
+    text = text.lower()
+    found = set()
+    for p in patterns:
+        key = p.lower()
+        if word_chars is None:
+            if key in text: found.add(key)
+            continue
+        start = text.find(key)
+        while start != -1:
+            end = start + len(key)
+            if (start == 0 or text[start - 1] not in word_chars) and (end == len(text) or text[end] not in word_chars):
+                found.add(key); break
+            start = text.find(key, start + 1)
+    return found
+
+def test_overlapping_and_nested_patterns():
+    patterns = ["he", "she", "his", "hers", "Salesforce", "sales", "force", "", "SaaS"]
+    text = "Ushers sell SALESFORCE to saas teams; this is his."
+    assert KeywordMatcher(patterns).search(text) == naive(patterns, text)
+
+@pytest.mark.parametrize("seed", range(30))
+def test_random_texts_match_naive_scan(seed):
+    rng = random.Random(seed)
+    alphabet = "abAB c-"  # tiny alphabet: many overlaps, repeats and prefix/suffix sharing
+    patterns = ["".join(rng.choices(alphabet, k=rng.randint(0, 5))) for _ in range(rng.randint(1, 25))]
+    text = "".join(rng.choices(alphabet, k=rng.randint(0, 300)))
+    assert KeywordMatcher(patterns).search(text) == naive(patterns, text)
+    wc = "abcdefghijklmnopqrstuvwxyz"
+    assert KeywordMatcher(patterns, word_chars=wc).search(text) == naive(patterns, text, wc)
+
+def test_word_chars_skip_hits_inside_words_but_find_later_ones():
+    m = KeywordMatcher(["rfp", "sales"], word_chars="abcdefghijklmnopqrstuvwxyz")
+    assert m.search("rfps and presales") == set()
+    assert m.search("rfps, then an RFP for sales") == {"rfp", "sales"}
+
+def test_present_missing_keeps_pattern_order_and_case():
+    m = KeywordMatcher(["MEDDIC", "HubSpot", "Salesforce"])
+    assert m.present_missing("forecasting in salesforce with meddic") == (["MEDDIC", "Salesforce"], ["HubSpot"])
@@ -0,0 +1,49 @@
+# tests/test_rank_cache.py
+from scripts import rank_cache
+from scripts.ingest import jd_keywords
+from scripts.prompt_engine import MODEL, PROMPT_VERSION, cached_ranking, rank_keywords_with_source
+from scripts.rank_cache import RankCache, cache_key
+from conftest import JD
+
+class Clock:
+    def __init__(self): self.now = 1_000_000.0
+    def __call__(self): return self.now
+
+def test_key_covers_jd_candidates_model_and_prompt_version():
+    base = cache_key("jd", ["a", "b"], "m", "1")
+    assert base == cache_key("jd", ["a", "b"], "m", "1")
+    assert len({base, cache_key("jd!", ["a", "b"], "m", "1"), cache_key("jd", ["b", "a"], "m", "1"),
+                cache_key("jd", ["a", "b"], "m2", "1"), cache_key("jd", ["a", "b"], "m", "2")}) == 5
+
+def test_round_trip_and_counters(tmp_path):
+    cache = RankCache(tmp_path / "r.sqlite")
+    assert cache.get("k") is None
+    cache.put("k", ["Salesforce", "MEDDIC"])
+    assert cache.get("k") == ["Salesforce", "MEDDIC"]
+    assert cache.stats()["lifetime"] == {"hits": 1, "misses": 1, "evictions": 0}
+    # Persisted: a new connection sees the entry and the lifetime counters.
+    assert RankCache(tmp_path / "r.sqlite").stats()["entries"] == 1
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    clock = Clock(); monkeypatch.setattr(rank_cache.time, "time", clock)
+    cache = RankCache(tmp_path / "r.sqlite", ttl=60)
+    cache.put("k", ["x"])
+    clock.now += 59; assert cache.get("k") == ["x"]
+    clock.now += 2; assert cache.get("k") is None
+    assert cache.evictions == 1
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = Clock(); monkeypatch.setattr(rank_cache.time, "time", clock)
+    cache = RankCache(tmp_path / "r.sqlite", max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, [key]); clock.now += 1
+    cache.get("a"); clock.now += 1  # "b" is now the least recently used
+    cache.put("c", ["c"])
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (["a"], None, ["c"])
+
+def test_fallback_rankings_are_never_cached(workspace):
+    candidates = jd_keywords(JD)
+    ranked, source = rank_keywords_with_source(JD, candidates)
+    assert source == "fallback" and cached_ranking(JD, candidates) is None
+    rank_cache.get_cache().put(cache_key(JD, candidates, MODEL, PROMPT_VERSION), ["model", "answer"])
+    assert rank_keywords_with_source(JD, candidates) == (["model", "answer"], "cache")
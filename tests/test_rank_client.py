@@ -0,0 +1,51 @@
+# tests/test_rank_client.py
+import asyncio, threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from scripts.prompt_engine import fallback_ranking
+from scripts.rank_client import AsyncRanker, BackendError, HTTPBackend, RankingBackend, StubBackend, start_stub_server
+from scripts.ingest import jd_keywords
+from conftest import JD
+
+def _garbage_server(bodies: list[bytes]) -> ThreadingHTTPServer:
+    # 200 responses cycling through `bodies`.
+    calls = iter(range(10 ** 6))
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = bodies[next(calls) % len(bodies)]
+            self.send_response(200); self.send_header("Content-Length", str(len(body))); self.end_headers()
+            self.wfile.write(body)
+        def log_message(self, *args): pass
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_malformed_responses_fall_back_per_jd_without_retrying():
+    server = _garbage_server([b"not json", b'{"choices": []}', b'{"x": 1}'])
+    try:
+        ranker = AsyncRanker(HTTPBackend(f"http://127.0.0.1:{server.server_port}/v1"), retries=3, backoff=0, use_cache=False)
+        jds = [JD, JD + "\nAlso HubSpot.", JD + "\nAlso Gong."]
+        ranked = asyncio.run(ranker.rank_many(jds))
+    finally:
+        server.shutdown()
+    assert ranked == [fallback_ranking(jd_keywords(jd)) for jd in jds]
+    assert ranker.stats["requests"] == 3 and ranker.stats["retries"] == 0 and ranker.stats["failures"] == 3
+
+def test_rate_limits_are_retried():
+    server = start_stub_server(error_rate=0.5, seed=3)
+    try:
+        ranker = AsyncRanker(HTTPBackend(f"http://127.0.0.1:{server.server_port}/v1"), retries=8, backoff=0, use_cache=False, seed=0)
+        ranked = asyncio.run(ranker.rank_many([JD] * 6))
+    finally:
+        server.shutdown()
+    assert ranker.stats["retries"] > 0 and ranker.stats["failures"] == 0
+    assert all(r == jd_keywords(JD)[:40] for r in ranked)
+
+def test_retryable_statuses():
+    assert BackendError(None).retryable and BackendError(429).retryable and BackendError(503).retryable
+    assert not BackendError(400).retryable and not BackendError(None, retryable=False).retryable
+
+def test_backend_must_implement_complete():
+    with pytest.raises(TypeError): RankingBackend()
+    assert isinstance(StubBackend(), RankingBackend)
@@ -0,0 +1,44 @@
+# tests/test_renderers.py
+from io import BytesIO
+import pytest
+from scripts import build_resume
+from scripts.renderers import RENDERERS, parse_markdown, render, render_docx, text_lines
+
+MD = "# Summary\nCloser for **public sector** SaaS.\n\n## SampleCo\n- Closed $500K TCV.\n- Unbalanced ** marker\n"
+
+def _blocks():
+    return parse_markdown(MD, "Sam Example", "Toronto, ON | sam@example.com")
+
+def test_docx_paragraphs_match_the_parsed_text():
+    doc = render_docx(_blocks())
+    assert [p.text for p in doc.paragraphs] == text_lines(_blocks())
+
+def test_txt_and_pdf_render_the_same_blocks():
+    blocks = _blocks()
+    txt = render(blocks, "txt").decode("utf-8").splitlines()
+    assert txt[:2] == ["Sam Example", "Toronto, ON | sam@example.com"]
+    assert "SUMMARY" in txt and "- Closed $500K TCV." in txt and "- Unbalanced ** marker" in txt
+    pdf = render(blocks, "pdf")
+    assert pdf.startswith(b"%PDF-1.4") and pdf.rstrip().endswith(b"%%EOF")
+    assert pdf == render(blocks, "pdf")  # deterministic bytes
+
+def test_unknown_formats_are_rejected():
+    assert set(RENDERERS) >= {"docx", "pdf", "txt"}
+    assert build_resume.parse_formats("PDF, .txt,pdf") == ("docx", "pdf", "txt")
+    assert build_resume.parse_formats(None) == ("docx",)
+    with pytest.raises(ValueError): build_resume.parse_formats("rtf")
+    with pytest.raises(ValueError): render(_blocks(), "rtf")
+
+def test_build_returns_every_format_from_one_document(build):
+    block = build("acme", write=False, reuse=None, formats=("pdf", "txt"))["balanced"]
+    from docx import Document
+    paragraphs = [p.text for p in Document(BytesIO(block["docx_bytes"])).paragraphs]
+    assert block["txt_bytes"].decode("utf-8").splitlines()[0] == paragraphs[0] == "Sam Example"
+    assert block["pdf_bytes"].startswith(b"%PDF") and block["pdf_name"].endswith(".pdf")
+
+def test_written_formats_are_skipped_on_an_unchanged_rebuild(build, workspace):
+    first = build("acme", formats=("pdf", "txt"))["balanced"]
+    out = workspace / "outputs" / "acme"
+    assert sorted(p.suffix for p in out.glob("Resume - *") if p.suffix in (".pdf", ".txt")) == [".pdf", ".txt"]
+    second = build("acme", formats=("pdf", "txt"))["balanced"]
+    assert {"pdf", "txt"} <= set(second["skipped"]) and not first.get("skipped", [])
@@ -0,0 +1,15 @@
+# tests/test_serve.py
+import pytest
+from scripts import serve
+from conftest import JD
+
+def test_styles_accepts_one_name_a_list_or_all():
+    assert serve._styles("cv") == ["cv"]
+    assert serve._styles(["balanced", "CV"]) == ["balanced", "CV"]
+    assert serve._styles("all") == list(serve.build_resume.STYLES)
+
+@pytest.mark.parametrize("styles", ["nope", ["balanced", "c"], [1], {"cv": 1}, 7])
+def test_build_rejects_unknown_or_malformed_styles(styles):
+    # ValueError is the server's 400; it is raised before any build starts.
+    with pytest.raises(ValueError):
+        serve.handle_build({"jd_text": JD, "styles": styles})